@@ -1,20 +1,28 @@
 import asyncio
+import datetime
+from typing import Any
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser
+from django.core.signals import setting_changed
 from django.db import IntegrityError
+from django.dispatch import receiver
+from django.db.models import Q
+from django.db.models.functions import Left
 from ninja import Query, Router
 from django.http import Http404, HttpRequest, HttpResponse
 from django.utils import timezone
 from django.contrib.auth import (
     alogin as django_alogin,
     alogout as django_alogout,
-    aauthenticate as django_aauthenticate,
 )
 from ninja.errors import HttpError
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 
-from app_admin.models import User
-from app_admin.security import must_auth
+from app_admin import password_hashing, principal_cache
+from app_admin.auth_backends import aauthenticate
+from app_admin.models import Token, User, email_iexact
+from app_admin.security import UserRateThrottle, must_auth
 from app_admin.schemas import (
     LoginInSchema,
     RegisterInSchema,
@@ -24,13 +32,40 @@ from app_admin.schemas import (
     UserDetailsOutSchema,
     UserLookupInSchema,
     UserOutSchema,
+    TokenOutSchema,
+    TokenListOutSchema,
 )
 
 router = Router()
 
+_TOKEN_EXPIRY_INTERVAL: datetime.timedelta
+
+
+@receiver(setting_changed)
+def _load_global_settings(*args: Any, **kwargs: Any):
+    global _TOKEN_EXPIRY_INTERVAL
+
+    _TOKEN_EXPIRY_INTERVAL = settings.TOKEN_EXPIRY_INTERVAL
+
+
+_load_global_settings()
+
+_TOKEN_KEY_PREFIX_LENGTH = 8
+
+_token_issue_throttle = UserRateThrottle(
+    "token_issue", settings.TOKEN_ISSUE_THROTTLE_RATE
+)
+
 
 @router.post("/register", response={204: None}, tags=["auth"])
 async def register(request: HttpRequest, input_register: RegisterInSchema):
+    # emails differing only in case are taken as well, the unique constraint
+    # still covers races on exact duplicates
+    if await User.objects.filter(
+        Q(username=input_register.username) | Q(email_iexact(input_register.email))
+    ).aexists():
+        raise HttpError(409, "user already exists")
+
     try:
         await User.objects.acreate_user(
             input_register.username, input_register.email, input_register.password
@@ -44,14 +79,9 @@ async def register(request: HttpRequest, input_register: RegisterInSchema):
 
 @router.post("/login", response={204: None}, tags=["auth"])
 async def login(request: HttpRequest, input_login: LoginInSchema):
-    user = await django_aauthenticate(
+    user = await aauthenticate(
         request, username=input_login.username_email, password=input_login.password
     )
-    if not user:
-        user = await django_aauthenticate(
-            request, email=input_login.username_email, password=input_login.password
-        )
-
     if not user:
         raise HttpError(401, "invalid credentials")
 
@@ -79,7 +109,7 @@ async def change_password(
     user = await request.auser()
     assert isinstance(user, AbstractBaseUser)
 
-    user.set_password(input_change_password.password)
+    await password_hashing.aset_password(user, input_change_password.password)
     await user.asave(update_fields=("password",))
 
     return None
@@ -139,7 +169,7 @@ async def delete_user(request: HttpRequest, input_delete: UserDeleteInSchema):
     user = await request.auser()
     assert isinstance(user, User)
 
-    user_ = await django_aauthenticate(
+    user_ = await aauthenticate(
         request, username=user.username, password=input_delete.password
     )
     if not user_:
@@ -150,6 +180,50 @@ async def delete_user(request: HttpRequest, input_delete: UserDeleteInSchema):
     return None
 
 
+@router.post(
+    "/user/tokens",
+    response=TokenOutSchema,
+    auth=must_auth,
+    throttle=_token_issue_throttle,
+    tags=["auth"],
+)
+async def issue_token(request: HttpRequest):
+    user = await request.auser()
+    assert isinstance(user, User)
+
+    return await Token.objects.acreate(
+        user=user, expires_at=(timezone.now() + _TOKEN_EXPIRY_INTERVAL)
+    )
+
+
+@router.get(
+    "/user/tokens", response=list[TokenListOutSchema], auth=must_auth, tags=["auth"]
+)
+async def list_tokens(request: HttpRequest):
+    user = await request.auser()
+    assert isinstance(user, User)
+
+    return [
+        t
+        async for t in Token.objects.filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now()), user=user
+        )
+        .annotate(key_prefix=Left("key", _TOKEN_KEY_PREFIX_LENGTH))
+        .order_by("-created_at")
+        .only("created_at", "expires_at")
+    ]
+
+
+@router.delete("/user/tokens", response={204: None}, auth=must_auth, tags=["auth"])
+async def revoke_tokens(request: HttpRequest):
+    user = await request.auser()
+    assert isinstance(user, User)
+
+    await principal_cache.ainvalidate_tokens(await Token.objects.arevoke_all(user.pk))
+
+    return None
+
+
 @router.get("/csrf", response={204: None}, tags=["auth"])
 @ensure_csrf_cookie
 @csrf_exempt
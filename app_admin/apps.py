@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AppAdminConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app_admin"
+
+    def ready(self) -> None:
+        # connects the cache invalidation receivers
+        from app_admin import principal_cache  # noqa: F401
@@ -1,10 +1,23 @@
+import inspect
 from typing import Any
 
-from django.contrib.auth.backends import ModelBackend, UserModel
+from django.conf import settings
+from django.contrib.auth import load_backend, user_login_failed
+from django.contrib.auth.backends import ModelBackend as _ModelBackend
+from django.contrib.auth.backends import UserModel
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import PermissionDenied
+from django.db.models import Case, Q, QuerySet, Value, When
 from django.http import HttpRequest
 
+from app_admin import password_hashing, principal_cache
+from app_admin.models import email_iexact
 
-class EmailBackend(ModelBackend):
+
+class ModelBackend(_ModelBackend):
+    # resolves the username or the email in one query, and runs the password
+    # hasher exactly once whether or not the user exists
     def authenticate(
         self,
         request: HttpRequest | None,
@@ -12,20 +25,106 @@ class EmailBackend(ModelBackend):
         password: str | None = None,
         **kwargs: Any,
     ):
-        try:
-            user = UserModel.objects.get(email__iexact=username)
-        except UserModel.DoesNotExist:
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = _pick_user(list(_users_qs(username)), username)
+        if user is None:
             # Run the default password hasher once to reduce the timing
             # difference between an existing and a nonexistent user (#20760).
-            UserModel().set_password(password)
-        else:
-            if user.check_password(password) and self.user_can_authenticate(user):
-                return user
+            make_password(password)
+        elif user.check_password(password) and self.user_can_authenticate(user):
+            return user
+
+        return None
+
+    async def aauthenticate(
+        self,
+        request: HttpRequest | None,
+        username: str | None = None,
+        password: str | None = None,
+        **kwargs: Any,
+    ):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = _pick_user([u async for u in _users_qs(username)], username)
+        if user is None:
+            await password_hashing.amake_password(password)
+        elif await password_hashing.acheck_password(
+            user, password
+        ) and self.user_can_authenticate(user):
+            return user
+
+        return None
 
+    # used for every session-authenticated request
     def get_user(self, user_id: Any):
-        try:
-            user = UserModel.objects.get(pk=user_id)
-        except UserModel.DoesNotExist:
+        user = principal_cache.get_user(user_id)
+        if user is None:
             return None
 
         return user if self.user_can_authenticate(user) else None
+
+
+def _users_qs(username: str) -> QuerySet[Any]:
+    # a username and someone else's email can only collide if the former
+    # contains an "@", in which case it wins, hence it's ordered first
+    return UserModel._default_manager.filter(
+        Q(**{UserModel.USERNAME_FIELD: username}) | Q(email_iexact(username))
+    ).order_by(
+        Case(
+            When(Q(**{UserModel.USERNAME_FIELD: username}), then=Value(0)),
+            default=Value(1),
+        ),
+        "pk",
+    )[:2]
+
+
+def _pick_user(users: list[Any], username: str) -> Any | None:
+    if users and users[0].get_username() == username:
+        return users[0]
+
+    # emails differing only in case can belong to different users, in which
+    # case none of them is picked
+    return users[0] if len(users) == 1 else None
+
+
+async def aauthenticate(
+    request: HttpRequest | None = None, **credentials: Any
+) -> AbstractBaseUser | None:
+    # in place of `django.contrib.auth.aauthenticate`, which runs the sync
+    # backends, hashing included, on the shared sync thread; backends without
+    # `aauthenticate` are skipped
+    for backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(backend_path)
+        backend_aauthenticate = getattr(backend, "aauthenticate", None)
+        if backend_aauthenticate is None:
+            continue
+
+        try:
+            inspect.signature(backend_aauthenticate).bind(request, **credentials)
+        except TypeError:
+            continue
+
+        try:
+            user = await backend_aauthenticate(request, **credentials)
+        except PermissionDenied:
+            break
+
+        if user is None:
+            continue
+
+        user.backend = backend_path
+        return user
+
+    await user_login_failed.asend(
+        sender=__name__,
+        credentials={k: v for k, v in credentials.items() if k != "password"},
+        request=request,
+    )
+    return None
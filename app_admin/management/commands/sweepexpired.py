@@ -0,0 +1,51 @@
+from importlib import import_module
+from typing import Any
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import models
+from django.utils import timezone
+
+from app_admin.models import Token
+
+
+class Command(BaseCommand):
+    help = "Delete expired tokens and sessions in bounded batches"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        now = timezone.now()
+
+        token_count = self._sweep(Token.objects.filter(expires_at__lte=now), batch_size)
+
+        session_count = 0
+        session_store_cls = import_module(settings.SESSION_ENGINE).SessionStore
+        # `cached_db` included, its cached copies expire on their own
+        if issubclass(session_store_cls, DBSessionStore):
+            session_count = self._sweep(
+                session_store_cls.get_model_class().objects.filter(expire_date__lt=now),
+                batch_size,
+            )
+
+        self.stderr.write(
+            self.style.NOTICE(
+                f"deleted {token_count} tokens and {session_count} sessions"
+            )
+        )
+
+    def _sweep(self, qs: models.QuerySet[Any], batch_size: int) -> int:
+        # each batch is a single statement committing on its own, so locks are
+        # only held briefly
+        count = 0
+        while True:
+            pks = list(qs.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                return count
+
+            # no signals, expired tokens are refused whether cached or not
+            qs.model.objects.filter(pk__in=pks)._raw_delete(qs.db)
+            count += len(pks)
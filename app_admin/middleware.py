@@ -0,0 +1,46 @@
+import datetime
+import time
+from typing import Any
+
+from django.conf import settings
+from django.contrib.sessions.middleware import (
+    SessionMiddleware as _SessionMiddleware,
+)
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+
+_SESSION_REFRESH_INTERVAL: datetime.timedelta
+
+_REFRESHED_AT_SESSION_KEY = "_session_refreshed_at"
+
+
+@receiver(setting_changed)
+def _load_global_settings(*args: Any, **kwargs: Any):
+    global _SESSION_REFRESH_INTERVAL
+
+    _SESSION_REFRESH_INTERVAL = settings.SESSION_REFRESH_INTERVAL
+
+
+_load_global_settings()
+
+
+class SessionMiddleware(_SessionMiddleware):
+    # in place of `SESSION_SAVE_EVERY_REQUEST`, an unchanged session is only
+    # saved again (and its cookie reissued) once per `SESSION_REFRESH_INTERVAL`,
+    # so the expiry still slides, just in coarser steps
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        session = getattr(request, "session", None)
+        if session is not None and session.accessed and not session.is_empty():
+            now = int(time.time())
+            refreshed_at = session.get(_REFRESHED_AT_SESSION_KEY)
+            if (
+                session.modified
+                or not isinstance(refreshed_at, int)
+                or now - refreshed_at >= _SESSION_REFRESH_INTERVAL.total_seconds()
+            ):
+                session[_REFRESHED_AT_SESSION_KEY] = now
+
+        return super().process_response(request, response)
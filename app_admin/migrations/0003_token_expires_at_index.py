@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app_admin", "0002_token"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="token",
+            index=models.Index(
+                fields=["expires_at"], name="app_admin_t_expires_4e0a22_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,74 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+_INDEX = models.Index(
+    django.db.models.functions.text.Upper("email"),
+    name="app_admin_user_email_upper_idx",
+)
+
+
+def _forward_func_add_email_upper_index(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    # built concurrently on PostgreSQL, so a large user table stays writable
+    if schema_editor.connection.vendor == "postgresql":
+        with schema_editor.connection.cursor() as c:
+            # an interrupted build leaves an invalid index behind, which
+            # `IF NOT EXISTS` would keep
+            c.execute(
+                """
+                SELECT NOT indisvalid FROM pg_index
+                WHERE indexrelid = to_regclass('app_admin_user_email_upper_idx')"""
+            )
+            if (row := c.fetchone()) is not None and row[0]:
+                c.execute(
+                    """
+                    DROP INDEX CONCURRENTLY app_admin_user_email_upper_idx"""
+                )
+
+            c.execute(
+                """
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS app_admin_user_email_upper_idx
+                ON app_admin_user (UPPER(email))"""
+            )
+        return
+
+    schema_editor.add_index(apps.get_model("app_admin", "User"), _INDEX)
+
+
+def _reverse_func_add_email_upper_index(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    if schema_editor.connection.vendor == "postgresql":
+        with schema_editor.connection.cursor() as c:
+            c.execute(
+                """
+                DROP INDEX CONCURRENTLY IF EXISTS app_admin_user_email_upper_idx"""
+            )
+        return
+
+    schema_editor.remove_index(apps.get_model("app_admin", "User"), _INDEX)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("app_admin", "0003_token_expires_at_index"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(
+                    _forward_func_add_email_upper_index,
+                    _reverse_func_add_email_upper_index,
+                ),
+            ],
+            state_operations=[
+                migrations.AddIndex(model_name="user", index=_INDEX),
+            ],
+        ),
+    ]
@@ -0,0 +1,76 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.core.cache import caches
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.utils import timezone
+
+# both folded into `app_admin.auth_backends.ModelBackend`
+_LEGACY_BACKENDS = frozenset(
+    (
+        "app_admin.auth_backends.EmailBackend",
+        "django.contrib.auth.backends.ModelBackend",
+    )
+)
+_BACKEND = "app_admin.auth_backends.ModelBackend"
+
+
+def _forward_func_rewrite_session_auth_backend(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    session_store_cls = import_module(settings.SESSION_ENGINE).SessionStore
+    # sessions only held in a cache can't be listed, they stay logged out
+    if not issubclass(session_store_cls, DBSessionStore):
+        return
+
+    session_model_cls = session_store_cls.get_model_class()
+    Session = apps.get_model(
+        session_model_cls._meta.app_label, session_model_cls._meta.model_name
+    )
+    db_alias = schema_editor.connection.alias
+
+    sessions = []
+    cache_keys = []
+    for session in (
+        Session.objects.using(db_alias)
+        .filter(expire_date__gt=timezone.now())
+        .iterator(chunk_size=1000)
+    ):
+        store = session_store_cls(session_key=session.session_key)
+        data = store.decode(session.session_data)
+        if data.get(BACKEND_SESSION_KEY) not in _LEGACY_BACKENDS:
+            continue
+
+        data[BACKEND_SESSION_KEY] = _BACKEND
+        session.session_data = store.encode(data)
+        sessions.append(session)
+
+        if isinstance(store, CachedDBStore):
+            cache_keys.append(store.cache_key)
+
+    # `expire_date` is left as is
+    Session.objects.using(db_alias).bulk_update(
+        sessions, ("session_data",), batch_size=1000
+    )
+    # the cached copies are reloaded from the rewritten rows
+    if cache_keys:
+        caches[settings.SESSION_CACHE_ALIAS].delete_many(cache_keys)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app_admin", "0004_user_email_upper_index"),
+        ("sessions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _forward_func_rewrite_session_auth_backend,
+            migrations.RunPython.noop,
+        ),
+    ]
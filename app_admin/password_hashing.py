@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.auth.hashers import make_password, verify_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_logger = logging.getLogger(__name__)
+
+_PASSWORD_HASHING_MAX_WORKERS: int
+_PASSWORD_HASHING_MAX_PENDING: int
+
+_executor: ThreadPoolExecutor | None = None
+
+_T = TypeVar("_T")
+
+
+def _reset_executor() -> None:
+    global _executor
+
+    if _executor is None:
+        return
+
+    # hashes already submitted still finish on the old pool
+    _executor.shutdown(wait=False)
+    _executor = None
+
+
+@receiver(setting_changed)
+def _load_global_settings(*args: Any, **kwargs: Any):
+    global _PASSWORD_HASHING_MAX_WORKERS
+    global _PASSWORD_HASHING_MAX_PENDING
+
+    _PASSWORD_HASHING_MAX_WORKERS = settings.PASSWORD_HASHING_MAX_WORKERS
+    _PASSWORD_HASHING_MAX_PENDING = settings.PASSWORD_HASHING_MAX_PENDING
+
+    # rebuilt with the new size on next use
+    _reset_executor()
+
+
+_load_global_settings()
+
+
+class PasswordHashingSaturated(Exception):
+    pass
+
+
+_lock = threading.Lock()
+# queued and running hashes
+_pending = 0
+_rejected = 0
+# set by a rejection, cleared (and logged) once a hash finishes
+_is_saturated = False
+
+
+def get_stats() -> dict[str, int]:
+    with _lock:
+        return {
+            "max_workers": _PASSWORD_HASHING_MAX_WORKERS,
+            "max_pending": _PASSWORD_HASHING_MAX_PENDING,
+            "pending": _pending,
+            "rejected": _rejected,
+        }
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    # the hashers release the GIL, and unlike `sync_to_async` this doesn't queue
+    # behind the ORM on the shared sync thread
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_PASSWORD_HASHING_MAX_WORKERS,
+            thread_name_prefix="password_hashing",
+        )
+
+    return _executor
+
+
+def _release(future: Future[Any]) -> None:
+    global _pending
+    global _is_saturated
+
+    with _lock:
+        _pending -= 1
+        has_recovered = _is_saturated
+        _is_saturated = False
+
+    if has_recovered:
+        _logger.info("password hashing recovered: %s", get_stats())
+
+
+async def _arun(fn: Callable[..., _T], *args: Any) -> _T:
+    global _pending
+    global _rejected
+    global _is_saturated
+
+    with _lock:
+        is_saturated = _pending >= _PASSWORD_HASHING_MAX_PENDING
+        if is_saturated:
+            _rejected += 1
+            _is_saturated = True
+        else:
+            _pending += 1
+
+    if is_saturated:
+        _logger.warning("password hashing saturated: %s", get_stats())
+        raise PasswordHashingSaturated
+
+    # released once the hash actually finishes, even if the caller is cancelled
+    future = _get_executor().submit(fn, *args)
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
+
+
+async def amake_password(password: str | None) -> str:
+    return await _arun(make_password, password)
+
+
+async def aset_password(user: AbstractBaseUser, password: str | None) -> None:
+    # same as `AbstractBaseUser.set_password`
+    user.password = await amake_password(password)
+    user._password = password
+
+
+async def acheck_password(user: AbstractBaseUser, password: str) -> bool:
+    is_correct, must_update = await _arun(verify_password, password, user.password)
+    if is_correct and must_update:
+        # not a password change, so left out of `_password`
+        user.password = await amake_password(password)
+        await user.asave(update_fields=("password",))
+
+    return is_correct
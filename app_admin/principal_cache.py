@@ -0,0 +1,363 @@
+import datetime
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app_admin.models import Token, User
+
+_PRINCIPAL_CACHE_TIMEOUT: datetime.timedelta
+_PRINCIPAL_CACHE_LOCAL_TIMEOUT: datetime.timedelta
+_PRINCIPAL_CACHE_LOCAL_MAX_SIZE: int
+_CREDENTIAL_CACHE_TIMEOUT: datetime.timedelta
+_CREDENTIAL_CACHE_MAX_SIZE: int
+
+
+@receiver(setting_changed)
+def _load_global_settings(*args: Any, **kwargs: Any):
+    global _PRINCIPAL_CACHE_TIMEOUT
+    global _PRINCIPAL_CACHE_LOCAL_TIMEOUT
+    global _PRINCIPAL_CACHE_LOCAL_MAX_SIZE
+    global _CREDENTIAL_CACHE_TIMEOUT
+    global _CREDENTIAL_CACHE_MAX_SIZE
+
+    _PRINCIPAL_CACHE_TIMEOUT = settings.PRINCIPAL_CACHE_TIMEOUT
+    _PRINCIPAL_CACHE_LOCAL_TIMEOUT = settings.PRINCIPAL_CACHE_LOCAL_TIMEOUT
+    _PRINCIPAL_CACHE_LOCAL_MAX_SIZE = settings.PRINCIPAL_CACHE_LOCAL_MAX_SIZE
+    _CREDENTIAL_CACHE_TIMEOUT = settings.CREDENTIAL_CACHE_TIMEOUT
+    _CREDENTIAL_CACHE_MAX_SIZE = settings.CREDENTIAL_CACHE_MAX_SIZE
+
+    _local_cache.configure(
+        _PRINCIPAL_CACHE_LOCAL_TIMEOUT, _PRINCIPAL_CACHE_LOCAL_MAX_SIZE
+    )
+    _credential_cache.configure(_CREDENTIAL_CACHE_TIMEOUT, _CREDENTIAL_CACHE_MAX_SIZE)
+
+
+class _LocalLRUCache:
+    # per worker, so invalidations only reach the other workers' copies once
+    # they time out
+    def __init__(self):
+        self._timeout = datetime.timedelta(0)
+        self._max_size = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        # bumped on every delete, so reads that started before one don't
+        # store what they loaded
+        self.generation = 0
+
+    def configure(self, timeout: datetime.timedelta, max_size: int) -> None:
+        with self._lock:
+            self._timeout = timeout
+            self._max_size = max_size
+            self._entries.clear()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        # a fresh copy, so callers can't mutate the cached instance
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        value_ = pickle.dumps(value)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self._entries[key] = (
+                time.monotonic() + self._timeout.total_seconds(),
+                value_,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self.generation += 1
+
+
+_local_cache = _LocalLRUCache()
+# memory only, successful Basic auth credentials so the password hasher isn't
+# run on every request
+_credential_cache = _LocalLRUCache()
+_credential_hmac_key = os.urandom(32)
+
+_load_global_settings()
+
+
+def _user_cache_key(user_id: Any) -> str:
+    return f"principal__user__{user_id}"
+
+
+def _token_cache_key(token_key: str) -> str:
+    # never store the bearer secret itself
+    return f"principal__token__{hashlib.sha256(token_key.encode()).hexdigest()}"
+
+
+def _credential_cache_key(username: str, password: str) -> str:
+    # keyed so that the cache never holds anything a password could be
+    # recovered from
+    return hmac.new(
+        _credential_hmac_key,
+        f"{len(username)}:{username}:{password}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def _version_key(cache_key: str) -> str:
+    return f"{cache_key}__version"
+
+
+# entries are stamped with the version current before the database read, and
+# every invalidation bumps it, so a read that raced an invalidation can't serve
+# the stale row it wrote back
+def _get_versioned(cache_key: str) -> tuple[str | None, Any | None]:
+    cache = caches["principal"]
+    version_key = _version_key(cache_key)
+    values = cache.get_many((cache_key, version_key))
+
+    version: str | None = values.get(version_key)
+    if version is None:
+        version = secrets.token_hex(8)
+        if not cache.add(
+            version_key, version, _PRINCIPAL_CACHE_TIMEOUT.total_seconds()
+        ):
+            # lost to a concurrent invalidation or read, leave it uncached
+            return None, None
+
+    entry: tuple[str, Any] | None = values.get(cache_key)
+    if entry is not None and entry[0] == version:
+        return version, entry[1]
+
+    return version, None
+
+
+async def _aget_versioned(cache_key: str) -> tuple[str | None, Any | None]:
+    cache = caches["principal"]
+    version_key = _version_key(cache_key)
+    values = await cache.aget_many((cache_key, version_key))
+
+    version: str | None = values.get(version_key)
+    if version is None:
+        version = secrets.token_hex(8)
+        if not await cache.aadd(
+            version_key, version, _PRINCIPAL_CACHE_TIMEOUT.total_seconds()
+        ):
+            return None, None
+
+    entry: tuple[str, Any] | None = values.get(cache_key)
+    if entry is not None and entry[0] == version:
+        return version, entry[1]
+
+    return version, None
+
+
+# the password hash never leaves the database, only the session auth hash, an
+# HMAC of it that sessions hold anyway, which is also enough to tell that the
+# password changed
+def _user_to_entry(user: User) -> dict[str, Any]:
+    entry = {
+        f.attname: getattr(user, f.attname)
+        for f in User._meta.concrete_fields
+        if f.attname != "password"
+    }
+    entry["session_auth_hash"] = user.get_session_auth_hash()
+    return entry
+
+
+def _user_from_entry(entry: dict[str, Any]) -> User:
+    values = dict(entry)
+    session_auth_hash = values.pop("session_auth_hash")
+    # as if loaded with the password deferred
+    user = User.from_db(None, list(values), list(values.values()))
+    user.cached_session_auth_hash = session_auth_hash
+    return user
+
+
+def get_user(user_id: Any) -> User | None:
+    cache_key = _user_cache_key(user_id)
+
+    entry: dict[str, Any] | None = _local_cache.get(cache_key)
+    if entry is not None:
+        return _user_from_entry(entry)
+
+    local_generation = _local_cache.generation
+    version, entry = _get_versioned(cache_key)
+    if entry is None:
+        try:
+            entry = _user_to_entry(User.objects.get(pk=user_id))
+        except User.DoesNotExist:
+            return None
+
+        if version is not None:
+            caches["principal"].set(
+                cache_key, (version, entry), _PRINCIPAL_CACHE_TIMEOUT.total_seconds()
+            )
+
+    _local_cache.set(cache_key, entry, local_generation)
+    return _user_from_entry(entry)
+
+
+async def aget_user(user_id: Any) -> User | None:
+    cache_key = _user_cache_key(user_id)
+
+    entry: dict[str, Any] | None = _local_cache.get(cache_key)
+    if entry is not None:
+        return _user_from_entry(entry)
+
+    local_generation = _local_cache.generation
+    version, entry = await _aget_versioned(cache_key)
+    if entry is None:
+        try:
+            entry = _user_to_entry(await User.objects.aget(pk=user_id))
+        except User.DoesNotExist:
+            return None
+
+        if version is not None:
+            await caches["principal"].aset(
+                cache_key, (version, entry), _PRINCIPAL_CACHE_TIMEOUT.total_seconds()
+            )
+
+    _local_cache.set(cache_key, entry, local_generation)
+    return _user_from_entry(entry)
+
+
+async def aget_token(token_key: str) -> Token | None:
+    cache_key = _token_cache_key(token_key)
+
+    # only what authentication needs, never the key itself
+    entry: tuple[Any, datetime.datetime | None] | None = _local_cache.get(cache_key)
+    if entry is None:
+        local_generation = _local_cache.generation
+        version, entry = await _aget_versioned(cache_key)
+        if entry is None:
+            try:
+                token = await Token.objects.only("user_id", "expires_at").aget(
+                    key=token_key
+                )
+            except Token.DoesNotExist:
+                return None
+
+            entry = (token.user_id, token.expires_at)
+            if version is not None:
+                await caches["principal"].aset(
+                    cache_key,
+                    (version, entry),
+                    _PRINCIPAL_CACHE_TIMEOUT.total_seconds(),
+                )
+
+        _local_cache.set(cache_key, entry, local_generation)
+
+    # as if loaded, so that the expiry can be saved and the token deleted
+    return Token.from_db(None, ("key", "user_id", "expires_at"), (token_key, *entry))
+
+
+async def aget_user_by_credentials(username: str, password: str) -> User | None:
+    cache_key = _credential_cache_key(username, password)
+
+    entry: tuple[Any, str] | None = _credential_cache.get(cache_key)
+    if entry is None:
+        return None
+
+    user_id, session_auth_hash = entry
+    user = await aget_user(user_id)
+    # the session auth hash changes with the password, and the user is reloaded
+    # once saved, so password changes and deactivation invalidate the entry
+    if (
+        user is None
+        or not user.is_active
+        or user.get_session_auth_hash() != session_auth_hash
+    ):
+        _credential_cache.delete(cache_key)
+        return None
+
+    return user
+
+
+def set_user_credentials(username: str, password: str, user: User) -> None:
+    _credential_cache.set(
+        _credential_cache_key(username, password),
+        (user.pk, user.get_session_auth_hash()),
+    )
+
+
+def _invalidate(cache_key: str) -> None:
+    _local_cache.delete(cache_key)
+    caches["principal"].set_many(
+        {
+            _version_key(cache_key): secrets.token_hex(8),
+            cache_key: None,
+        },
+        _PRINCIPAL_CACHE_TIMEOUT.total_seconds(),
+    )
+
+
+async def _ainvalidate_many(cache_keys: list[str]) -> None:
+    # a single round trip for all of them
+    for cache_key in cache_keys:
+        _local_cache.delete(cache_key)
+    values: dict[str, Any] = {}
+    for cache_key in cache_keys:
+        values[_version_key(cache_key)] = secrets.token_hex(8)
+        values[cache_key] = None
+    await caches["principal"].aset_many(
+        values, _PRINCIPAL_CACHE_TIMEOUT.total_seconds()
+    )
+
+
+def invalidate_user(user_id: Any) -> None:
+    _invalidate(_user_cache_key(user_id))
+
+
+def invalidate_token(token_key: str) -> None:
+    _invalidate(_token_cache_key(token_key))
+
+
+async def ainvalidate_tokens(token_keys: list[str]) -> None:
+    if token_keys:
+        await _ainvalidate_many([_token_cache_key(k) for k in token_keys])
+
+
+def _invalidate_on_commit(fn: Any, *args: Any) -> None:
+    fn(*args)
+    # again once committed, as reads until then still see the old row
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: fn(*args))
+
+
+# covers password changes, deactivation and deletion, as well as the sliding
+# token expiry; sessions are dropped on logout, and the session auth hash is
+# checked against the freshly loaded user after a password change
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _invalidate_user(sender: Any, instance: User, **kwargs: Any):
+    _invalidate_on_commit(invalidate_user, instance.pk)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def _invalidate_token(sender: Any, instance: Token, **kwargs: Any):
+    _invalidate_on_commit(invalidate_token, instance.key)
@@ -1,4 +1,5 @@
 from typing import Annotated, Any
+import datetime
 import re
 
 from django.core.exceptions import ValidationError
@@ -88,3 +89,16 @@ class UserDeleteInSchema(Schema):
 
 class UserLookupInSchema(Schema):
     user_ids: list[str] = Field(default_factory=list, alias="userIds")
+
+
+class TokenOutSchema(Schema):
+    key: str
+    createdAt: datetime.datetime = Field(alias="created_at")
+    expiresAt: datetime.datetime | None = Field(alias="expires_at")
+
+
+class TokenListOutSchema(Schema):
+    # the full key is only ever returned when issued
+    keyPrefix: str = Field(alias="key_prefix")
+    createdAt: datetime.datetime = Field(alias="created_at")
+    expiresAt: datetime.datetime | None = Field(alias="expires_at")
@@ -1,27 +1,41 @@
 import datetime
-from typing import Any, Optional
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Literal, Optional
 
 from django.conf import settings
-from django.contrib.auth import aauthenticate
-from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
+from django.core.cache import caches
 from django.core.signals import setting_changed
 from django.dispatch import receiver
 from django.http import HttpRequest
 from django.utils import timezone
+from ninja.errors import HttpError
 from ninja.security import HttpBasicAuth as _HttpBasicAuth
 from ninja.security import HttpBearer as _HttpBearer
+from ninja.security.http import DecodeError
 from ninja.security.session import SessionAuth as _SessionAuth
+from ninja.throttling import SimpleRateThrottle
+from ninja.utils import check_csrf
 
+from app_admin import principal_cache
+from app_admin.auth_backends import aauthenticate
 from app_admin.models import Token
 
+_logger = logging.getLogger(__name__)
+
 _TOKEN_EXPIRY_INTERVAL: datetime.timedelta
+_AUTH_TIMESTAMP_GRANULARITY: datetime.timedelta
 
 
 @receiver(setting_changed)
 def _load_global_settings(*args: Any, **kwargs: Any):
     global _TOKEN_EXPIRY_INTERVAL
+    global _AUTH_TIMESTAMP_GRANULARITY
 
     _TOKEN_EXPIRY_INTERVAL = settings.TOKEN_EXPIRY_INTERVAL
+    _AUTH_TIMESTAMP_GRANULARITY = settings.AUTH_TIMESTAMP_GRANULARITY
 
 
 _load_global_settings()
@@ -29,6 +43,12 @@ _load_global_settings()
 
 async def anonymous_fallback(request: HttpRequest):
     user = AnonymousUser()
+    _set_request_user(request, user)
+
+    return user
+
+
+def _set_request_user(request: HttpRequest, user: Any) -> None:
     request.user = user
 
     async def auser():
@@ -36,23 +56,40 @@ async def anonymous_fallback(request: HttpRequest):
 
     request.auser = auser
 
-    return user
 
+@dataclass(slots=True)
+class AuthResolution:
+    scheme: Literal["session", "basic", "bearer"] | None
+    principal: Any | None
+    # seconds spent in each step
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+# the schemes stay separate for the OpenAPI docs, but only the one detected by
+# `aresolve_auth` authenticates
+class _ResolvedAuthMixin:
+    scheme: Literal["session", "basic", "bearer"]
+
+    async def __call__(self, request: HttpRequest) -> Optional[Any]:
+        resolution = await aresolve_auth(request)
+        return resolution.principal if resolution.scheme == self.scheme else None
+
+
+class AHttpBasicAuth(_ResolvedAuthMixin, _HttpBasicAuth):
+    scheme = "basic"
 
-class AHttpBasicAuth(_HttpBasicAuth):
     async def authenticate(
         self, request: HttpRequest, username: str, password: str
     ) -> Optional[Any]:
-        user = await aauthenticate(request, username=username, password=password)
-        if user:
-            user.last_login = timezone.now()
-            await user.asave(update_fields=("last_login",))
-            request.user = user
+        # failed attempts always go through the password hasher
+        user = await principal_cache.aget_user_by_credentials(username, password)
+        if user is None:
+            user = await aauthenticate(request, username=username, password=password)
+            if user is not None:
+                principal_cache.set_user_credentials(username, password, user)
 
-            async def auser():
-                return user
-
-            request.auser = auser
+        if user:
+            await _atouch_last_login(user, timezone.now())
         return user
 
 
@@ -64,12 +101,12 @@ class TokenExpired(Exception):
     pass
 
 
-class AHttpBearer(_HttpBearer):
+class AHttpBearer(_ResolvedAuthMixin, _HttpBearer):
+    scheme = "bearer"
+
     async def authenticate(self, request: HttpRequest, token: str) -> Optional[Any]:
-        token_obj: Token
-        try:
-            token_obj = await Token.objects.select_related("user").aget(key=token)
-        except Token.DoesNotExist:
+        token_obj = await principal_cache.aget_token(token)
+        if token_obj is None:
             raise TokenInvalid
 
         if token_obj.expires_at is not None:
@@ -78,23 +115,37 @@ class AHttpBearer(_HttpBearer):
                 await token_obj.adelete()
                 raise TokenExpired
 
-            token_obj.expires_at = now + _TOKEN_EXPIRY_INTERVAL
-            await token_obj.asave(update_fields=("expires_at",))
-
-        user = token_obj.user
-        user.last_login = timezone.now()
-        await user.asave(update_fields=("last_login",))
-        request.user = user
+            expires_at = now + _TOKEN_EXPIRY_INTERVAL
+            if expires_at - token_obj.expires_at >= _AUTH_TIMESTAMP_GRANULARITY:
+                token_obj.expires_at = expires_at
+                await token_obj.asave(update_fields=("expires_at",))
 
-        async def auser():
-            return user
+        user = await principal_cache.aget_user(token_obj.user_id)
+        if user is None or not user.is_active:
+            raise TokenInvalid
+        token_obj.user = user
 
-        request.auser = auser
+        await _atouch_last_login(user, timezone.now())
 
         return token_obj
 
 
-class ASessionAuth(_SessionAuth):
+# refreshed at most once per `AUTH_TIMESTAMP_GRANULARITY`, so that authenticated
+# reads stay read-only
+async def _atouch_last_login(user: AbstractBaseUser, now: datetime.datetime) -> None:
+    if (
+        user.last_login is not None
+        and now - user.last_login < _AUTH_TIMESTAMP_GRANULARITY
+    ):
+        return
+
+    user.last_login = now
+    await user.asave(update_fields=("last_login",))
+
+
+class ASessionAuth(_ResolvedAuthMixin, _SessionAuth):
+    scheme = "session"
+
     async def authenticate(
         self, request: HttpRequest, key: Optional[str]
     ) -> Optional[Any]:
@@ -105,5 +156,91 @@ class ASessionAuth(_SessionAuth):
         return None
 
 
-must_auth = [ASessionAuth(), AHttpBasicAuth(), AHttpBearer()]
+async def aresolve_auth(request: HttpRequest) -> AuthResolution:
+    # memoized on the request, so that every scheme in `must_auth` shares it
+    resolution: AuthResolution | None = getattr(request, "auth_resolution", None)
+    if resolution is not None:
+        return resolution
+
+    resolution = AuthResolution(scheme=None, principal=None)
+
+    started_at = time.perf_counter()
+    auth_value = request.headers.get("Authorization")
+    scheme, _, credentials = (auth_value or "").partition(" ")
+    scheme = scheme.lower()
+    resolution.timings["detect"] = time.perf_counter() - started_at
+
+    # a recognized `Authorization` header takes precedence over the session
+    # cookie, and like ninja's `HttpBasicAuth` and `HttpBearer` it isn't
+    # subject to the CSRF check, as browsers never send it on their own
+    if scheme not in ("basic", "bearer"):
+        started_at = time.perf_counter()
+        if check_csrf(request):
+            raise HttpError(403, "CSRF check Failed")
+        resolution.timings["csrf"] = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    if scheme == "basic":
+        resolution.scheme = "basic"
+        try:
+            username, password = _basic_auth.decode_authorization(auth_value)
+        except DecodeError:
+            pass
+        else:
+            resolution.principal = await _basic_auth.authenticate(
+                request, username, password
+            )
+    elif scheme == "bearer":
+        resolution.scheme = "bearer"
+        resolution.principal = await _bearer_auth.authenticate(request, credentials)
+    else:
+        resolution.scheme = "session"
+        resolution.principal = await _session_auth.authenticate(
+            request, request.COOKIES.get(_session_auth.param_name)
+        )
+
+    if resolution.scheme is not None:
+        resolution.timings[resolution.scheme] = time.perf_counter() - started_at
+
+    if resolution.principal is not None:
+        _set_request_user(
+            request,
+            (
+                resolution.principal.user
+                if isinstance(resolution.principal, Token)
+                else resolution.principal
+            ),
+        )
+
+    _logger.debug("auth resolved: %s", resolution)
+    request.auth_resolution = resolution
+    return resolution
+
+
+_session_auth = ASessionAuth()
+_basic_auth = AHttpBasicAuth()
+_bearer_auth = AHttpBearer()
+
+must_auth = [_session_auth, _basic_auth, _bearer_auth]
 auth_optional = must_auth + [anonymous_fallback]
+
+
+class UserRateThrottle(SimpleRateThrottle):
+    # keyed on the user rather than the credential, so minting tokens won't help
+    cache = caches["throttle"]
+
+    def __init__(self, scope: str, rate: str):
+        self.scope = scope
+        super().__init__(rate)
+
+    def get_cache_key(self, request: HttpRequest) -> str:
+        auth = getattr(request, "auth", None)
+        ident: Any
+        if isinstance(auth, Token):
+            ident = auth.user_id
+        elif isinstance(auth, AbstractBaseUser):
+            ident = auth.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {"scope": self.scope, "ident": ident}
@@ -1,14 +1,21 @@
 import asyncio
+import datetime
+import io
 from typing import Any, Dict
 from unittest.mock import Mock
 import uuid
 
+from asgiref.sync import sync_to_async
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
 from ninja.testing import TestAsyncClient as TestAsyncClient_
 from django.contrib.sessions.backends.cache import SessionStore
 
-from app_admin.models import User
+from app_admin.models import Token, User
 from app_admin.api import router
+from app_admin.security import AHttpBearer, TokenInvalid
 
 
 class TestAsyncClient(TestAsyncClient_):
@@ -62,6 +69,22 @@ class ApiTestCase(TestCase):
             )
             self.assertEqual(response.status_code, 409, response.content)
 
+    async def test_register_alreadyexists_email_case(self):
+        with self.settings(VALIDATE_EMAIL_DELIVERABILITY=False):
+            test_client = TestAsyncClient(router)
+
+            await User.objects.acreate_user("user1", "test@test.com", "Password1!")
+
+            response = await test_client.post(
+                "/register",
+                json={
+                    "username": "user2",
+                    "email": "TEST@test.com",
+                    "password": "aC0mplic?tedTestPassword",
+                },
+            )
+            self.assertEqual(response.status_code, 409, response.content)
+
     async def test_register_weakpassword(self):
         with self.settings(VALIDATE_EMAIL_DELIVERABILITY=False):
             test_client = TestAsyncClient(router)
@@ -292,6 +315,80 @@ class ApiTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 401, response.content)
 
+    async def test_tokens(self):
+        test_client = TestAsyncClient(router)
+
+        user1 = await User.objects.acreate_user("user1", "test1@test.com", None)
+        user2 = await User.objects.acreate_user("user2", "test2@test.com", None)
+        other_token = await Token.objects.acreate(user=user2)
+
+        response = await test_client.post("/user/tokens", user=user1)
+        self.assertEqual(response.status_code, 200, response.content)
+        token_key = response.json()["key"]
+        self.assertIsNotNone(response.json()["expiresAt"])
+
+        response = await test_client.post("/user/tokens", user=user1)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = await test_client.get("/user/tokens", user=user1)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()), 2)
+        self.assertIn(token_key[:8], [t["keyPrefix"] for t in response.json()])
+        self.assertNotIn("key", response.json()[0])
+
+        auth = AHttpBearer()
+        self.assertIsNotNone(await auth.authenticate(Mock(), token_key))
+
+        response = await test_client.delete("/user/tokens", user=user1)
+        self.assertEqual(response.status_code, 204, response.content)
+
+        self.assertFalse(await Token.objects.filter(user=user1).aexists())
+        self.assertTrue(await Token.objects.filter(pk=other_token.pk).aexists())
+
+        # the cached copy is evicted as well
+        with self.assertRaises(TokenInvalid):
+            await auth.authenticate(Mock(), token_key)
+
+        response = await test_client.get("/user/tokens", user=user1)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), [])
+
+    async def test_sweepexpired(self):
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        now = timezone.now()
+        live_tokens = [
+            await Token.objects.acreate(user=user),
+            await Token.objects.acreate(
+                user=user, expires_at=(now + datetime.timedelta(days=1))
+            ),
+        ]
+        for _ in range(5):
+            await Token.objects.acreate(
+                user=user, expires_at=(now - datetime.timedelta(days=1))
+            )
+
+        await Session.objects.acreate(
+            session_key="live",
+            session_data="",
+            expire_date=(now + datetime.timedelta(days=1)),
+        )
+        for i in range(3):
+            await Session.objects.acreate(
+                session_key=f"expired{i}",
+                session_data="",
+                expire_date=(now - datetime.timedelta(days=1)),
+            )
+
+        await sync_to_async(call_command)(
+            "sweepexpired", batch_size=2, stderr=io.StringIO()
+        )
+
+        self.assertEqual(
+            {t.key async for t in Token.objects.all()}, {t.key for t in live_tokens}
+        )
+        self.assertEqual([s.session_key async for s in Session.objects.all()], ["live"])
+
     async def test_get_csrf_token(self):
         test_client = TestAsyncClient(router)
 
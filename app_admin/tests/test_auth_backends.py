@@ -1,25 +1,24 @@
 from typing import ClassVar
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import uuid
 
+from django.contrib.auth.hashers import make_password
 from django.http import HttpRequest
 from django.test import TestCase
 
-from app_admin.auth_backends import EmailBackend
+from app_admin.auth_backends import ModelBackend, aauthenticate
 from app_admin.models import User
 
 
-class EmailBackendTestCase(TestCase):
-    user_credentials = {"username": "test@test.com", "password": "test"}
-
+class ModelBackendTestCase(TestCase):
     user: ClassVar[User]
-    backend: ClassVar[EmailBackend]
+    backend: ClassVar[ModelBackend]
 
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.backend = EmailBackend()
+        cls.backend = ModelBackend()
 
     @classmethod
     def setUpTestData(cls) -> None:
@@ -28,31 +27,95 @@ class EmailBackendTestCase(TestCase):
         cls.user = User.objects.create_user("user1", "test@test.com", "test")
 
     def test_authenticate(self):
+        for username in ("user1", "test@test.com", "TEST@test.com"):
+            with self.subTest(username=username), self.assertNumQueries(1):
+                self.assertEqual(
+                    ModelBackendTestCase.backend.authenticate(
+                        Mock(HttpRequest), username=username, password="test"
+                    ),
+                    ModelBackendTestCase.user,
+                )
+
+        self.assertIsNone(
+            ModelBackendTestCase.backend.authenticate(
+                Mock(HttpRequest), username="user1", password="bad"
+            )
+        )
+
+        with (
+            self.assertNumQueries(1),
+            patch(
+                "app_admin.auth_backends.make_password", wraps=make_password
+            ) as make_password_mock,
+        ):
+            self.assertIsNone(
+                ModelBackendTestCase.backend.authenticate(
+                    Mock(HttpRequest), username="missing@test.com", password="test"
+                )
+            )
+            make_password_mock.assert_called_once()
+
+    def test_authenticate_collision(self):
+        user = User.objects.create_user("other@test.com", "other@test.com", "test")
+        User.objects.create_user("user2", "OTHER@test.com", "test2")
+
         self.assertEqual(
-            EmailBackendTestCase.backend.authenticate(
-                **EmailBackendTestCase.user_credentials,
-                request=Mock(HttpRequest),
+            ModelBackendTestCase.backend.authenticate(
+                Mock(HttpRequest), username="other@test.com", password="test"
             ),
-            EmailBackendTestCase.user,
+            user,
         )
 
-        self.assertIsNone(
-            EmailBackendTestCase.backend.authenticate(
-                request=Mock(HttpRequest),
-                username="missing@test.com",
-                password="test",
+    def test_authenticate_ambiguous_email(self):
+        User.objects.create_user("user2", "other@test.com", "test")
+        User.objects.create_user("user3", "OTHER@test.com", "test")
+
+        for username in ("other@test.com", "OTHER@test.com"):
+            with self.subTest(username=username):
+                self.assertIsNone(
+                    ModelBackendTestCase.backend.authenticate(
+                        Mock(HttpRequest), username=username, password="test"
+                    )
+                )
+
+        self.assertIsNotNone(
+            ModelBackendTestCase.backend.authenticate(
+                Mock(HttpRequest), username="user3", password="test"
             )
         )
 
     def test_get_user(self):
         self.assertEqual(
-            EmailBackendTestCase.backend.get_user(EmailBackendTestCase.user.pk),
-            EmailBackendTestCase.user,
+            ModelBackendTestCase.backend.get_user(ModelBackendTestCase.user.pk),
+            ModelBackendTestCase.user,
+        )
+        self.assertIsNone(ModelBackendTestCase.backend.get_user(uuid.UUID(int=0)))
+
+        ModelBackendTestCase.user.is_active = False
+        ModelBackendTestCase.user.save(update_fields=("is_active",))
+        self.assertIsNone(
+            ModelBackendTestCase.backend.get_user(ModelBackendTestCase.user.pk)
+        )
+
+
+class AAuthenticateTestCase(TestCase):
+    async def test_aauthenticate(self):
+        user = await User.objects.acreate_user("user1", "test@test.com", "test")
+
+        user_ = await aauthenticate(
+            Mock(HttpRequest), username="user1", password="test"
+        )
+        self.assertEqual(user_, user)
+        assert user_ is not None
+        self.assertEqual(user_.backend, "app_admin.auth_backends.ModelBackend")
+
+        user_ = await aauthenticate(
+            Mock(HttpRequest), username="TEST@test.com", password="test"
         )
-        self.assertIsNone(EmailBackendTestCase.backend.get_user(uuid.UUID(int=0)))
+        self.assertEqual(user_, user)
+        assert user_ is not None
+        self.assertEqual(user_.backend, "app_admin.auth_backends.ModelBackend")
 
-        EmailBackendTestCase.user.is_active = False
-        EmailBackendTestCase.user.save(update_fields=("is_active",))
         self.assertIsNone(
-            EmailBackendTestCase.backend.get_user(EmailBackendTestCase.user.pk)
+            await aauthenticate(Mock(HttpRequest), username="user1", password="bad")
         )
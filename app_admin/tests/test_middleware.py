@@ -0,0 +1,48 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, TestCase
+
+from app_admin.middleware import SessionMiddleware
+
+
+class SessionMiddlewareTestCase(TestCase):
+    def test_lazy_save(self):
+        def get_response(request: HttpRequest) -> HttpResponse:
+            request.session.get("key")
+            if "write" in request.GET:
+                request.session["key"] = request.GET["write"]
+            return HttpResponse()
+
+        middleware = SessionMiddleware(get_response)
+        factory = RequestFactory()
+
+        def request(session_key: str | None, path: str = "/") -> HttpResponse:
+            request = factory.get(path)
+            if session_key is not None:
+                request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+            return middleware(request)
+
+        response = request(None, "/?write=value1")
+        session_key = response.cookies[settings.SESSION_COOKIE_NAME].value
+        expire_date = Session.objects.get(pk=session_key).expire_date
+
+        # an unchanged session is neither saved nor its cookie reissued
+        response = request(session_key)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertEqual(Session.objects.get(pk=session_key).expire_date, expire_date)
+
+        response = request(session_key, "/?write=value2")
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        expire_date_ = Session.objects.get(pk=session_key).expire_date
+        self.assertGreater(expire_date_, expire_date)
+
+        # the expiry still slides once the refresh interval has passed
+        with self.settings(SESSION_REFRESH_INTERVAL=datetime.timedelta(0)):
+            response = request(session_key)
+            self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+            self.assertGreater(
+                Session.objects.get(pk=session_key).expire_date, expire_date_
+            )
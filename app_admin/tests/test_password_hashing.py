@@ -0,0 +1,44 @@
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase
+
+from app_admin import password_hashing
+from app_admin.models import User
+
+
+class PasswordHashingTestCase(TestCase):
+    async def test_acheck_password(self):
+        user = await User.objects.acreate_user("user1", "test@test.com", "P4ssw0rd!")
+        self.assertTrue(await password_hashing.acheck_password(user, "P4ssw0rd!"))
+        self.assertFalse(await password_hashing.acheck_password(user, "bad"))
+
+        # hashes from a non-default hasher are upgraded
+        user.password = make_password("P4ssw0rd!", hasher="pbkdf2_sha256")
+        await user.asave(update_fields=("password",))
+
+        self.assertTrue(await password_hashing.acheck_password(user, "P4ssw0rd!"))
+        await user.arefresh_from_db(fields=("password",))
+        self.assertTrue(user.password.startswith("argon2"))
+
+    async def test_saturated(self):
+        rejected = password_hashing.get_stats()["rejected"]
+
+        with self.settings(PASSWORD_HASHING_MAX_PENDING=0):
+            with self.assertRaises(password_hashing.PasswordHashingSaturated):
+                await password_hashing.amake_password("P4ssw0rd!")
+
+        stats = password_hashing.get_stats()
+        self.assertEqual(stats["rejected"], rejected + 1)
+        self.assertEqual(stats["pending"], 0)
+
+        with self.assertLogs("app_admin.password_hashing", "INFO") as logs:
+            self.assertIsNotNone(await password_hashing.amake_password("P4ssw0rd!"))
+        self.assertIn("password hashing recovered", logs.output[0])
+
+    async def test_resized_pool(self):
+        self.assertIsNotNone(await password_hashing.amake_password("P4ssw0rd!"))
+        executor = password_hashing._executor
+
+        with self.settings(PASSWORD_HASHING_MAX_WORKERS=1):
+            self.assertIsNotNone(await password_hashing.amake_password("P4ssw0rd!"))
+            self.assertIsNot(password_hashing._executor, executor)
+            self.assertEqual(password_hashing._executor._max_workers, 1)
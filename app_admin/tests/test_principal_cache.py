@@ -0,0 +1,117 @@
+from unittest.mock import Mock
+
+from django.core.cache import caches
+from django.http import HttpRequest
+from django.test import TestCase
+
+from app_admin import principal_cache
+from app_admin.models import Token, User
+from app_admin.security import AHttpBearer, TokenInvalid
+
+
+class PrincipalCacheTestCase(TestCase):
+    def test_get_user(self):
+        user = User.objects.create_user("user1", "test@test.com", "P4ssw0rd!")
+
+        user_ = principal_cache.get_user(user.pk)
+        assert user_ is not None
+        self.assertEqual(user_.username, "user1")
+
+        # bypasses the signals, so the cached copy is served
+        User.objects.filter(pk=user.pk).update(username="user2")
+        user_ = principal_cache.get_user(user.pk)
+        assert user_ is not None
+        self.assertEqual(user_.username, "user1")
+
+        # mutating a returned copy doesn't touch the cache
+        user_.username = "user3"
+        user_ = principal_cache.get_user(user.pk)
+        assert user_ is not None
+        self.assertEqual(user_.username, "user1")
+
+        user.set_password("N3wP4ssw0rd!")
+        user.save(update_fields=("password",))
+        user_ = principal_cache.get_user(user.pk)
+        assert user_ is not None
+        self.assertEqual(user_.username, "user2")
+        self.assertEqual(user_.get_session_auth_hash(), user.get_session_auth_hash())
+
+        # the password hash itself is never cached
+        (_, entry) = caches["principal"].get(principal_cache._user_cache_key(user.pk))
+        self.assertNotIn(user.password, repr(entry))
+
+        user.delete()
+        self.assertIsNone(principal_cache.get_user(user.pk))
+
+    def test_invalidation_race(self):
+        user = User.objects.create_user("user1", "test@test.com", "P4ssw0rd!")
+        cache_key = principal_cache._user_cache_key(user.pk)
+
+        # a read that loaded the user before it got deactivated...
+        local_generation = principal_cache._local_cache.generation
+        version, _ = principal_cache._get_versioned(cache_key)
+        stale_user = User.objects.get(pk=user.pk)
+
+        user.is_active = False
+        user.save(update_fields=("is_active",))
+
+        # ...and only then stores it
+        stale_entry = principal_cache._user_to_entry(stale_user)
+        caches["principal"].set(cache_key, (version, stale_entry))
+        principal_cache._local_cache.set(cache_key, stale_entry, local_generation)
+
+        user_ = principal_cache.get_user(user.pk)
+        assert user_ is not None
+        self.assertFalse(user_.is_active)
+
+    def test_local_max_size(self):
+        users = [
+            User.objects.create_user(f"user{i}", f"test{i}@test.com", None)
+            for i in range(3)
+        ]
+
+        with self.settings(PRINCIPAL_CACHE_LOCAL_MAX_SIZE=2):
+            for user in users:
+                principal_cache.get_user(user.pk)
+
+            self.assertIsNone(
+                principal_cache._local_cache.get(
+                    principal_cache._user_cache_key(users[0].pk)
+                )
+            )
+            self.assertIsNotNone(
+                principal_cache._local_cache.get(
+                    principal_cache._user_cache_key(users[2].pk)
+                )
+            )
+
+    async def test_aget_token(self):
+        user = await User.objects.acreate_user("user1", "test@test.com", "P4ssw0rd!")
+        token = await Token.objects.acreate(user=user)
+
+        token_ = await principal_cache.aget_token(token.key)
+        assert token_ is not None
+        self.assertEqual(token_.user_id, user.pk)
+
+        # the key itself is never cached
+        entry = await caches["principal"].aget(
+            principal_cache._token_cache_key(token.key)
+        )
+        self.assertNotIn(token.key, repr(entry))
+
+        token_key = token.key
+        await token.adelete()
+        self.assertIsNone(await principal_cache.aget_token(token_key))
+
+    async def test_deactivated_user(self):
+        user = await User.objects.acreate_user("user1", "test@test.com", "P4ssw0rd!")
+        token = await Token.objects.acreate(user=user)
+
+        auth = AHttpBearer()
+        self.assertIsNotNone(await auth.authenticate(Mock(HttpRequest), token.key))
+
+        user.is_active = False
+        await user.asave(update_fields=("is_active",))
+
+        with self.assertRaises(TokenInvalid):
+            await auth.authenticate(Mock(HttpRequest), token.key)
@@ -1,12 +1,41 @@
+from typing import Any
+
+from asgiref.sync import async_to_sync
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Exists, OuterRef, QuerySet
+from django.forms import BaseInlineFormSet, ModelForm
+from django.http import HttpRequest
 from adminsortable2.admin import SortableAdminMixin
 
-from art.models import Chapter, ChapterReport, Story, StoryReport, Tag, Category
+from art.caching import STORY_LIST_KEY, apurge_surrogate_keys, story_key
+from art.models import (
+    CHAPTER_SORT_KEY_GAP,
+    Chapter,
+    ChapterReport,
+    ReportedChapter,
+    ReportedStory,
+    ReportKind,
+    Story,
+    StoryReport,
+    Tag,
+    Category,
+    count_words,
+)
 
 
 class ChaptersInline(admin.TabularInline):
     model = Chapter
     extra = 0
+    ordering = ["sort_key"]
+    # maintained by `StoryAdmin.save_formset`, added chapters are appended
+    readonly_fields = [
+        "sort_key",
+        "word_count",
+        "is_counted",
+        "report_count",
+        "report_kind",
+    ]
 
 
 @admin.register(Story)
@@ -16,6 +45,56 @@ class StoryAdmin(admin.ModelAdmin):
     ordering = ["title"]
     search_fields = ["title", "author__email"]
     inlines = [ChaptersInline]
+    # maintained from the chapters, see `save_formset`, and the reports
+    readonly_fields = [
+        "word_count",
+        "chapter_count",
+        "first_published_at",
+        "last_published_at",
+        "next_chapter_sort_key",
+        "all_chapter_count",
+        "report_count",
+        "report_kind",
+    ]
+
+    def save_formset(
+        self,
+        request: HttpRequest,
+        form: ModelForm,
+        formset: BaseInlineFormSet,
+        change: bool,
+    ) -> None:
+        if formset.model is not Chapter:
+            return super().save_formset(request, form, formset, change)
+
+        # as the API does: appended chapters claim keys past every existing
+        # one, then the story's aggregates are recomputed
+        story: Story = form.instance
+        story_qs = Story.objects.filter(uuid=story.uuid)
+        chapters: list[Chapter] = formset.save(commit=False)
+
+        added_chapters = [c for c in chapters if c._state.adding]
+        if added_chapters:
+            claimed = Story.append_chapters(story_qs, len(added_chapters))
+            assert claimed is not None
+            first_sort_key, _ = claimed
+            for i, chapter in enumerate(added_chapters):
+                chapter.sort_key = first_sort_key + i * CHAPTER_SORT_KEY_GAP
+
+        for chapter in chapters:
+            chapter.word_count = count_words(chapter.markdown)
+            chapter.save()
+        for chapter in formset.deleted_objects:
+            chapter.delete()
+        formset.save_m2m()
+
+        Story.update_from_chapters(story_qs)
+
+        transaction.on_commit(
+            lambda: async_to_sync(apurge_surrogate_keys)(
+                (STORY_LIST_KEY, story_key(story.uuid))
+            )
+        )
 
 
 @admin.register(Category)
@@ -29,11 +108,101 @@ class TagAdmin(admin.ModelAdmin):
     search_fields = ["name", "pretty_name"]
 
 
+class _ReportKindFilter(admin.SimpleListFilter):
+    # targets with at least one report of the kind, served by the reports'
+    # (target, kind) index
+    title = "kind"
+    parameter_name = "kind"
+    report_model: type[StoryReport] | type[ChapterReport]
+    target_field: str
+
+    def lookups(self, request: HttpRequest, model_admin: Any) -> list[tuple[Any, str]]:
+        return ReportKind.choices
+
+    def queryset(self, request: HttpRequest, queryset: QuerySet[Any]) -> QuerySet[Any]:
+        if self.value() is None:
+            return queryset
+
+        return queryset.filter(
+            Exists(
+                self.report_model.objects.filter(
+                    **{self.target_field: OuterRef("uuid")}, kind=self.value()
+                )
+            )
+        )
+
+
+class _StoryReportKindFilter(_ReportKindFilter):
+    report_model = StoryReport
+    target_field = "story"
+
+
+class _ChapterReportKindFilter(_ReportKindFilter):
+    report_model = ChapterReport
+    target_field = "chapter"
+
+
+class _ReportAdmin(admin.ModelAdmin):
+    target_model: type[Story] | type[Chapter]
+    target_field: str
+
+    # the targets' counters follow the reports
+    def delete_model(self, request: HttpRequest, obj: Any) -> None:
+        super().delete_model(request, obj)
+        self.target_model.update_report_counts(
+            self.target_model.objects.filter(
+                uuid=getattr(obj, f"{self.target_field}_id")
+            )
+        )
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet[Any]) -> None:
+        target_ids = list(queryset.values_list(self.target_field, flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        self.target_model.update_report_counts(
+            self.target_model.objects.filter(uuid__in=target_ids)
+        )
+
+
 @admin.register(StoryReport)
-class StoryReportAdmin(admin.ModelAdmin):
-    list_display = ["story__title", "kind"]
+class StoryReportAdmin(_ReportAdmin):
+    list_display = ["story__title", "kind", "submitter"]
+    list_filter = ["kind"]
+    list_select_related = ["story", "submitter"]
+    ordering = ["story_id", "kind"]
+    target_model = Story
+    target_field = "story"
+
+
+@admin.register(ReportedStory)
+class ReportedStoryAdmin(admin.ModelAdmin):
+    list_display = ["title", "author", "report_count", "report_kind"]
+    list_filter = [_StoryReportKindFilter]
+    list_select_related = ["author"]
+    # most reported stories first, then the most severe, served by
+    # `story__report_queue` rather than grouping the reports
+    ordering = ["-report_count", "-report_kind", "uuid"]
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ReportedStory]:
+        return super().get_queryset(request).filter(report_count__gt=0)
 
 
 @admin.register(ChapterReport)
-class ChapterReportAdmin(admin.ModelAdmin):
-    list_display = ["chapter__name", "kind"]
+class ChapterReportAdmin(_ReportAdmin):
+    list_display = ["chapter__name", "kind", "submitter"]
+    list_filter = ["kind"]
+    list_select_related = ["chapter", "submitter"]
+    ordering = ["chapter_id", "kind"]
+    target_model = Chapter
+    target_field = "chapter"
+
+
+@admin.register(ReportedChapter)
+class ReportedChapterAdmin(admin.ModelAdmin):
+    list_display = ["name", "story__title", "report_count", "report_kind"]
+    list_filter = [_ChapterReportKindFilter]
+    list_select_related = ["story"]
+    # see `ReportedStoryAdmin`, served by `chapter__report_queue`
+    ordering = ["-report_count", "-report_kind", "uuid"]
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[ReportedChapter]:
+        return super().get_queryset(request).filter(report_count__gt=0)
@@ -1,51 +1,113 @@
+import datetime
+import json
 import logging
+import re
 import uuid
-from typing import Iterable
+from typing import Any, AsyncIterator, Iterable, Literal
 
 from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser
-from django.db import DatabaseError, transaction
-from django.db.models import F, Max, Q, QuerySet, Value
-from django.db.models.functions import Coalesce
-from django.http import Http404, HttpRequest
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.dispatch import receiver
+from django.http import Http404, HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from ninja import Query
+from ninja.errors import HttpError, ValidationError
 from ninja.pagination import RouterPaginated
-
-from app_admin.security import auth_optional, must_auth
-from art.models import Category, Chapter, Story, Tag
+from pydantic import TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+
+from app_admin.security import UserRateThrottle, auth_optional, must_auth
+from art.caching import (
+    STORY_LIST_KEY,
+    apurge_surrogate_keys,
+    aset_cache_headers,
+    category_key,
+    chapter_key,
+    story_key,
+    tag_key,
+)
+from art.models import (
+    CHAPTER_SORT_KEY_GAP,
+    Category,
+    Chapter,
+    ChapterReport,
+    Favorite,
+    FavoriteCountDelta,
+    Story,
+    StoryReport,
+    Tag,
+    count_words,
+)
+from art.read_counts import arecord_chapter_read
+from art.rendering import ainvalidate_rendered_markdown, arender_markdown
 from art.schemas import (
     CategoryOutDetailsSchema,
     CategoryOutSchema,
     ChapterInSchema,
+    ChapterMoveInSchema,
     ChapterOutDetailsSchema,
     ChapterOutSchema,
     ChapterPatchInSchema,
+    ChapterRangeInSchema,
     ListInSchema,
+    ReportInSchema,
+    StoryBundleOutSchema,
+    StoryChapterOutDetailsSchema,
     StoryInSchema,
     StoryOutDetailsSchema,
     StoryOutSchema,
     StoryPatchInSchema,
+    StoryPublishInSchema,
     TagOutDetailsSchema,
     TagOutSchema,
 )
 
 _logger = logging.getLogger(__name__)
 
+_CHAPTER_MARKDOWN_CHUNK_SIZE: int
+_CHAPTER_BULK_CREATE_MAX_SIZE: int
+_CHAPTER_BULK_CREATE_MAX_BYTES: int
+
+
+@receiver(setting_changed)
+def _load_global_settings(*args: Any, **kwargs: Any):
+    global _CHAPTER_MARKDOWN_CHUNK_SIZE
+    global _CHAPTER_BULK_CREATE_MAX_SIZE
+    global _CHAPTER_BULK_CREATE_MAX_BYTES
+
+    _CHAPTER_MARKDOWN_CHUNK_SIZE = settings.CHAPTER_MARKDOWN_CHUNK_SIZE
+    _CHAPTER_BULK_CREATE_MAX_SIZE = settings.CHAPTER_BULK_CREATE_MAX_SIZE
+    _CHAPTER_BULK_CREATE_MAX_BYTES = settings.CHAPTER_BULK_CREATE_MAX_BYTES
+
+
+_load_global_settings()
+
 # TODO maybe improve performance https://archive.li/rxzuU ?
 router = RouterPaginated()
 
+_report_throttle = UserRateThrottle("report", settings.REPORT_THROTTLE_RATE)
+
 
 @router.get("/story", response=list[StoryOutSchema], auth=auth_optional, tags=["story"])
-async def list_stories(request: HttpRequest, list_params: Query[ListInSchema]):
+async def list_stories(
+    request: HttpRequest, response: HttpResponse, list_params: Query[ListInSchema]
+):
     user = await request.auser()
     filter_args: list[Q]
     if user.is_authenticated:
-        filter_args = [(Q(author=user) | Q(published_at__isnull=False))]
+        filter_args = [(Q(author=user) | Q(published_at__lte=timezone.now()))]
     else:
-        filter_args = [Q(published_at__isnull=False)]
+        filter_args = [Q(published_at__lte=timezone.now())]
 
     filter_args += list_params.get_filter_args("story", request)
 
+    await aset_cache_headers(request, response, (STORY_LIST_KEY,))
+
     return (
         StoryOutSchema.annotate_for_schema(
             Story.annotate_search_vectors(
@@ -63,16 +125,19 @@ async def list_stories(request: HttpRequest, list_params: Query[ListInSchema]):
     auth=auth_optional,
     tags=["story"],
 )
-async def story_details(request: HttpRequest, story_id: uuid.UUID):
+async def story_details(
+    request: HttpRequest, response: HttpResponse, story_id: uuid.UUID
+):
     user = await request.auser()
     filter_args: list[Q]
     if user.is_authenticated:
-        filter_args = [(Q(author=user) | Q(published_at__isnull=False))]
+        filter_args = [(Q(author=user) | Q(published_at__lte=timezone.now()))]
     else:
-        filter_args = [Q(published_at__isnull=False)]
+        filter_args = [Q(published_at__lte=timezone.now())]
 
+    story: Story
     try:
-        return await (
+        story = await (
             StoryOutDetailsSchema.annotate_for_schema(
                 Story.annotate_from_chapters(Story.objects.all())
             )
@@ -83,6 +148,18 @@ async def story_details(request: HttpRequest, story_id: uuid.UUID):
     except Story.DoesNotExist:
         raise Http404("story not found")
 
+    await aset_cache_headers(request, response, _story_surrogate_keys(story))
+
+    return story
+
+
+def _story_surrogate_keys(story: Story) -> list[str]:
+    return [
+        story_key(story.uuid),
+        category_key(story.category_id),
+        *(tag_key(t.name) for t in story.tags.all()),
+    ]
+
 
 @router.post("/story", response=StoryOutSchema, auth=must_auth, tags=["story"])
 async def create_story(request: HttpRequest, input_story: StoryInSchema):
@@ -100,7 +177,11 @@ async def create_story(request: HttpRequest, input_story: StoryInSchema):
     if len(tag_uuids) != len(tags):
         raise Http404("tag not found")
 
-    return await _create_story_transaction(user, input_story, category, tags)
+    story = await _create_story_transaction(user, input_story, category, tags)
+
+    await apurge_surrogate_keys((STORY_LIST_KEY,))
+
+    return story
 
 
 @sync_to_async
@@ -168,6 +249,21 @@ async def patch_story(
 
     await _patch_story_transaction(story, update_fields, tags)
 
+    if input_story.published is not None:
+        await _aset_chapters_published_at(
+            user,
+            story.uuid,
+            None,
+            None,
+            timezone.now() if input_story.published else None,
+        )
+
+        story = await StoryOutSchema.annotate_for_schema(Story.objects.all()).aget(
+            uuid=story.uuid
+        )
+    else:
+        await apurge_surrogate_keys((STORY_LIST_KEY, story_key(story.uuid)))
+
     return story
 
 
@@ -192,6 +288,232 @@ async def delete_story(request: HttpRequest, story_id: uuid.UUID):
     if not count:
         raise Http404("story not found")
 
+    await apurge_surrogate_keys((STORY_LIST_KEY, story_key(story_id)))
+
+    return None
+
+
+@router.post(
+    "/story/{story_id}/publish",
+    response={204: None},
+    auth=must_auth,
+    tags=["story"],
+)
+async def publish_story(
+    request: HttpRequest, story_id: uuid.UUID, input_publish: StoryPublishInSchema
+):
+    user = await request.auser()
+    assert isinstance(user, AbstractBaseUser)
+
+    published_at = input_publish.published_at
+    if published_at is None:
+        published_at = timezone.now()
+
+    await _aset_chapters_published_at(
+        user,
+        story_id,
+        input_publish.start_index,
+        input_publish.end_index,
+        published_at,
+    )
+
+    return None
+
+
+@router.post(
+    "/story/{story_id}/unpublish",
+    response={204: None},
+    auth=must_auth,
+    tags=["story"],
+)
+async def unpublish_story(
+    request: HttpRequest, story_id: uuid.UUID, input_range: ChapterRangeInSchema
+):
+    user = await request.auser()
+    assert isinstance(user, AbstractBaseUser)
+
+    await _aset_chapters_published_at(
+        user, story_id, input_range.start_index, input_range.end_index, None
+    )
+
+    return None
+
+
+async def _aset_chapters_published_at(
+    user: AbstractBaseUser,
+    story_id: uuid.UUID,
+    start_index: int | None,
+    end_index: int | None,
+    published_at: datetime.datetime | None,
+) -> None:
+    await _set_chapters_published_at_transaction(
+        user, story_id, start_index, end_index, published_at
+    )
+
+    await apurge_surrogate_keys((STORY_LIST_KEY, story_key(story_id)))
+
+
+@sync_to_async
+def _set_chapters_published_at_transaction(
+    user: AbstractBaseUser,
+    story_id: uuid.UUID,
+    start_index: int | None,
+    end_index: int | None,
+    published_at: datetime.datetime | None,
+) -> None:
+    now = timezone.now()
+    with transaction.atomic():
+        # serialized with the other aggregate updates on the story row
+        if (
+            not Story.objects.select_for_update()
+            .filter(author=user, uuid=story_id)
+            .exists()
+        ):
+            raise Http404("story not found")
+
+        chapters = Chapter.objects.filter(story_id=story_id)
+        if start_index is not None or end_index is not None:
+            chapters = Chapter.objects.filter(
+                uuid__in=chapters.order_by("sort_key")[start_index:end_index].values(
+                    "uuid"
+                )
+            )
+
+        if published_at is None:
+            Story.uncount_chapters(story_id, chapters)
+        else:
+            # chapters that are already live keep their original publication time
+            chapters = chapters.exclude(published_at__lte=now)
+
+        chapters.update(published_at=published_at)
+        Story.count_live_chapters(Story.objects.filter(uuid=story_id), now)
+
+
+@router.get(
+    "/favorite", response=list[StoryOutSchema], auth=must_auth, tags=["favorite"]
+)
+async def list_favorites(request: HttpRequest, list_params: Query[ListInSchema]):
+    user = await request.auser()
+    filter_args: list[Q] = [
+        Q(favorites_of=user),
+        (Q(author=user) | Q(published_at__lte=timezone.now())),
+    ]
+
+    filter_args += list_params.get_filter_args("story", request)
+
+    return (
+        StoryOutSchema.annotate_for_schema(
+            Story.annotate_search_vectors(
+                Story.annotate_from_chapters(Story.objects.all())
+            )
+        )
+        .filter(*filter_args)
+        .order_by(*list_params.get_order_by_args("story"))
+    )
+
+
+@router.post(
+    "/story/{story_id}/favorite",
+    response={204: None},
+    auth=must_auth,
+    tags=["favorite"],
+)
+async def favorite_story(request: HttpRequest, story_id: uuid.UUID):
+    user = await request.auser()
+    assert isinstance(user, AbstractBaseUser)
+
+    if not await (
+        Story.annotate_from_chapters(Story.objects.all())
+        .filter(
+            Q(author=user) | Q(published_at__lte=timezone.now()),
+            uuid=story_id,
+        )
+        .aexists()
+    ):
+        raise Http404("story not found")
+
+    await _set_favorite_transaction(user, story_id, True)
+
+    return None
+
+
+@router.delete(
+    "/story/{story_id}/favorite",
+    response={204: None},
+    auth=must_auth,
+    tags=["favorite"],
+)
+async def unfavorite_story(request: HttpRequest, story_id: uuid.UUID):
+    user = await request.auser()
+    assert isinstance(user, AbstractBaseUser)
+
+    await _set_favorite_transaction(user, story_id, False)
+
+    return None
+
+
+@sync_to_async
+def _set_favorite_transaction(
+    user: AbstractBaseUser, story_id: uuid.UUID, is_favorite: bool
+) -> None:
+    with transaction.atomic():
+        changed: bool
+        if is_favorite:
+            _, changed = Favorite.objects.get_or_create(
+                story_id=story_id, user_id=user.pk
+            )
+        else:
+            deleted_count, _ = Favorite.objects.filter(
+                story_id=story_id, user_id=user.pk
+            ).delete()
+            changed = deleted_count > 0
+
+        # `Story.favorite_count` catches up on the next `rollupfavorites`
+        if changed:
+            FavoriteCountDelta.objects.create(
+                story_id=story_id, delta=(1 if is_favorite else -1)
+            )
+
+
+@router.post(
+    "/story/{story_id}/report",
+    response={204: None},
+    auth=must_auth,
+    throttle=_report_throttle,
+    tags=["report"],
+)
+async def report_story(
+    request: HttpRequest, story_id: uuid.UUID, input_report: ReportInSchema
+):
+    user = await request.auser()
+    assert isinstance(user, AbstractBaseUser)
+
+    if not await (
+        Story.annotate_from_chapters(Story.objects.all())
+        .filter(
+            Q(author=user) | Q(published_at__lte=timezone.now()),
+            uuid=story_id,
+        )
+        .aexists()
+    ):
+        raise Http404("story not found")
+
+    # repeated reports by the same submitter replace the previous one
+    await StoryReport.objects.abulk_create(
+        [
+            StoryReport(
+                story_id=story_id,
+                submitter_id=user.pk,
+                kind=input_report.kind,
+                details=input_report.details,
+            )
+        ],
+        update_conflicts=True,
+        unique_fields=("story", "submitter"),
+        update_fields=("kind", "details"),
+    )
+    await sync_to_async(Story.update_report_counts)(Story.objects.filter(uuid=story_id))
+
     return None
 
 
@@ -201,13 +523,15 @@ async def delete_story(request: HttpRequest, story_id: uuid.UUID):
     auth=auth_optional,
     tags=["chapter"],
 )
-async def list_chapters(request: HttpRequest, story_id: uuid.UUID):
+async def list_chapters(
+    request: HttpRequest, response: HttpResponse, story_id: uuid.UUID
+):
     user = await request.auser()
     filter_args: list[Q]
     if user.is_authenticated:
-        filter_args = [(Q(author=user) | Q(published_at__isnull=False))]
+        filter_args = [(Q(author=user) | Q(published_at__lte=timezone.now()))]
     else:
-        filter_args = [Q(published_at__isnull=False)]
+        filter_args = [Q(published_at__lte=timezone.now())]
 
     story: Story
     try:
@@ -223,31 +547,191 @@ async def list_chapters(request: HttpRequest, story_id: uuid.UUID):
     if user.is_authenticated and story.author_id == user.pk:
         chapter_qs = story.chapters.all()
     else:
-        chapter_qs = story.chapters.filter(published_at__isnull=False)
+        chapter_qs = story.chapters.filter(published_at__lte=timezone.now())
+
+    await aset_cache_headers(request, response, (story_key(story.uuid),))
+
+    return Chapter.annotate_index(chapter_qs).order_by("sort_key")
+
+
+_chapters_in_adapter = TypeAdapter(list[ChapterInSchema])
+
+
+# the body is parsed here rather than by ninja, so that the limits are checked
+# before any of it is
+@router.post(
+    "/story/{story_id}/chapter/bulk",
+    response={200: list[ChapterOutSchema]},
+    auth=must_auth,
+    tags=["chapter"],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/ChapterInSchema"},
+                    }
+                }
+            },
+            "required": True,
+        }
+    },
+)
+async def bulk_create_chapters(request: HttpRequest, story_id: uuid.UUID):
+    try:
+        content_length = int(request.headers.get("Content-Length") or 0)
+    except ValueError:
+        raise HttpError(400, "Content-Length malformed")
+    if (
+        content_length > _CHAPTER_BULK_CREATE_MAX_BYTES
+        or len(request.body) > _CHAPTER_BULK_CREATE_MAX_BYTES
+    ):
+        raise HttpError(
+            413, f"at most {_CHAPTER_BULK_CREATE_MAX_BYTES} bytes per request"
+        )
+
+    try:
+        input_json = json.loads(request.body)
+    except ValueError:
+        raise HttpError(400, "Cannot parse request body")
+
+    if isinstance(input_json, list) and len(input_json) > _CHAPTER_BULK_CREATE_MAX_SIZE:
+        raise HttpError(
+            413, f"at most {_CHAPTER_BULK_CREATE_MAX_SIZE} chapters per request"
+        )
+
+    try:
+        input_chapters = _chapters_in_adapter.validate_python(input_json)
+    except PydanticValidationError as e:
+        raise ValidationError(_validation_errors(e, ("body", "input_chapters")))
+
+    user = await request.auser()
+    assert isinstance(user, AbstractBaseUser)
+    chapters = await _bulk_create_chapters_transaction(user, story_id, input_chapters)
+
+    await apurge_surrogate_keys((STORY_LIST_KEY, story_key(story_id)))
+
+    return chapters
+
+
+def _validation_errors(
+    e: PydanticValidationError, loc: tuple[str, ...]
+) -> list[dict[str, Any]]:
+    # in the format of ninja's own
+    errors = []
+    for error in e.errors(include_url=False):
+        error = dict(error)
+        error["loc"] = (*loc, *error["loc"])
+        del error["input"]
+        if isinstance(ctx_error := error.get("ctx", {}).get("error"), Exception):
+            error["ctx"] = {**error["ctx"], "error": str(ctx_error)}
+        errors.append(error)
+
+    return errors
+
+
+@sync_to_async
+def _bulk_create_chapters_transaction(
+    user: AbstractBaseUser, story_id: uuid.UUID, input_chapters: list[ChapterInSchema]
+) -> list[Chapter]:
+    with transaction.atomic():
+        appended = Story.append_chapters(
+            Story.objects.filter(author=user, uuid=story_id), len(input_chapters)
+        )
+        if appended is None:
+            raise Http404("story not found")
+
+        first_sort_key, first_index = appended
+
+        chapters = Chapter.objects.bulk_create(
+            Chapter(
+                story_id=story_id,
+                name=input_chapter.name,
+                synopsis=input_chapter.synopsis,
+                markdown=input_chapter.markdown,
+                word_count=count_words(input_chapter.markdown),
+                sort_key=(first_sort_key + (i * CHAPTER_SORT_KEY_GAP)),
+            )
+            for i, input_chapter in enumerate(input_chapters)
+        )
+        # new chapters are unpublished, so the story's aggregates don't change
+        for i, chapter in enumerate(chapters):
+            setattr(chapter, "index", first_index + i)
 
-    return chapter_qs
+        return chapters
 
 
 @router.get(
     "/story/{story_id}/chapter/{chapter_num}",
-    response=ChapterOutDetailsSchema,
+    response=StoryChapterOutDetailsSchema,
     auth=auth_optional,
     tags=["chapter"],
 )
 async def story_chapter_details(
-    request: HttpRequest, story_id: uuid.UUID, chapter_num: int
+    request: HttpRequest,
+    response: HttpResponse,
+    story_id: uuid.UUID,
+    chapter_num: int,
+    format: Literal["markdown", "html"] = "markdown",
+):
+    user = await request.auser()
+    accessible_chapters: QuerySet[Chapter]
+    if user.is_authenticated:
+        accessible_chapters = Chapter.objects.filter(
+            Q(story__author=user) | Q(published_at__lte=timezone.now()),
+            story_id=story_id,
+        )
+    else:
+        accessible_chapters = Chapter.objects.filter(
+            story_id=story_id, published_at__lte=timezone.now()
+        )
+
+    chapter: Chapter
+    try:
+        chapter = await Chapter.annotate_navigation(accessible_chapters).aget(
+            chapter_number=(chapter_num + 1)
+        )
+    except Chapter.DoesNotExist:
+        raise Http404("chapter not found")
+
+    if format == "html":
+        setattr(chapter, "html", await arender_markdown(chapter.markdown))
+
+    await aset_cache_headers(
+        request, response, (story_key(story_id), chapter_key(chapter.uuid))
+    )
+
+    return chapter
+
+
+@router.get(
+    "/story/{story_id}/bundle",
+    response=StoryBundleOutSchema,
+    auth=auth_optional,
+    tags=["story"],
+)
+async def story_bundle(
+    request: HttpRequest,
+    response: HttpResponse,
+    story_id: uuid.UUID,
+    chapter_num: int | None = Query(None, alias="chapterNum"),
+    format: Literal["markdown", "html"] = "markdown",
 ):
     user = await request.auser()
     filter_args: list[Q]
     if user.is_authenticated:
-        filter_args = [(Q(author=user) | Q(published_at__isnull=False))]
+        filter_args = [(Q(author=user) | Q(published_at__lte=timezone.now()))]
     else:
-        filter_args = [Q(published_at__isnull=False)]
+        filter_args = [Q(published_at__lte=timezone.now())]
 
     story: Story
     try:
         story = await (
-            Story.annotate_from_chapters(Story.objects.all())
+            StoryOutDetailsSchema.annotate_for_schema(
+                Story.annotate_from_chapters(Story.objects.all())
+            )
+            .prefetch_related("tags")
             .filter(*filter_args)
             .aget(uuid=story_id)
         )
@@ -258,19 +742,56 @@ async def story_chapter_details(
     if user.is_authenticated and story.author_id == user.pk:
         accessible_chapters = story.chapters.all()
     else:
-        accessible_chapters = story.chapters.filter(published_at__isnull=False)
+        accessible_chapters = story.chapters.filter(published_at__lte=timezone.now())
+
+    chapters = [
+        c
+        async for c in Chapter.annotate_index(
+            accessible_chapters.only("uuid", "sort_key", "name", "synopsis")
+        ).order_by("sort_key")
+    ]
+
+    # the first chapter by default, which a story may not have yet, but a
+    # requested one must exist like with `story_chapter_details`
+    chapter: Chapter | None = None
+    if chapters or chapter_num is not None:
+        if chapter_num is None:
+            chapter_num = 0
+        if not (0 <= chapter_num < len(chapters)):
+            raise Http404("chapter not found")
 
-    return await _story_chapter_details_access(accessible_chapters, chapter_num)
+        try:
+            chapter = await accessible_chapters.aget(uuid=chapters[chapter_num].uuid)
+        except Chapter.DoesNotExist:  # pragma: no cover
+            raise Http404("chapter not found")
+
+        setattr(
+            chapter,
+            "previous_chapter_uuid",
+            chapters[chapter_num - 1].uuid if chapter_num > 0 else None,
+        )
+        setattr(
+            chapter,
+            "next_chapter_uuid",
+            chapters[chapter_num + 1].uuid if chapter_num + 1 < len(chapters) else None,
+        )
+        setattr(chapter, "index", chapter_num)
+        setattr(chapter, "chapter_count", len(chapters))
 
+        if format == "html":
+            setattr(chapter, "html", await arender_markdown(chapter.markdown))
 
-@sync_to_async
-def _story_chapter_details_access(
-    accessible_chapters: QuerySet[Chapter], chapter_num: int
-):
-    try:
-        return accessible_chapters.order_by("index")[chapter_num]
-    except IndexError:
-        raise Http404("chapter not found")
+    surrogate_keys = _story_surrogate_keys(story)
+    if chapter is not None:
+        surrogate_keys.append(chapter_key(chapter.uuid))
+
+    await aset_cache_headers(request, response, surrogate_keys)
+
+    return {
+        "story": story,
+        "chapters": chapters,
+        "chapter": chapter,
+    }
 
 
 @router.get(
@@ -279,22 +800,159 @@ def _story_chapter_details_access(
     auth=auth_optional,
     tags=["chapter"],
 )
-async def chapter_details(request: HttpRequest, chapter_id: uuid.UUID):
+async def chapter_details(
+    request: HttpRequest,
+    response: HttpResponse,
+    chapter_id: uuid.UUID,
+    format: Literal["markdown", "html"] = "markdown",
+):
+    user = await request.auser()
+
+    visible_q: Q
+    if user.is_authenticated:
+        visible_q = Q(story__author=user) | Q(published_at__lte=timezone.now())
+    else:
+        visible_q = Q(published_at__lte=timezone.now())
+
+    chapter: Chapter
+    try:
+        chapter = await Chapter.annotate_index_single(
+            Chapter.objects.filter(visible_q), visible_q
+        ).aget(uuid=chapter_id)
+    except Chapter.DoesNotExist:
+        raise Http404("chapter not found")
+
+    if format == "html":
+        setattr(chapter, "html", await arender_markdown(chapter.markdown))
+
+    await aset_cache_headers(
+        request, response, (story_key(chapter.story_id), chapter_key(chapter.uuid))
+    )
+
+    return chapter
+
+
+# reads are counted here rather than by the chapter endpoints, whose anonymous
+# responses are mostly served from the shared cache without reaching us
+@router.post(
+    "/chapter/{chapter_id}/read", response={204: None}, auth=None, tags=["chapter"]
+)
+async def record_chapter_read(
+    request: HttpRequest, response: HttpResponse, chapter_id: uuid.UUID
+):
+    story_id: uuid.UUID
+    try:
+        story_id = await Chapter.objects.values_list("story_id", flat=True).aget(
+            uuid=chapter_id, published_at__lte=timezone.now()
+        )
+    except Chapter.DoesNotExist:
+        raise Http404("chapter not found")
+
+    await arecord_chapter_read(story_id, chapter_id)
+
+    patch_cache_control(response, no_store=True)
+
+    return None
+
+
+@router.get("/chapter/{chapter_id}/markdown", auth=auth_optional, tags=["chapter"])
+async def chapter_markdown(request: HttpRequest, chapter_id: uuid.UUID):
     user = await request.auser()
 
     accessible_chapters: QuerySet[Chapter]
     if user.is_authenticated:
         accessible_chapters = Chapter.objects.filter(
-            Q(story__author=user) | Q(published_at__isnull=False)
+            Q(story__author=user) | Q(published_at__lte=timezone.now())
         )
     else:
-        accessible_chapters = Chapter.objects.filter(published_at__isnull=False)
+        accessible_chapters = Chapter.objects.filter(published_at__lte=timezone.now())
 
+    # read and encoded once, so every chunk comes from the same version, which
+    # the `Content-Length` was computed from
+    markdown: str
+    story_id: uuid.UUID
     try:
-        return await accessible_chapters.aget(uuid=chapter_id)
+        markdown, story_id = await accessible_chapters.values_list(
+            "markdown", "story_id"
+        ).aget(uuid=chapter_id)
     except Chapter.DoesNotExist:
         raise Http404("chapter not found")
 
+    markdown_bytes = markdown.encode()
+    length = len(markdown_bytes)
+
+    byte_range: tuple[int, int] | None = None
+    if (range_header := request.headers.get("Range")) is not None:
+        try:
+            byte_range = _parse_range_header(range_header, length)
+        except ValueError:
+            error_response = HttpResponse(status=416)
+            error_response["Content-Range"] = f"bytes */{length}"
+            return error_response
+
+    response: StreamingHttpResponse
+    if byte_range is None:
+        response = StreamingHttpResponse(
+            _markdown_chunks(markdown_bytes, 0, length),
+            content_type="text/markdown; charset=utf-8",
+        )
+        response["Content-Length"] = str(length)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _markdown_chunks(markdown_bytes, start, end + 1),
+            status=206,
+            content_type="text/markdown; charset=utf-8",
+        )
+        response["Content-Length"] = str(end + 1 - start)
+        response["Content-Range"] = f"bytes {start}-{end}/{length}"
+
+    response["Accept-Ranges"] = "bytes"
+
+    await aset_cache_headers(
+        request, response, (story_key(story_id), chapter_key(chapter_id))
+    )
+
+    return response
+
+
+_range_header_regex = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range_header(range_header: str, length: int) -> tuple[int, int] | None:
+    match = _range_header_regex.search(range_header.strip())
+    if not match:
+        # multiple or non-byte ranges may be ignored in favour of the full body
+        return None
+
+    start_str, end_str = match.group(1), match.group(2)
+    if start_str:
+        start = int(start_str)
+        if end_str and int(end_str) < start:
+            # invalid rather than unsatisfiable, so ignored as well
+            return None
+        if start >= length:
+            raise ValueError("range not satisfiable")
+        end = min(int(end_str), length - 1) if end_str else length - 1
+    elif end_str:
+        suffix_length = int(end_str)
+        if suffix_length < 1 or length < 1:
+            raise ValueError("range not satisfiable")
+        start = max(length - suffix_length, 0)
+        end = length - 1
+    else:
+        return None
+
+    return start, end
+
+
+async def _markdown_chunks(
+    markdown_bytes: bytes, start: int, stop: int
+) -> AsyncIterator[bytes]:
+    view = memoryview(markdown_bytes)
+    for offset in range(start, stop, _CHAPTER_MARKDOWN_CHUNK_SIZE):
+        yield bytes(view[offset : min(offset + _CHAPTER_MARKDOWN_CHUNK_SIZE, stop)])
+
 
 @router.post(
     "/story/{story_id}/chapter",
@@ -306,26 +964,13 @@ async def create_chapter(
     request: HttpRequest, story_id: uuid.UUID, input_chapter: ChapterInSchema
 ):
     user = await request.auser()
-
-    try:
-        story = await Story.objects.aget(author=user, uuid=story_id)
-    except Story.DoesNotExist:
-        raise Http404("story not found")
-
-    index = (
-        await Chapter.objects.filter(story=story).aaggregate(
-            max_index=Coalesce(Max("index"), Value(-1))
-        )
-    )["max_index"]
-
-    chapter = await Chapter.objects.acreate(
-        story=story,
-        name=input_chapter.name,
-        synopsis=input_chapter.synopsis,
-        markdown=input_chapter.markdown,
-        index=(index + 1),
+    assert isinstance(user, AbstractBaseUser)
+    (chapter,) = await _bulk_create_chapters_transaction(
+        user, story_id, [input_chapter]
     )
 
+    await apurge_surrogate_keys((STORY_LIST_KEY, story_key(story_id)))
+
     return chapter
 
 
@@ -339,7 +984,9 @@ async def patch_chapter(
     assert isinstance(user, AbstractBaseUser)
 
     try:
-        chapter = await Chapter.objects.aget(story__author=user, uuid=chapter_id)
+        chapter = await Chapter.annotate_index_single(
+            Chapter.objects.filter(story__author=user)
+        ).aget(uuid=chapter_id)
     except Chapter.DoesNotExist:
         raise Http404("chapter not found")
 
@@ -353,42 +1000,217 @@ async def patch_chapter(
         chapter.synopsis = input_chapter.synopsis
         update_fields.add("synopsis")
 
+    old_markdown: str | None = None
     if input_chapter.markdown is not None:
+        if input_chapter.markdown != chapter.markdown:
+            old_markdown = chapter.markdown
+
         chapter.markdown = input_chapter.markdown
         update_fields.add("markdown")
 
-    await chapter.asave(update_fields=update_fields)
+    if old_markdown is not None:
+        chapter.word_count = count_words(chapter.markdown)
+        update_fields.add("word_count")
+
+    await _save_chapter_transaction(chapter, update_fields)
+
+    if old_markdown is not None:
+        await ainvalidate_rendered_markdown(old_markdown)
+
+    surrogate_keys = [story_key(chapter.story_id), chapter_key(chapter.uuid)]
+    # the story's word count, which lists can be sorted and searched by, changed
+    if old_markdown is not None:
+        surrogate_keys.append(STORY_LIST_KEY)
+
+    await apurge_surrogate_keys(surrogate_keys)
 
     return chapter
 
 
+@sync_to_async
+def _save_chapter_transaction(chapter: Chapter, update_fields: set[str]) -> None:
+    with transaction.atomic():
+        if "word_count" in update_fields:
+            # serialized with the other aggregate updates on the story row
+            Story.objects.select_for_update().only("uuid").get(uuid=chapter.story_id)
+            try:
+                old_word_count, is_counted = (
+                    Chapter.objects.select_for_update()
+                    .values_list("word_count", "is_counted")
+                    .get(uuid=chapter.uuid)
+                )
+            except Chapter.DoesNotExist:
+                raise Http404("chapter not found")
+
+            if is_counted and chapter.word_count != old_word_count:
+                Story.objects.filter(uuid=chapter.story_id).update(
+                    word_count=(F("word_count") + (chapter.word_count - old_word_count))
+                )
+
+        chapter.save(update_fields=update_fields)
+
+
+@router.post(
+    "/chapter/{chapter_id}/move",
+    response=ChapterOutSchema,
+    auth=must_auth,
+    tags=["chapter"],
+)
+async def move_chapter(
+    request: HttpRequest, chapter_id: uuid.UUID, input_move: ChapterMoveInSchema
+):
+    user = await request.auser()
+    assert isinstance(user, AbstractBaseUser)
+    chapter = await _move_chapter_transaction(user, chapter_id, input_move.index)
+
+    await apurge_surrogate_keys(
+        (story_key(chapter.story_id), chapter_key(chapter.uuid))
+    )
+
+    return chapter
+
+
+@sync_to_async
+def _move_chapter_transaction(
+    user: AbstractBaseUser, chapter_id: uuid.UUID, index: int
+) -> Chapter:
+    with transaction.atomic():
+        story_id: uuid.UUID | None = (
+            Chapter.objects.filter(story__author=user, uuid=chapter_id)
+            .values_list("story_id", flat=True)
+            .first()
+        )
+        if story_id is None:
+            raise Http404("chapter not found")
+
+        # moves (and rebalances) within a story are serialized on the story row
+        Story.objects.select_for_update().only("uuid").get(uuid=story_id)
+
+        siblings = (
+            Chapter.objects.filter(story_id=story_id)
+            .exclude(uuid=chapter_id)
+            .order_by("sort_key")
+        )
+
+        previous_sort_key, next_sort_key = _neighbour_sort_keys(siblings, index)
+        sort_key: int
+        if previous_sort_key is not None and next_sort_key is not None:
+            if next_sort_key - previous_sort_key < 2:
+                Chapter.rebalance_sort_keys(story_id)
+                previous_sort_key, next_sort_key = _neighbour_sort_keys(siblings, index)
+                assert previous_sort_key is not None and next_sort_key is not None
+
+            sort_key = (previous_sort_key + next_sort_key) // 2
+        elif previous_sort_key is not None:
+            claimed_sort_key = Story.claim_chapter_sort_keys(
+                Story.objects.filter(uuid=story_id)
+            )
+            assert claimed_sort_key is not None
+            sort_key = claimed_sort_key
+        elif next_sort_key is not None:
+            sort_key = next_sort_key - CHAPTER_SORT_KEY_GAP
+        else:
+            sort_key = 0
+
+        Chapter.objects.filter(uuid=chapter_id).update(sort_key=sort_key)
+
+        return Chapter.annotate_index_single(Chapter.objects.all()).get(uuid=chapter_id)
+
+
+def _neighbour_sort_keys(
+    siblings: QuerySet[Chapter], index: int
+) -> tuple[int | None, int | None]:
+    sort_keys = siblings.values_list("sort_key", flat=True)
+    if index == 0:
+        return None, sort_keys.first()
+
+    neighbours = list(sort_keys[index - 1 : index + 1])
+    if not neighbours:
+        return sort_keys.last(), None
+
+    return neighbours[0], (neighbours[1] if len(neighbours) > 1 else None)
+
+
+@router.post(
+    "/chapter/{chapter_id}/report",
+    response={204: None},
+    auth=must_auth,
+    throttle=_report_throttle,
+    tags=["report"],
+)
+async def report_chapter(
+    request: HttpRequest, chapter_id: uuid.UUID, input_report: ReportInSchema
+):
+    user = await request.auser()
+    assert isinstance(user, AbstractBaseUser)
+
+    if not await Chapter.objects.filter(
+        Q(story__author=user) | Q(published_at__lte=timezone.now()),
+        uuid=chapter_id,
+    ).aexists():
+        raise Http404("chapter not found")
+
+    # repeated reports by the same submitter replace the previous one
+    await ChapterReport.objects.abulk_create(
+        [
+            ChapterReport(
+                chapter_id=chapter_id,
+                submitter_id=user.pk,
+                kind=input_report.kind,
+                details=input_report.details,
+            )
+        ],
+        update_conflicts=True,
+        unique_fields=("chapter", "submitter"),
+        update_fields=("kind", "details"),
+    )
+    await sync_to_async(Chapter.update_report_counts)(
+        Chapter.objects.filter(uuid=chapter_id)
+    )
+
+    return None
+
+
 @router.delete(
     "/chapter/{chapter_id}", response={204: None}, auth=must_auth, tags=["chapter"]
 )
 async def delete_chapter(request: HttpRequest, chapter_id: uuid.UUID):
     user = await request.auser()
-    assert isinstance(user, AbstractBaseUser)
-    await _delete_chapter_transaction(user, chapter_id)
+
+    story_id = await _delete_chapter_transaction(user, chapter_id)
+
+    await apurge_surrogate_keys(
+        (STORY_LIST_KEY, story_key(story_id), chapter_key(chapter_id))
+    )
 
     return None
 
 
 @sync_to_async
-def _delete_chapter_transaction(user: AbstractBaseUser, chapter_id: uuid.UUID):
-    try:
-        with transaction.atomic():
-            chapter = Chapter.objects.select_for_update(nowait=True).get(
-                story__author=user, uuid=chapter_id
-            )
-            Chapter.objects.filter(
-                story_id=chapter.story_id, index__gt=chapter.index
-            ).update(index=(F("index") - 1))
-            chapter.delete()
-    except Chapter.DoesNotExist:
-        raise Http404("chapter not found")
-    except DatabaseError:
-        _logger.warning("current access during chapter deletion")
-        raise Http404("chapter not found")
+def _delete_chapter_transaction(
+    user: AbstractBaseUser, chapter_id: uuid.UUID
+) -> uuid.UUID:
+    with transaction.atomic():
+        story_id: uuid.UUID | None = (
+            Chapter.objects.filter(story__author=user, uuid=chapter_id)
+            .values_list("story_id", flat=True)
+            .first()
+        )
+        if story_id is None:
+            raise Http404("chapter not found")
+
+        # serialized with the other aggregate updates on the story row
+        Story.objects.select_for_update().only("uuid").get(uuid=story_id)
+
+        # chapters are ordered by sparse `sort_key`s, so no other rows need to shift
+        chapters = Chapter.objects.filter(uuid=chapter_id)
+        Story.uncount_chapters(story_id, chapters)
+        chapters.delete()
+        Story.objects.filter(uuid=story_id).update(
+            all_chapter_count=(F("all_chapter_count") - 1)
+        )
+
+        return story_id
 
 
 @router.get(
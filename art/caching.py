@@ -0,0 +1,135 @@
+import json
+import logging
+import threading
+import urllib.request
+import uuid
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import Signal, receiver
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+_logger = logging.getLogger(__name__)
+
+_PUBLIC_CACHE_MAX_AGE: int
+_PUBLIC_CACHE_STALE_WHILE_REVALIDATE: int
+_SURROGATE_KEY_PURGE_URL: str | None
+
+
+@receiver(setting_changed)
+def _load_global_settings(*args: Any, **kwargs: Any):
+    global _PUBLIC_CACHE_MAX_AGE
+    global _PUBLIC_CACHE_STALE_WHILE_REVALIDATE
+    global _SURROGATE_KEY_PURGE_URL
+
+    _PUBLIC_CACHE_MAX_AGE = settings.PUBLIC_CACHE_MAX_AGE
+    _PUBLIC_CACHE_STALE_WHILE_REVALIDATE = settings.PUBLIC_CACHE_STALE_WHILE_REVALIDATE
+    _SURROGATE_KEY_PURGE_URL = settings.SURROGATE_KEY_PURGE_URL
+
+
+_load_global_settings()
+
+# sent with `keys: frozenset[str]` whenever cached public responses go stale
+surrogate_keys_purged = Signal()
+
+STORY_LIST_KEY = "story-list"
+
+
+def story_key(story_id: uuid.UUID) -> str:
+    return f"story:{story_id}"
+
+
+def chapter_key(chapter_id: uuid.UUID) -> str:
+    return f"chapter:{chapter_id}"
+
+
+def category_key(category_name: str) -> str:
+    return f"category:{category_name}"
+
+
+def tag_key(tag_name: str) -> str:
+    return f"tag:{tag_name}"
+
+
+async def aset_cache_headers(
+    request: HttpRequest, response: HttpResponseBase, surrogate_keys: Iterable[str]
+) -> None:
+    patch_vary_headers(response, ("Authorization", "Cookie"))
+
+    user = await request.auser()
+    if user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=_PUBLIC_CACHE_MAX_AGE,
+            stale_while_revalidate=_PUBLIC_CACHE_STALE_WHILE_REVALIDATE,
+        )
+        response["Surrogate-Key"] = " ".join(sorted(frozenset(surrogate_keys)))
+
+
+async def apurge_surrogate_keys(surrogate_keys: Iterable[str]) -> None:
+    await surrogate_keys_purged.asend(sender=None, keys=frozenset(surrogate_keys))
+
+
+# purges are posted from a background thread, so that writes never wait on the
+# CDN, and keys piling up meanwhile go out together
+_lock = threading.Lock()
+_pending_keys: set[str] = set()
+_purge_requested = threading.Event()
+_purger: threading.Thread | None = None
+
+
+@receiver(surrogate_keys_purged)
+async def _post_purge(sender: Any, keys: frozenset[str], **kwargs: Any) -> None:
+    global _purger
+
+    if _SURROGATE_KEY_PURGE_URL is None:
+        return
+
+    with _lock:
+        _pending_keys.update(keys)
+        _purge_requested.set()
+
+        if _purger is None or not _purger.is_alive():
+            _purger = threading.Thread(
+                target=_run_purger, name="surrogate-key-purger", daemon=True
+            )
+            _purger.start()
+
+
+def _run_purger() -> None:
+    global _pending_keys
+
+    while True:
+        _purge_requested.wait()
+        _purge_requested.clear()
+
+        with _lock:
+            keys, _pending_keys = frozenset(_pending_keys), set()
+
+        url = _SURROGATE_KEY_PURGE_URL
+        if not keys or url is None:
+            continue
+
+        try:
+            _post_purge_request(url, keys)
+        except OSError:
+            _logger.exception("surrogate key purge failed")
+            # retried along with the next purge
+            with _lock:
+                _pending_keys.update(keys)
+
+
+def _post_purge_request(url: str, keys: frozenset[str]) -> None:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps({"keys": sorted(keys)}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=5.0):
+        pass
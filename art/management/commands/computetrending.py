@@ -0,0 +1,97 @@
+import datetime
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from art.caching import STORY_LIST_KEY, apurge_surrogate_keys
+from art.models import Chapter, Favorite, Story
+
+_FAVORITE_WEIGHT = 1.0
+_CHAPTER_PUBLISH_WEIGHT = 5.0
+
+
+class Command(BaseCommand):
+    help = "Recompute `Story.trending_score` from recent favorites and chapter releases, run periodically"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1024)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+
+        now = timezone.now()
+        window_start = now - settings.TRENDING_WINDOW
+
+        # favorites from before `created_at` existed have none, and never match
+        favorite_story_ids, favorite_ages = _load_events(
+            Favorite.objects.filter(created_at__gt=window_start).values_list(
+                "story_id", "created_at"
+            ),
+            now,
+        )
+        chapter_story_ids, chapter_ages = _load_events(
+            Chapter.objects.filter(
+                published_at__gt=window_start, published_at__lte=now
+            ).values_list("story_id", "published_at"),
+            now,
+        )
+
+        story_ids, story_indices = np.unique(
+            np.concatenate((favorite_story_ids, chapter_story_ids)),
+            return_inverse=True,
+        )
+        weights = np.concatenate(
+            (
+                np.full(len(favorite_ages), _FAVORITE_WEIGHT),
+                np.full(len(chapter_ages), _CHAPTER_PUBLISH_WEIGHT),
+            )
+        )
+        ages = np.concatenate((favorite_ages, chapter_ages))
+
+        half_life = settings.TRENDING_HALF_LIFE.total_seconds()
+        scores = np.bincount(
+            story_indices,
+            weights=(weights * np.exp2(-ages / half_life)),
+            minlength=len(story_ids),
+        )
+
+        with transaction.atomic():
+            Story.objects.exclude(trending_score=0.0).update(trending_score=0.0)
+            Story.objects.bulk_update(
+                (
+                    Story(uuid=story_id, trending_score=score)
+                    for story_id, score in zip(story_ids.tolist(), scores.tolist())
+                ),
+                ["trending_score"],
+                batch_size=batch_size,
+            )
+
+        async_to_sync(apurge_surrogate_keys)((STORY_LIST_KEY,))
+
+        self.stderr.write(
+            self.style.NOTICE(
+                f"scored {len(story_ids)} stories from {len(ages)} events"
+            )
+        )
+
+
+def _load_events(
+    events: QuerySet[Any], now: datetime.datetime
+) -> tuple[np.ndarray, np.ndarray]:
+    story_ids: list[UUID] = []
+    timestamps: list[float] = []
+    for story_id, at in events.iterator(chunk_size=4096):
+        story_ids.append(story_id)
+        timestamps.append(at.timestamp())
+
+    return (
+        np.array(story_ids, dtype=object),
+        now.timestamp() - np.array(timestamps, dtype=np.float64),
+    )
@@ -0,0 +1,67 @@
+from typing import Any
+from uuid import UUID
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from art.caching import STORY_LIST_KEY, apurge_surrogate_keys, story_key
+from art.models import Chapter, Story, count_words
+
+
+class Command(BaseCommand):
+    help = "Recompute chapter word counts, the per-story aggregates and counters"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=256)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+
+        chapter_count = 0
+        story_ids: set[UUID] = set()
+        last_uuid: UUID | None = None
+        while True:
+            chapters_qs = Chapter.objects.order_by("uuid").only(
+                "uuid", "story_id", "markdown", "word_count"
+            )
+            if last_uuid is not None:
+                chapters_qs = chapters_qs.filter(uuid__gt=last_uuid)
+
+            chapters = list(chapters_qs[:batch_size])
+            if not chapters:
+                break
+
+            changed_chapters: list[Chapter] = []
+            for chapter in chapters:
+                word_count = count_words(chapter.markdown)
+                if word_count != chapter.word_count:
+                    chapter.word_count = word_count
+                    changed_chapters.append(chapter)
+
+            batch_story_ids = frozenset(c.story_id for c in chapters)
+            with transaction.atomic():
+                Chapter.objects.bulk_update(changed_chapters, ("word_count",))
+                Story.update_from_chapters(
+                    Story.objects.filter(uuid__in=batch_story_ids)
+                )
+
+            chapter_count += len(changed_chapters)
+            story_ids.update(batch_story_ids)
+            last_uuid = chapters[-1].uuid
+
+        # stories without chapters are never visited above
+        Story.update_from_chapters(
+            Story.objects.exclude(uuid__in=Chapter.objects.values("story_id"))
+        )
+
+        if story_ids:
+            async_to_sync(apurge_surrogate_keys)(
+                (STORY_LIST_KEY, *(story_key(story_id) for story_id in story_ids))
+            )
+
+        self.stderr.write(
+            self.style.NOTICE(
+                f"recomputed {chapter_count} chapters across {len(story_ids)} stories"
+            )
+        )
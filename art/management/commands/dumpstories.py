@@ -0,0 +1,136 @@
+import gzip
+import json
+import sys
+from typing import IO, Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Prefetch
+from django.http import HttpRequest
+
+from art.models import Chapter, Favorite, Story
+from art.searches import search_fns
+from query_utils import search as searchutils
+
+
+class Command(BaseCommand):
+    help = "Stream stories as NDJSON, in the format `loadstories --ndjson` consumes"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--search")
+        parser.add_argument("--output", "-o")
+        parser.add_argument(
+            "--compression", choices=("none", "gzip", "zstd"), default="none"
+        )
+        parser.add_argument("--chunk-size", type=int, default=256)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        filter_args = []
+        if (search := options["search"]) is not None:
+            try:
+                filter_args = searchutils.to_filter_args(
+                    "story", HttpRequest(), search, search_fns
+                )
+            except (ValueError, AttributeError) as e:
+                raise CommandError(f"search malformed: {e}") from e
+
+        story_qs = (
+            Story.annotate_search_vectors(
+                Story.annotate_from_chapters(Story.objects.all())
+            )
+            .filter(*filter_args)
+            .select_related("author", "category")
+            .prefetch_related(
+                "tags",
+                Prefetch("chapters", queryset=Chapter.objects.order_by("sort_key")),
+                Prefetch(
+                    "favorite_set",
+                    queryset=Favorite.objects.select_related("user").order_by("pk"),
+                ),
+            )
+            .order_by("uuid")
+        )
+
+        compression: str = options["compression"]
+        output_path: str | None = options["output"]
+
+        out: IO[bytes]
+        if output_path is not None:
+            out = _open_output(output_path, compression)
+        elif compression == "none":
+            out = sys.stdout.buffer
+        else:
+            out = _open_output(sys.stdout.buffer, compression)
+
+        try:
+            for story in story_qs.iterator(chunk_size=options["chunk_size"]):
+                out.write(
+                    json.dumps(_story_to_json(story), ensure_ascii=False).encode()
+                )
+                out.write(b"\n")
+        finally:
+            if out is sys.stdout.buffer:
+                out.flush()
+            else:
+                out.close()
+
+
+def _open_output(file: str | IO[bytes], compression: str) -> IO[bytes]:
+    if compression == "gzip":
+        if isinstance(file, str):
+            return gzip.open(file, "wb")
+        else:
+            return gzip.GzipFile(fileobj=file, mode="wb")
+    elif compression == "zstd":
+        try:
+            from compression import zstd  # type: ignore[import-not-found]
+        except ImportError:
+            try:
+                import zstandard as zstd  # type: ignore[import-not-found,no-redef]
+            except ImportError as e:
+                raise CommandError(
+                    "zstd compression requires Python 3.14+ or the `zstandard` package"
+                ) from e
+
+        return zstd.open(file, "wb")
+    else:
+        assert isinstance(file, str)
+        return open(file, "wb")
+
+
+def _story_to_json(story: Story) -> dict[str, Any]:
+    # aggregates over the chapters and favorites are recomputed by `loadstories`,
+    # and `trending_score` by the next `computetrending`
+    return {
+        "uuid": str(story.uuid),
+        "title": story.title,
+        "synopsis": story.synopsis,
+        "author": story.author.username,
+        "category": story.category_id,
+        "tags": [t.pretty_name for t in story.tags.all()],
+        "created_at": story.created_at.isoformat(),
+        "is_nsfw": story.is_nsfw,
+        "read_count": story.read_count,
+        "favorites": [
+            {
+                "user": f.user.username,
+                "created_at": (
+                    f.created_at.isoformat() if f.created_at is not None else None
+                ),
+            }
+            for f in story.favorite_set.all()
+        ],
+        "chapters": [
+            {
+                "uuid": str(c.uuid),
+                "name": c.name,
+                "synopsis": c.synopsis,
+                "markdown": c.markdown,
+                "created_at": c.created_at.isoformat(),
+                "published_at": (
+                    c.published_at.isoformat() if c.published_at is not None else None
+                ),
+                "read_count": c.read_count,
+            }
+            for c in story.chapters.all()
+        ],
+    }
@@ -1,18 +1,29 @@
+import datetime
 import json
 import sys
-from typing import Any
+import uuid
+from typing import Any, Iterable
 
 from django.core.management.base import BaseCommand, CommandError, CommandParser
 from django.utils import timezone
 
 from app_admin.models import User
-from art.models import Category, Chapter, Story, Tag
+from art.models import (
+    CHAPTER_SORT_KEY_GAP,
+    Category,
+    Chapter,
+    Favorite,
+    Story,
+    Tag,
+    count_words,
+)
 
 
 class Command(BaseCommand):
     def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument("default_author_username")
         parser.add_argument("default_category")
+        parser.add_argument("--ndjson", action="store_true")
 
     def handle(self, *args: Any, **options: Any) -> None:
         now = timezone.now()
@@ -39,10 +50,16 @@ class Command(BaseCommand):
             default_category.name: default_category,
         }
 
-        stories_json: list[dict[str, Any]] = json.load(sys.stdin)
+        stories_json: Iterable[dict[str, Any]]
+        if options["ndjson"]:
+            stories_json = (json.loads(line) for line in sys.stdin if line.strip())
+        else:
+            stories_json = json.load(sys.stdin)
 
         tag_pretty_names: set[str] = set()
 
+        favorite_usernames: set[str] = set()
+
         stories: list[Story] = []
         chapters: list[Chapter] = []
         for story_json in stories_json:
@@ -88,12 +105,25 @@ class Command(BaseCommand):
                 synopsis=synopsis,
                 author=author,
                 category=category,
+                is_nsfw=story_json.get("is_nsfw", False),
+                read_count=story_json.get("read_count", 0),
+                next_chapter_sort_key=(
+                    len(story_json["chapters"]) * CHAPTER_SORT_KEY_GAP
+                ),
+                all_chapter_count=len(story_json["chapters"]),
+                **_identity_kwargs(story_json),
             )
             setattr(
                 story,
                 "_tag_names",
                 frozenset(_tag_pretty_name_to_name(t) for t in story_tag_pretty_names),
             )
+            # favorites of users missing here are dropped, the count follows
+            story_favorites_json = {
+                f["user"]: f for f in story_json.get("favorites", ())
+            }
+            favorite_usernames.update(story_favorites_json.keys())
+            setattr(story, "_favorites_json", story_favorites_json)
             stories.append(story)
 
             for i, chapter_json in enumerate(story_json["chapters"]):
@@ -111,16 +141,43 @@ class Command(BaseCommand):
                     )
                     synopsis = new_synopsis
 
-                chapters.append(
-                    Chapter(
-                        story=story,
-                        name=chapter_json["name"],
-                        synopsis=synopsis,
-                        index=i,
-                        markdown=chapter_json["markdown"],
-                        published_at=now,
+                published_at: datetime.datetime | None = now
+                if "published_at" in chapter_json:
+                    published_at = (
+                        datetime.datetime.fromisoformat(published_at_)
+                        if (published_at_ := chapter_json["published_at"]) is not None
+                        else None
                     )
+
+                chapter = Chapter(
+                    story=story,
+                    name=chapter_json["name"],
+                    synopsis=synopsis,
+                    sort_key=(i * CHAPTER_SORT_KEY_GAP),
+                    markdown=chapter_json["markdown"],
+                    word_count=count_words(chapter_json["markdown"]),
+                    published_at=published_at,
+                    is_counted=(published_at is not None and published_at <= now),
+                    read_count=chapter_json.get("read_count", 0),
+                    **_identity_kwargs(chapter_json),
                 )
+                chapters.append(chapter)
+
+                # scheduled chapters are left for `releasechapters`
+                if chapter.is_counted:
+                    assert published_at is not None
+                    story.word_count += chapter.word_count
+                    story.chapter_count += 1
+                    if (
+                        story.first_published_at is None
+                        or published_at < story.first_published_at
+                    ):
+                        story.first_published_at = published_at
+                    if (
+                        story.last_published_at is None
+                        or published_at > story.last_published_at
+                    ):
+                        story.last_published_at = published_at
 
         Tag.objects.bulk_create(
             (
@@ -141,8 +198,32 @@ class Command(BaseCommand):
             )
         }
 
+        user_ids_by_username: dict[str, int] = dict(
+            User.objects.filter(username__in=favorite_usernames).values_list(
+                "username", "pk"
+            )
+        )
+        favorites: list[Favorite] = []
+        for story in stories:
+            story_favorites = [
+                Favorite(
+                    story=story,
+                    user_id=user_ids_by_username[username],
+                    created_at=(
+                        datetime.datetime.fromisoformat(created_at_)
+                        if (created_at_ := favorite_json.get("created_at")) is not None
+                        else None
+                    ),
+                )
+                for username, favorite_json in getattr(story, "_favorites_json").items()
+                if username in user_ids_by_username
+            ]
+            story.favorite_count = len(story_favorites)
+            favorites.extend(story_favorites)
+
         Story.objects.bulk_create(stories, batch_size=1024)
         Chapter.objects.bulk_create(chapters, batch_size=1024)
+        Favorite.objects.bulk_create(favorites, batch_size=1024)
 
         for story in stories:
             story.tags.set(
@@ -150,5 +231,15 @@ class Command(BaseCommand):
             )
 
 
+def _identity_kwargs(obj_json: dict[str, Any]) -> dict[str, Any]:
+    # as written by `dumpstories`, otherwise new ones are generated
+    kwargs: dict[str, Any] = {}
+    if (uuid_ := obj_json.get("uuid")) is not None:
+        kwargs["uuid"] = uuid.UUID(uuid_)
+    if (created_at := obj_json.get("created_at")) is not None:
+        kwargs["created_at"] = datetime.datetime.fromisoformat(created_at)
+    return kwargs
+
+
 def _tag_pretty_name_to_name(pretty_name: str) -> str:
     return pretty_name.lower().replace(" ", "_").replace("/", "-")
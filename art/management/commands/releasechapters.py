@@ -0,0 +1,62 @@
+from typing import Any
+from uuid import UUID
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.utils import timezone
+
+from art.caching import STORY_LIST_KEY, apurge_surrogate_keys, story_key
+from art.models import Chapter, Story
+
+
+class Command(BaseCommand):
+    help = "Count scheduled chapters that went live into their story's aggregates, run periodically"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1024)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+
+        now = timezone.now()
+
+        chapter_count = 0
+        story_ids: set[UUID] = set()
+        while True:
+            with transaction.atomic():
+                # locked in the same order as the API's chapter writes
+                batch_story_ids = list(
+                    Story.objects.select_for_update()
+                    .filter(
+                        uuid__in=Chapter.objects.filter(
+                            is_counted=False,
+                            published_at__isnull=False,
+                            published_at__lte=now,
+                        )
+                        .order_by()
+                        .values("story_id")
+                        .distinct()[:batch_size]
+                    )
+                    .order_by("uuid")
+                    .values_list("uuid", flat=True)
+                )
+                if not batch_story_ids:
+                    break
+
+                chapter_count += Story.count_live_chapters(
+                    Story.objects.filter(uuid__in=batch_story_ids), now
+                )
+
+            story_ids.update(batch_story_ids)
+
+        if story_ids:
+            async_to_sync(apurge_surrogate_keys)(
+                (STORY_LIST_KEY, *(story_key(story_id) for story_id in story_ids))
+            )
+
+        self.stderr.write(
+            self.style.NOTICE(
+                f"released {chapter_count} chapters across {len(story_ids)} stories"
+            )
+        )
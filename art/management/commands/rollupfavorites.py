@@ -0,0 +1,71 @@
+from collections import defaultdict
+from typing import Any
+from uuid import UUID
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Case, F, When
+
+from art.caching import STORY_LIST_KEY, apurge_surrogate_keys, story_key
+from art.models import FavoriteCountDelta, Story
+
+
+class Command(BaseCommand):
+    help = "Fold pending favorite count deltas into `Story.favorite_count`, run periodically"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1024)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+
+        delta_count = 0
+        story_ids: set[UUID] = set()
+        while True:
+            with transaction.atomic():
+                deltas = list(
+                    FavoriteCountDelta.objects.select_for_update(skip_locked=True)
+                    .order_by("uuid")
+                    .values_list("uuid", "story_id", "delta")[:batch_size]
+                )
+                if not deltas:
+                    break
+
+                story_deltas: defaultdict[UUID, int] = defaultdict(int)
+                for _, story_id, delta in deltas:
+                    story_deltas[story_id] += delta
+
+                changed_story_deltas = {
+                    story_id: delta
+                    for story_id, delta in story_deltas.items()
+                    if delta != 0
+                }
+                if changed_story_deltas:
+                    Story.objects.filter(uuid__in=changed_story_deltas.keys()).update(
+                        favorite_count=Case(
+                            *(
+                                When(uuid=story_id, then=(F("favorite_count") + delta))
+                                for story_id, delta in changed_story_deltas.items()
+                            ),
+                            default=F("favorite_count"),
+                        )
+                    )
+
+                FavoriteCountDelta.objects.filter(
+                    uuid__in=[uuid for uuid, _, _ in deltas]
+                ).delete()
+
+            delta_count += len(deltas)
+            story_ids.update(changed_story_deltas.keys())
+
+        if story_ids:
+            async_to_sync(apurge_surrogate_keys)(
+                (STORY_LIST_KEY, *(story_key(story_id) for story_id in story_ids))
+            )
+
+        self.stderr.write(
+            self.style.NOTICE(
+                f"rolled up {delta_count} deltas into {len(story_ids)} stories"
+            )
+        )
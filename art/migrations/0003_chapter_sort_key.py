@@ -0,0 +1,75 @@
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+_SORT_KEY_GAP = 1 << 16
+
+
+def _forward_func_spread_sort_keys(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    Chapter = apps.get_model("art", "Chapter")
+    db_alias = schema_editor.connection.alias
+
+    # negate first, so no intermediate row can collide with another's final key
+    Chapter.objects.using(db_alias).update(sort_key=-models.F("sort_key") - 1)
+    Chapter.objects.using(db_alias).update(
+        sort_key=(-models.F("sort_key") - 1) * _SORT_KEY_GAP
+    )
+
+
+def _reverse_func_compact_sort_keys(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    Chapter = apps.get_model("art", "Chapter")
+    db_alias = schema_editor.connection.alias
+
+    story_ids = (
+        Chapter.objects.using(db_alias).values_list("story_id", flat=True).distinct()
+    )
+    for story_id in story_ids.iterator():
+        chapters = list(
+            Chapter.objects.using(db_alias)
+            .filter(story_id=story_id)
+            .order_by("sort_key")
+            .only("uuid", "sort_key")
+        )
+        for i, chapter in enumerate(chapters):
+            chapter.sort_key = -i - 1
+        Chapter.objects.using(db_alias).bulk_update(chapters, ["sort_key"])
+        for i, chapter in enumerate(chapters):
+            chapter.sort_key = i
+        Chapter.objects.using(db_alias).bulk_update(chapters, ["sort_key"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0002_postgres_search_vector"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="chapter",
+            name="chapter__unique__story__index",
+        ),
+        migrations.RenameField(
+            model_name="chapter",
+            old_name="index",
+            new_name="sort_key",
+        ),
+        migrations.AlterField(
+            model_name="chapter",
+            name="sort_key",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AddConstraint(
+            model_name="chapter",
+            constraint=models.UniqueConstraint(
+                fields=("story", "sort_key"), name="chapter__unique__story__sort_key"
+            ),
+        ),
+        migrations.RunPython(
+            _forward_func_spread_sort_keys,
+            _reverse_func_compact_sort_keys,
+        ),
+    ]
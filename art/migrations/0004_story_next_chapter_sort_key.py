@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models.functions import Coalesce
+
+_SORT_KEY_GAP = 1 << 16
+
+
+def _forward_func_set_next_chapter_sort_keys(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    Story = apps.get_model("art", "Story")
+    Chapter = apps.get_model("art", "Chapter")
+    db_alias = schema_editor.connection.alias
+
+    last_sort_key = (
+        Chapter.objects.using(db_alias)
+        .filter(story_id=models.OuterRef("uuid"))
+        .order_by("-sort_key")
+        .values("sort_key")[:1]
+    )
+    Story.objects.using(db_alias).update(
+        next_chapter_sort_key=Coalesce(
+            models.Subquery(last_sort_key) + _SORT_KEY_GAP, models.Value(0)
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0003_chapter_sort_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="story",
+            name="next_chapter_sort_key",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            _forward_func_set_next_chapter_sort_keys,
+            migrations.RunPython.noop,
+        ),
+    ]
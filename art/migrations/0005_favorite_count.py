@@ -0,0 +1,74 @@
+# Generated by Django 5.1.7 on 2026-10-19 18:24
+
+import django.db.models.deletion
+import uuid_extensions
+from django.conf import settings
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models.functions import Coalesce
+
+
+def _forward_func_count_favorites(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    Story = apps.get_model("art", "Story")
+    db_alias = schema_editor.connection.alias
+
+    Story_favorites_of = Story.favorites_of.through
+    favorite_count = (
+        Story_favorites_of.objects.using(db_alias)
+        .filter(story_id=models.OuterRef("uuid"))
+        .values("story_id")
+        .annotate(count=models.Count("user_id"))
+        .values("count")
+    )
+    Story.objects.using(db_alias).update(
+        favorite_count=Coalesce(models.Subquery(favorite_count), models.Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0004_story_next_chapter_sort_key"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FavoriteCountDelta",
+            fields=[
+                (
+                    "uuid",
+                    models.UUIDField(
+                        default=uuid_extensions.uuid7,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("delta", models.SmallIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="story",
+            name="favorite_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["favorite_count", "uuid"], name="art_story_favorit_96f940_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="favoritecountdelta",
+            name="story",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="art.story"
+            ),
+        ),
+        migrations.RunPython(
+            _forward_func_count_favorites,
+            migrations.RunPython.noop,
+        ),
+    ]
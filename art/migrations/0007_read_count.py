@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0006_trending"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chapter",
+            name="read_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="story",
+            name="read_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+
+def _forward_func_coalesce_reports(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    db_alias = schema_editor.connection.alias
+
+    # keep only the latest (uuid7 sorts by creation) report per submitter
+    for model_name, target_field_name in (
+        ("StoryReport", "story"),
+        ("ChapterReport", "chapter"),
+    ):
+        Report = apps.get_model("art", model_name)
+        Report.objects.using(db_alias).filter(
+            models.Exists(
+                Report.objects.filter(
+                    **{target_field_name: models.OuterRef(target_field_name)},
+                    submitter=models.OuterRef("submitter"),
+                    uuid__gt=models.OuterRef("uuid"),
+                )
+            )
+        ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0007_read_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _forward_func_coalesce_reports,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name="chapterreport",
+            index=models.Index(
+                fields=["chapter", "kind"], name="art_chapter_chapter_c68484_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="storyreport",
+            index=models.Index(
+                fields=["story", "kind"], name="art_storyre_story_i_25129b_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="chapterreport",
+            constraint=models.UniqueConstraint(
+                fields=("chapter", "submitter"),
+                name="chapterreport__unique__chapter__submitter",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="storyreport",
+            constraint=models.UniqueConstraint(
+                fields=("story", "submitter"),
+                name="storyreport__unique__story__submitter",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0008_reports"),
+    ]
+
+    operations = [
+        # backfilled by `computewordcounts`
+        migrations.AddField(
+            model_name="chapter",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="story",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="chapter",
+            index=models.Index(
+                fields=["word_count", "uuid"], name="art_chapter_word_co_85c731_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["word_count", "uuid"], name="art_story_word_co_bc5f0a_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models.functions import Coalesce
+
+
+def _forward_func_aggregate_chapters(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    Story = apps.get_model("art", "Story")
+    Chapter = apps.get_model("art", "Chapter")
+    db_alias = schema_editor.connection.alias
+
+    chapters = (
+        Chapter.objects.using(db_alias)
+        .filter(story_id=models.OuterRef("uuid"))
+        .values("story_id")
+    )
+    Story.objects.using(db_alias).update(
+        chapter_count=Coalesce(
+            models.Subquery(chapters.annotate(v=models.Count("uuid")).values("v")),
+            models.Value(0),
+        ),
+        first_published_at=models.Subquery(
+            chapters.annotate(v=models.Min("published_at")).values("v")
+        ),
+        last_published_at=models.Subquery(
+            chapters.annotate(v=models.Max("published_at")).values("v")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0009_word_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="story",
+            name="chapter_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="story",
+            name="first_published_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="story",
+            name="last_published_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(
+            _forward_func_aggregate_chapters,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["title", "uuid"], name="art_story_title_7e627f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["synopsis", "uuid"], name="art_story_synopsi_62d929_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["author", "uuid"], name="art_story_author__681540_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["created_at", "uuid"], name="art_story_created_feafef_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["first_published_at", "uuid"],
+                name="art_story_first_p_63c3e4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["last_published_at", "uuid"],
+                name="art_story_last_pu_49f25a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                fields=["chapter_count", "uuid"], name="art_story_chapter_ef9582_idx"
+            ),
+        ),
+    ]
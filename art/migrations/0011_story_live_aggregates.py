@@ -0,0 +1,84 @@
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models.functions import Coalesce, Left
+from django.utils import timezone
+
+
+def _forward_func_count_live_chapters(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    Story = apps.get_model("art", "Story")
+    Chapter = apps.get_model("art", "Chapter")
+    db_alias = schema_editor.connection.alias
+
+    # scheduled chapters are left for `releasechapters`
+    Chapter.objects.using(db_alias).filter(published_at__lte=timezone.now()).update(
+        is_counted=True
+    )
+
+    chapters = (
+        Chapter.objects.using(db_alias)
+        .filter(story_id=models.OuterRef("uuid"), is_counted=True)
+        .values("story_id")
+    )
+    Story.objects.using(db_alias).update(
+        word_count=Coalesce(
+            models.Subquery(chapters.annotate(v=models.Sum("word_count")).values("v")),
+            models.Value(0),
+        ),
+        chapter_count=Coalesce(
+            models.Subquery(chapters.annotate(v=models.Count("uuid")).values("v")),
+            models.Value(0),
+        ),
+        first_published_at=models.Subquery(
+            chapters.annotate(v=models.Min("published_at")).values("v")
+        ),
+        last_published_at=models.Subquery(
+            chapters.annotate(v=models.Max("published_at")).values("v")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0010_story_sorts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chapter",
+            name="is_counted",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(
+            _forward_func_count_live_chapters,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name="chapter",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_counted", False), ("published_at__isnull", False)
+                ),
+                fields=["published_at"],
+                name="chapter__uncounted__pub_at",
+            ),
+        ),
+        # long titles could exceed the btree row size limit
+        migrations.RemoveIndex(
+            model_name="story",
+            name="art_story_title_7e627f_idx",
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                Left("title", 256), models.F("uuid"), name="story__title_prefix__uuid"
+            ),
+        ),
+        # sorts by `author__username` join, so this never covered them
+        migrations.RemoveIndex(
+            model_name="story",
+            name="art_story_author__681540_idx",
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models.functions import Coalesce
+
+
+def _forward_func_count_all_chapters(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    Story = apps.get_model("art", "Story")
+    Chapter = apps.get_model("art", "Chapter")
+    db_alias = schema_editor.connection.alias
+
+    chapters = (
+        Chapter.objects.using(db_alias)
+        .filter(story_id=models.OuterRef("uuid"))
+        .values("story_id")
+    )
+    Story.objects.using(db_alias).update(
+        all_chapter_count=Coalesce(
+            models.Subquery(chapters.annotate(v=models.Count("uuid")).values("v")),
+            models.Value(0),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0011_story_live_aggregates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="story",
+            name="all_chapter_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            _forward_func_count_all_chapters,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0012_story_all_chapter_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportedChapter",
+            fields=[],
+            options={
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("art.chapter",),
+        ),
+        migrations.CreateModel(
+            name="ReportedStory",
+            fields=[],
+            options={
+                "verbose_name_plural": "reported stories",
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("art.story",),
+        ),
+    ]
@@ -0,0 +1,89 @@
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models.functions import Coalesce
+
+
+def _forward_func_count_reports(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+):
+    db_alias = schema_editor.connection.alias
+
+    for model_name, report_model_name, target_field in (
+        ("Story", "StoryReport", "story_id"),
+        ("Chapter", "ChapterReport", "chapter_id"),
+    ):
+        Target = apps.get_model("art", model_name)
+        Report = apps.get_model("art", report_model_name)
+
+        reports = (
+            Report.objects.using(db_alias)
+            .filter(**{target_field: models.OuterRef("uuid")})
+            .order_by()
+            .values(target_field)
+        )
+        Target.objects.using(db_alias).filter(
+            uuid__in=Report.objects.using(db_alias).values(target_field)
+        ).update(
+            report_count=Coalesce(
+                models.Subquery(reports.annotate(v=models.Count("uuid")).values("v")),
+                models.Value(0),
+            ),
+            report_kind=Coalesce(
+                models.Subquery(reports.annotate(v=models.Max("kind")).values("v")),
+                models.Value(0),
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("art", "0013_reported_proxies"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chapter",
+            name="report_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="chapter",
+            name="report_kind",
+            field=models.IntegerField(
+                choices=[(0, "Other"), (1, "Dmca"), (2, "Abuse")], default=0
+            ),
+        ),
+        migrations.AddField(
+            model_name="story",
+            name="report_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="story",
+            name="report_kind",
+            field=models.IntegerField(
+                choices=[(0, "Other"), (1, "Dmca"), (2, "Abuse")], default=0
+            ),
+        ),
+        migrations.RunPython(
+            _forward_func_count_reports,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name="chapter",
+            index=models.Index(
+                condition=models.Q(("report_count__gt", 0)),
+                fields=["-report_count", "-report_kind", "uuid"],
+                name="chapter__report_queue",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="story",
+            index=models.Index(
+                condition=models.Q(("report_count__gt", 0)),
+                fields=["-report_count", "-report_kind", "uuid"],
+                name="story__report_queue",
+            ),
+        ),
+    ]
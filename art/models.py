@@ -1,11 +1,72 @@
+import datetime
+import math
+import re
+from uuid import UUID
+
 # TODO replace with regular `uuid` module when finalized in Python
 import uuid_extensions
 from django.conf import settings
-from django.db import connection, models
+from django.db import connection, connections, models, transaction
+from django.db.models.functions import (
+    Coalesce,
+    Greatest,
+    Lag,
+    Lead,
+    Left,
+    RowNumber,
+)
 from django.utils import timezone
 
 
+# spacing between consecutive `Chapter.sort_key`s, so a chapter can be inserted
+# or moved between two others without touching its neighbours
+CHAPTER_SORT_KEY_GAP = 1 << 16
+
+_WORD_RE = re.compile(r"\w+(?:['’]\w+)*")
+
+# a typical adult silent reading speed
+READING_WORDS_PER_MINUTE = 238
+
+# titles are sorted (and indexed) by a prefix, so that long ones stay within
+# the btree row size limit
+STORY_TITLE_SORT_LENGTH = 256
+
+
+def count_words(markdown: str) -> int:
+    return sum(1 for _ in _WORD_RE.finditer(markdown))
+
+
+class ReportKind(models.IntegerChoices):
+    # in increasing severity
+    OTHER = 0
+    DMCA = 1
+    ABUSE = 2
+
+
 class Story(models.Model):
+    class Meta:
+        indexes = (
+            models.Index(fields=("favorite_count", "uuid")),
+            models.Index(fields=("trending_score", "uuid")),
+            models.Index(fields=("word_count", "uuid")),
+            models.Index(
+                Left("title", STORY_TITLE_SORT_LENGTH),
+                models.F("uuid"),
+                name="story__title_prefix__uuid",
+            ),
+            models.Index(fields=("synopsis", "uuid")),
+            models.Index(fields=("created_at", "uuid")),
+            models.Index(fields=("first_published_at", "uuid")),
+            models.Index(fields=("last_published_at", "uuid")),
+            models.Index(fields=("chapter_count", "uuid")),
+            # the moderation queue, see `art.admin`
+            models.Index(
+                fields=("-report_count", "-report_kind", "uuid"),
+                condition=models.Q(report_count__gt=0),
+                name="story__report_queue",
+            ),
+        )
+
     uuid = models.UUIDField(primary_key=True, default=uuid_extensions.uuid7)
     title = models.TextField()
     synopsis = models.CharField(max_length=256)
@@ -19,8 +80,220 @@ class Story(models.Model):
     )
     tags = models.ManyToManyField("Tag", related_name="stories", blank=True)
     favorites_of = models.ManyToManyField(
-        settings.AUTH_USER_MODEL, related_name="favorite_stories", blank=True
+        settings.AUTH_USER_MODEL,
+        related_name="favorite_stories",
+        blank=True,
+        through="Favorite",
     )
+    # rolled up from `FavoriteCountDelta`s, see `rollupfavorites`
+    favorite_count = models.IntegerField(default=0)
+    # see `computetrending`
+    trending_score = models.FloatField(default=0.0)
+    # buffered, see `art.read_counts`
+    read_count = models.PositiveBigIntegerField(default=0)
+    # over the reports, see `update_report_counts`
+    report_count = models.PositiveIntegerField(default=0)
+    # the most severe kind reported
+    report_kind = models.IntegerField(choices=ReportKind.choices, default=0)
+    # aggregated over the chapters that are live, see `Chapter.is_counted`
+    word_count = models.PositiveIntegerField(default=0)
+    chapter_count = models.PositiveIntegerField(default=0)
+    first_published_at = models.DateTimeField(null=True, blank=True)
+    last_published_at = models.DateTimeField(null=True, blank=True)
+    # always greater than the `sort_key` of every chapter of the story
+    next_chapter_sort_key = models.BigIntegerField(default=0)
+    # every chapter, unlike `chapter_count`, so the index of the next appended
+    # one, see `append_chapters`
+    all_chapter_count = models.PositiveIntegerField(default=0)
+
+    @property
+    def reading_time(self) -> int:
+        # in minutes
+        return math.ceil(self.word_count / READING_WORDS_PER_MINUTE)
+
+    @staticmethod
+    def claim_chapter_sort_keys(
+        qs: models.QuerySet["Story"], count: int = 1
+    ) -> int | None:
+        # the UPDATE holds the story row until commit, so concurrent appends are
+        # handed disjoint keys instead of racing on MAX(sort_key)
+        claimed = count * CHAPTER_SORT_KEY_GAP
+        with transaction.atomic():
+            updated_count = qs.update(
+                next_chapter_sort_key=(models.F("next_chapter_sort_key") + claimed)
+            )
+            if updated_count < 1:
+                return None
+
+            return qs.values_list("next_chapter_sort_key", flat=True).get() - claimed
+
+    @staticmethod
+    def append_chapters(
+        qs: models.QuerySet["Story"], count: int = 1
+    ) -> tuple[int, int] | None:
+        # like `claim_chapter_sort_keys`, but also hands out the chapters' indices
+        claimed = count * CHAPTER_SORT_KEY_GAP
+        with transaction.atomic():
+            updated_count = qs.update(
+                next_chapter_sort_key=(models.F("next_chapter_sort_key") + claimed),
+                all_chapter_count=(models.F("all_chapter_count") + count),
+            )
+            if updated_count < 1:
+                return None
+
+            next_chapter_sort_key, all_chapter_count = qs.values_list(
+                "next_chapter_sort_key", "all_chapter_count"
+            ).get()
+            return next_chapter_sort_key - claimed, all_chapter_count - count
+
+    @staticmethod
+    def update_from_chapters(qs: models.QuerySet["Story"]) -> int:
+        # recomputed from scratch, e.g. by `computewordcounts` and the admin,
+        # whereas chapter writes apply deltas, see `count_live_chapters` and
+        # `uncount_chapters`; repairs the chapter counters as well
+        now = timezone.now()
+        with transaction.atomic():
+            Chapter.objects.filter(story__in=qs).update(
+                is_counted=models.Case(
+                    models.When(published_at__lte=now, then=models.Value(True)),
+                    default=models.Value(False),
+                )
+            )
+
+            all_chapters = Chapter.objects.filter(
+                story_id=models.OuterRef("uuid")
+            ).values("story_id")
+            chapters = all_chapters.filter(is_counted=True)
+            return qs.update(
+                all_chapter_count=Coalesce(
+                    models.Subquery(
+                        all_chapters.annotate(v=models.Count("uuid")).values("v")
+                    ),
+                    models.Value(0),
+                ),
+                next_chapter_sort_key=Greatest(
+                    models.F("next_chapter_sort_key"),
+                    Coalesce(
+                        models.Subquery(
+                            all_chapters.annotate(
+                                v=(models.Max("sort_key") + CHAPTER_SORT_KEY_GAP)
+                            ).values("v")
+                        ),
+                        models.Value(0),
+                    ),
+                ),
+                word_count=Coalesce(
+                    models.Subquery(
+                        chapters.annotate(v=models.Sum("word_count")).values("v")
+                    ),
+                    models.Value(0),
+                ),
+                chapter_count=Coalesce(
+                    models.Subquery(
+                        chapters.annotate(v=models.Count("uuid")).values("v")
+                    ),
+                    models.Value(0),
+                ),
+                first_published_at=models.Subquery(
+                    chapters.annotate(v=models.Min("published_at")).values("v")
+                ),
+                last_published_at=models.Subquery(
+                    chapters.annotate(v=models.Max("published_at")).values("v")
+                ),
+            )
+
+    @staticmethod
+    def count_live_chapters(
+        qs: models.QuerySet["Story"], now: datetime.datetime
+    ) -> int:
+        # folds the chapters that went live since they were last counted into
+        # the aggregates, in one `UPDATE ... FROM` over all the stories, see
+        # `releasechapters`; the stories must be locked by the caller
+        with transaction.atomic(using=qs.db):
+            chapters = Chapter.objects.using(qs.db).filter(
+                story_id__in=qs.values("uuid"), is_counted=False, published_at__lte=now
+            )
+
+            db_connection = connections[qs.db]
+            aggregates_sql, aggregates_params = (
+                chapters.order_by()
+                .values("story_id")
+                .annotate(
+                    released_word_count=models.Sum("word_count"),
+                    released_chapter_count=models.Count("uuid"),
+                    released_first_published_at=models.Min("published_at"),
+                    released_last_published_at=models.Max("published_at"),
+                )
+                .query.get_compiler(connection=db_connection)
+                .as_sql()
+            )
+            table_name = db_connection.ops.quote_name(Story._meta.db_table)
+            # `LEAST` and `GREATEST` aren't portable
+            with db_connection.cursor() as c:
+                c.execute(
+                    f"UPDATE {table_name} SET"
+                    f" word_count = {table_name}.word_count + r.released_word_count,"
+                    f" chapter_count = {table_name}.chapter_count"
+                    " + r.released_chapter_count,"
+                    " first_published_at = CASE"
+                    f" WHEN {table_name}.first_published_at IS NULL"
+                    f" OR r.released_first_published_at < {table_name}.first_published_at"
+                    " THEN r.released_first_published_at"
+                    f" ELSE {table_name}.first_published_at END,"
+                    " last_published_at = CASE"
+                    f" WHEN {table_name}.last_published_at IS NULL"
+                    f" OR r.released_last_published_at > {table_name}.last_published_at"
+                    " THEN r.released_last_published_at"
+                    f" ELSE {table_name}.last_published_at END"
+                    f" FROM ({aggregates_sql}) AS r"
+                    f" WHERE {table_name}.uuid = r.story_id",
+                    aggregates_params,
+                )
+
+            return chapters.update(is_counted=True)
+
+    @staticmethod
+    def uncount_chapters(story_id: UUID, qs: models.QuerySet["Chapter"]) -> int:
+        # must run inside a transaction that holds a lock on the story
+        chapters = list(
+            qs.select_for_update()
+            .filter(story_id=story_id, is_counted=True)
+            .values_list("uuid", "word_count", "published_at")
+        )
+        if not chapters:
+            return 0
+
+        Chapter.objects.filter(uuid__in=[c[0] for c in chapters]).update(
+            is_counted=False
+        )
+
+        first_published_at, last_published_at = Story.objects.values_list(
+            "first_published_at", "last_published_at"
+        ).get(uuid=story_id)
+        # only removing the earliest or the latest chapter needs a rescan
+        if (
+            first_published_at is None
+            or last_published_at is None
+            or min(c[2] for c in chapters) <= first_published_at
+            or max(c[2] for c in chapters) >= last_published_at
+        ):
+            published_ats = Chapter.objects.filter(
+                story_id=story_id, is_counted=True
+            ).aggregate(
+                first_published_at=models.Min("published_at"),
+                last_published_at=models.Max("published_at"),
+            )
+            first_published_at = published_ats["first_published_at"]
+            last_published_at = published_ats["last_published_at"]
+
+        Story.objects.filter(uuid=story_id).update(
+            word_count=(models.F("word_count") - sum(c[1] for c in chapters)),
+            chapter_count=(models.F("chapter_count") - len(chapters)),
+            first_published_at=first_published_at,
+            last_published_at=last_published_at,
+        )
+
+        return len(chapters)
 
     @staticmethod
     def annotate_from_chapters(
@@ -33,6 +306,11 @@ class Story(models.Model):
             .values("min_published_at")
         )
 
+    @staticmethod
+    def update_report_counts(qs: models.QuerySet["Story"]) -> int:
+        # after every change to the reports, served by their (story, kind) index
+        return qs.update(**_report_aggregates(StoryReport, "story_id"))
+
     @staticmethod
     def annotate_search_vectors(
         qs: models.QuerySet["Story"],
@@ -53,7 +331,22 @@ class Chapter(models.Model):
     class Meta:
         constraints = (
             models.UniqueConstraint(
-                fields=("story", "index"), name="chapter__unique__story__index"
+                fields=("story", "sort_key"), name="chapter__unique__story__sort_key"
+            ),
+        )
+        indexes = (
+            models.Index(fields=("word_count", "uuid")),
+            # covers `releasechapters`
+            models.Index(
+                fields=("published_at",),
+                condition=models.Q(is_counted=False, published_at__isnull=False),
+                name="chapter__uncounted__pub_at",
+            ),
+            # the moderation queue, see `art.admin`
+            models.Index(
+                fields=("-report_count", "-report_kind", "uuid"),
+                condition=models.Q(report_count__gt=0),
+                name="chapter__report_queue",
             ),
         )
 
@@ -61,10 +354,31 @@ class Chapter(models.Model):
     story = models.ForeignKey(Story, related_name="chapters", on_delete=models.CASCADE)
     name = models.CharField(max_length=256)
     synopsis = models.CharField(max_length=256, blank=True)
-    index = models.PositiveIntegerField()
+    sort_key = models.BigIntegerField()
     markdown = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
     published_at = models.DateTimeField(null=True, blank=True)
+    # buffered, see `art.read_counts`
+    read_count = models.PositiveBigIntegerField(default=0)
+    # over the reports, see `update_report_counts`
+    report_count = models.PositiveIntegerField(default=0)
+    # the most severe kind reported
+    report_kind = models.IntegerField(choices=ReportKind.choices, default=0)
+    # of `markdown`, see `count_words`
+    word_count = models.PositiveIntegerField(default=0)
+    # whether the story's aggregates include the chapter, which they only do
+    # once it is live
+    is_counted = models.BooleanField(default=False)
+
+    @property
+    def reading_time(self) -> int:
+        # in minutes
+        return math.ceil(self.word_count / READING_WORDS_PER_MINUTE)
+
+    @staticmethod
+    def update_report_counts(qs: models.QuerySet["Chapter"]) -> int:
+        # after every change to the reports, served by their (chapter, kind) index
+        return qs.update(**_report_aggregates(ChapterReport, "chapter_id"))
 
     @staticmethod
     def annotate_search_vectors(
@@ -81,6 +395,81 @@ class Chapter(models.Model):
             )
         return qs
 
+    @staticmethod
+    def annotate_index(
+        qs: models.QuerySet["Chapter"],
+    ) -> models.QuerySet["Chapter"]:
+        return qs.annotate(
+            index=models.Window(
+                RowNumber(),
+                partition_by=models.F("story_id"),
+                order_by=models.F("sort_key").asc(),
+            )
+            - 1
+        )
+
+    @staticmethod
+    def annotate_index_single(
+        qs: models.QuerySet["Chapter"], *filter_args: models.Q
+    ) -> models.QuerySet["Chapter"]:
+        # for lookups of single chapters, where a window would only see the one row
+        preceding_count = (
+            Chapter.objects.filter(
+                *filter_args,
+                story_id=models.OuterRef("story_id"),
+                sort_key__lt=models.OuterRef("sort_key"),
+            )
+            .order_by()
+            .values("story_id")
+            .annotate(count=models.Count("uuid"))
+            .values("count")
+        )
+        return qs.annotate(
+            index=Coalesce(models.Subquery(preceding_count), models.Value(0))
+        )
+
+    @staticmethod
+    def annotate_navigation(
+        qs: models.QuerySet["Chapter"],
+    ) -> models.QuerySet["Chapter"]:
+        order_by = models.F("sort_key").asc()
+        return qs.annotate(
+            index=models.Window(RowNumber(), order_by=order_by) - 1,
+            chapter_number=models.Window(RowNumber(), order_by=order_by),
+            previous_chapter_uuid=models.Window(Lag("uuid"), order_by=order_by),
+            next_chapter_uuid=models.Window(Lead("uuid"), order_by=order_by),
+            chapter_count=models.Window(models.Count("uuid")),
+        )
+
+    @staticmethod
+    def rebalance_sort_keys(story_id: UUID) -> None:
+        # must run inside a transaction that holds a lock on the story
+        chapters = list(
+            Chapter.objects.filter(story_id=story_id)
+            .order_by("sort_key")
+            .only("uuid", "sort_key")
+        )
+        if not chapters:
+            return
+
+        # move every key below both the current and the final ranges first, so
+        # neither step can collide with `chapter__unique__story__sort_key`
+        base = min(chapters[0].sort_key, 0) - len(chapters)
+        for i, chapter in enumerate(chapters):
+            chapter.sort_key = base - i
+        Chapter.objects.bulk_update(chapters, ["sort_key"], batch_size=1024)
+
+        for i, chapter in enumerate(chapters):
+            chapter.sort_key = i * CHAPTER_SORT_KEY_GAP
+        Chapter.objects.bulk_update(chapters, ["sort_key"], batch_size=1024)
+
+        Story.objects.filter(uuid=story_id).update(
+            next_chapter_sort_key=Greatest(
+                models.F("next_chapter_sort_key"),
+                models.Value(len(chapters) * CHAPTER_SORT_KEY_GAP),
+            )
+        )
+
 
 class Category(models.Model):
     class Meta:
@@ -104,13 +493,37 @@ class Tag(models.Model):
         return f"Tag: {self.pretty_name} ({self.name})"
 
 
-class ReportKind(models.IntegerChoices):
-    OTHER = 0
-    DMCA = 1
-    ABUSE = 2
+class Favorite(models.Model):
+    class Meta:
+        # formerly the implicit through table of `Story.favorites_of`
+        db_table = "art_story_favorites_of"
+        unique_together = (("story", "user"),)
+        indexes = (models.Index(fields=("created_at",)),)
+
+    story = models.ForeignKey(Story, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # null for favorites that predate it, which trending leaves out
+    created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+
+
+class FavoriteCountDelta(models.Model):
+    # append-only, so concurrent (un)favorites never contend on the story row
+    uuid = models.UUIDField(primary_key=True, default=uuid_extensions.uuid7)
+    story = models.ForeignKey(Story, on_delete=models.CASCADE)
+    delta = models.SmallIntegerField()
 
 
 class StoryReport(models.Model):
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("story", "submitter"),
+                name="storyreport__unique__story__submitter",
+            ),
+        )
+        # covers the moderation queue's per-story counts
+        indexes = (models.Index(fields=("story", "kind")),)
+
     uuid = models.UUIDField(primary_key=True, default=uuid_extensions.uuid7)
     story = models.ForeignKey(Story, on_delete=models.CASCADE)
     kind = models.IntegerField(choices=ReportKind.choices)
@@ -119,8 +532,51 @@ class StoryReport(models.Model):
 
 
 class ChapterReport(models.Model):
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("chapter", "submitter"),
+                name="chapterreport__unique__chapter__submitter",
+            ),
+        )
+        # covers the moderation queue's per-chapter counts
+        indexes = (models.Index(fields=("chapter", "kind")),)
+
     uuid = models.UUIDField(primary_key=True, default=uuid_extensions.uuid7)
     chapter = models.ForeignKey(Chapter, on_delete=models.CASCADE)
     kind = models.IntegerField(choices=ReportKind.choices)
     details = models.CharField(max_length=1024)
     submitter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+
+
+def _report_aggregates(
+    report_model: type[StoryReport] | type[ChapterReport], target_field: str
+) -> dict[str, models.Expression]:
+    reports = (
+        report_model.objects.filter(**{target_field: models.OuterRef("uuid")})
+        .order_by()
+        .values(target_field)
+    )
+    return {
+        "report_count": Coalesce(
+            models.Subquery(reports.annotate(v=models.Count("uuid")).values("v")),
+            models.Value(0),
+        ),
+        "report_kind": Coalesce(
+            models.Subquery(reports.annotate(v=models.Max("kind")).values("v")),
+            models.Value(ReportKind.OTHER),
+        ),
+    }
+
+
+class ReportedStory(Story):
+    # the moderation queue, one row per reported story, see `art.admin`
+    class Meta:
+        proxy = True
+        verbose_name_plural = "reported stories"
+
+
+class ReportedChapter(Chapter):
+    # the moderation queue, one row per reported chapter, see `art.admin`
+    class Meta:
+        proxy = True
@@ -0,0 +1,129 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+from typing import Any
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections, models, transaction
+from django.dispatch import receiver
+
+from art.models import Chapter, Story
+
+_logger = logging.getLogger(__name__)
+
+_READ_COUNT_FLUSH_INTERVAL: float
+_READ_COUNT_MAX_PENDING: int
+_READ_COUNT_FLUSH_BATCH_SIZE: int
+
+
+@receiver(setting_changed)
+def _load_global_settings(*args: Any, **kwargs: Any):
+    global _READ_COUNT_FLUSH_INTERVAL
+    global _READ_COUNT_MAX_PENDING
+    global _READ_COUNT_FLUSH_BATCH_SIZE
+
+    _READ_COUNT_FLUSH_INTERVAL = settings.READ_COUNT_FLUSH_INTERVAL
+    _READ_COUNT_MAX_PENDING = settings.READ_COUNT_MAX_PENDING
+    _READ_COUNT_FLUSH_BATCH_SIZE = settings.READ_COUNT_FLUSH_BATCH_SIZE
+
+
+_load_global_settings()
+
+# reads are buffered per worker and lost if it dies before a flush
+_lock = threading.Lock()
+_pending_story_reads: Counter[UUID] = Counter()
+_pending_chapter_reads: Counter[UUID] = Counter()
+
+# flushes run on a background thread, so that reads never wait on them
+_flush_requested = threading.Event()
+_flusher: threading.Thread | None = None
+
+
+async def arecord_chapter_read(story_id: UUID, chapter_id: UUID) -> None:
+    with _lock:
+        _pending_story_reads[story_id] += 1
+        _pending_chapter_reads[chapter_id] += 1
+        if len(_pending_chapter_reads) >= _READ_COUNT_MAX_PENDING:
+            _flush_requested.set()
+
+        _start_flusher()
+
+
+def flush_read_counts() -> None:
+    global _pending_story_reads
+    global _pending_chapter_reads
+
+    with _lock:
+        story_reads, _pending_story_reads = _pending_story_reads, Counter()
+        chapter_reads, _pending_chapter_reads = _pending_chapter_reads, Counter()
+
+    try:
+        with transaction.atomic():
+            _add_read_counts(Story, story_reads)
+            _add_read_counts(Chapter, chapter_reads)
+    except Exception:
+        # kept for the next flush instead of being lost
+        with _lock:
+            _pending_story_reads.update(story_reads)
+            _pending_chapter_reads.update(chapter_reads)
+        raise
+
+
+aflush_read_counts = sync_to_async(flush_read_counts)
+
+
+def _start_flusher() -> None:
+    # must hold `_lock`
+    global _flusher
+
+    if _flusher is not None and _flusher.is_alive():
+        return
+
+    _flusher = threading.Thread(
+        target=_run_flusher, name="read-count-flusher", daemon=True
+    )
+    _flusher.start()
+
+
+def _run_flusher() -> None:
+    while True:
+        _flush_requested.wait(_READ_COUNT_FLUSH_INTERVAL)
+        _flush_requested.clear()
+
+        try:
+            flush_read_counts()
+        except Exception:
+            _logger.exception("read count flush failed")
+        finally:
+            connections.close_all()
+
+
+def _add_read_counts(model: type[Story] | type[Chapter], reads: Counter[UUID]) -> None:
+    items = list(reads.items())
+    for i in range(0, len(items), _READ_COUNT_FLUSH_BATCH_SIZE):
+        batch = items[i : i + _READ_COUNT_FLUSH_BATCH_SIZE]
+        model.objects.filter(uuid__in=[uuid for uuid, _ in batch]).update(
+            read_count=models.Case(
+                *(
+                    models.When(uuid=uuid, then=(models.F("read_count") + count))
+                    for uuid, count in batch
+                ),
+                default=models.F("read_count"),
+                output_field=models.PositiveBigIntegerField(),
+            )
+        )
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if not _pending_chapter_reads:
+        return
+
+    try:
+        flush_read_counts()
+    except Exception:
+        _logger.exception("read count flush failed")
@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+import markdown as markdown_
+import nh3
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_MARKDOWN_RENDER_MAX_WORKERS: int
+
+_executor: Executor | None = None
+
+
+def _reset_executor(executor: Executor | None = None) -> None:
+    global _executor
+
+    # unless another request already replaced it
+    if _executor is None or (executor is not None and _executor is not executor):
+        return
+
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+@receiver(setting_changed)
+def _load_global_settings(*args: Any, **kwargs: Any):
+    global _MARKDOWN_RENDER_MAX_WORKERS
+
+    _MARKDOWN_RENDER_MAX_WORKERS = settings.MARKDOWN_RENDER_MAX_WORKERS
+
+    # rebuilt with the new size on next use
+    _reset_executor()
+
+
+_load_global_settings()
+
+
+def render_markdown(markdown: str) -> str:
+    return nh3.clean(markdown_.markdown(markdown, extensions=["extra", "sane_lists"]))
+
+
+def _cache_key(markdown: str) -> str:
+    return f"markdown_html__{hashlib.sha256(markdown.encode()).hexdigest()}"
+
+
+def _get_executor() -> Executor | None:
+    global _executor
+
+    # `None` means the event loop's default thread pool
+    if _MARKDOWN_RENDER_MAX_WORKERS < 1:
+        return None
+
+    # not forked, as this process runs other threads whose locks the children
+    # could inherit held
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=_MARKDOWN_RENDER_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+
+    return _executor
+
+
+async def arender_markdown(markdown: str) -> str:
+    cache = caches["rendered_markdown"]
+    cache_key = _cache_key(markdown)
+
+    html: str | None = await cache.aget(cache_key)
+    if html is None:
+        executor = _get_executor()
+        try:
+            html = await asyncio.get_running_loop().run_in_executor(
+                executor, render_markdown, markdown
+            )
+        except BrokenProcessPool:
+            # a dead worker breaks the whole pool, retried once on a new one
+            _reset_executor(executor)
+            html = await asyncio.get_running_loop().run_in_executor(
+                _get_executor(), render_markdown, markdown
+            )
+        await cache.aset(cache_key, html)
+
+    return html
+
+
+async def ainvalidate_rendered_markdown(markdown: str) -> None:
+    await caches["rendered_markdown"].adelete(_cache_key(markdown))
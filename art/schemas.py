@@ -1,4 +1,5 @@
 import datetime
+import uuid
 from typing import Optional, Self
 
 from django.db.models import Min, OrderBy, Q, OuterRef, QuerySet, Subquery
@@ -6,7 +7,7 @@ from django.http import HttpRequest
 from ninja import Field, ModelSchema, Schema
 from pydantic import model_validator
 
-from art.models import Category, Chapter, Story, Tag
+from art.models import Category, Chapter, ReportKind, Story, Tag
 from art.searches import search_fns
 from art.sorts import sort_configs
 from query_utils import search as searchutils
@@ -98,6 +99,10 @@ class StoryOutDetailsSchema(ModelSchema):
     category: str = Field(alias="category_id")
     createdAt: datetime.datetime = Field(alias="created_at")
     publishedAt: datetime.datetime | None = Field(alias="published_at")
+    favoriteCount: int = Field(alias="favorite_count")
+    readCount: int = Field(alias="read_count")
+    wordCount: int = Field(alias="word_count")
+    readingTime: int = Field(alias="reading_time")
 
     class Meta:
         model = Story
@@ -170,21 +175,47 @@ class ChapterPatchInSchema(ModelSchema):
         return self
 
 
+class ChapterRangeInSchema(Schema):
+    # 0-based, `end_index` is exclusive; both unset means every chapter
+    start_index: int | None = Field(default=None, ge=0, alias="startIndex")
+    end_index: int | None = Field(default=None, ge=0, alias="endIndex")
+
+
+class StoryPublishInSchema(ChapterRangeInSchema):
+    # unset means now, a future time schedules the chapters
+    published_at: datetime.datetime | None = Field(default=None, alias="publishedAt")
+
+
+class ChapterMoveInSchema(Schema):
+    index: int = Field(ge=0)
+
+
+class ReportInSchema(Schema):
+    kind: ReportKind
+    details: str = Field(max_length=1024)
+
+
 class ChapterOutSchema(ModelSchema):
+    index: int
+
     class Meta:
         model = Chapter
-        fields = ["uuid", "index", "name", "synopsis"]
+        fields = ["uuid", "name", "synopsis"]
 
 
 class ChapterOutDetailsSchema(ModelSchema):
     createdAt: datetime.datetime = Field(alias="created_at")
     publishedAt: datetime.datetime | None = Field(alias="published_at")
+    readCount: int = Field(alias="read_count")
+    wordCount: int = Field(alias="word_count")
+    readingTime: int = Field(alias="reading_time")
+    index: int
+    html: str | None = None
 
     class Meta:
         model = Chapter
         fields = [
             "uuid",
-            "index",
             "name",
             "synopsis",
             "markdown",
@@ -192,6 +223,35 @@ class ChapterOutDetailsSchema(ModelSchema):
         ]
 
 
+class StoryChapterOutDetailsSchema(ModelSchema):
+    createdAt: datetime.datetime = Field(alias="created_at")
+    publishedAt: datetime.datetime | None = Field(alias="published_at")
+    previousChapter: uuid.UUID | None = Field(alias="previous_chapter_uuid")
+    nextChapter: uuid.UUID | None = Field(alias="next_chapter_uuid")
+    chapterCount: int = Field(alias="chapter_count")
+    readCount: int = Field(alias="read_count")
+    wordCount: int = Field(alias="word_count")
+    readingTime: int = Field(alias="reading_time")
+    index: int
+    html: str | None = None
+
+    class Meta:
+        model = Chapter
+        fields = [
+            "uuid",
+            "name",
+            "synopsis",
+            "markdown",
+            "story",
+        ]
+
+
+class StoryBundleOutSchema(Schema):
+    story: StoryOutDetailsSchema
+    chapters: list[ChapterOutSchema]
+    chapter: StoryChapterOutDetailsSchema | None
+
+
 class CategoryOutSchema(ModelSchema):
     prettyName: str = Field(alias="pretty_name")
 
@@ -3,6 +3,7 @@ from typing import Callable
 from django.db import connection
 from django.db.models import Q, Exists, Min, OuterRef
 from django.http import HttpRequest
+from django.utils import timezone
 
 from art.models import Chapter, Story, Tag
 from query_utils.search.convertto import (
@@ -10,6 +11,7 @@ from query_utils.search.convertto import (
     DateTime,
     DateTimeDeltaRange,
     DateTimeRange,
+    IntRange,
     UuidList,
     CustomConvertTo,
 )
@@ -25,7 +27,7 @@ def _story_isPublished(request: HttpRequest, search_obj: str) -> Q:
     q = Q(
         Exists(
             Chapter.objects.filter(
-                story_id=OuterRef("uuid"), published_at__isnull=False
+                story_id=OuterRef("uuid"), published_at__lte=timezone.now()
             )
         )
     )
@@ -36,6 +38,15 @@ def _story_isPublished(request: HttpRequest, search_obj: str) -> Q:
     return q
 
 
+def _chapter_isPublished(request: HttpRequest, search_obj: str) -> Q:
+    q = Q(published_at__lte=timezone.now())
+
+    if not Bool.convertto(search_obj):
+        q = ~q
+
+    return q
+
+
 def _story_tag(request: HttpRequest, search_obj: str) -> Q:
     Story_tags = Story.tags.through
     return Q(
@@ -84,6 +95,9 @@ search_fns: dict[str, dict[str, Callable[[HttpRequest, str], Q]]] = {
             .values("story_id")
         ),
         "isPublished": _story_isPublished,
+        "wordCount": lambda request, search_obj: Q(
+            word_count__range=IntRange.convertto(search_obj)
+        ),
         "tag": _story_tag,
         "authorName": lambda request, search_obj: Q(
             author__username__icontains=search_obj
@@ -115,8 +129,9 @@ search_fns: dict[str, dict[str, Callable[[HttpRequest, str], Q]]] = {
         "publishedAt_delta": lambda request, search_obj: Q(
             published_at__range=DateTimeDeltaRange.convertto(search_obj)
         ),
-        "isPublished": lambda request, search_obj: Q(
-            published_at__isnull=not Bool.convertto(search_obj)
+        "isPublished": _chapter_isPublished,
+        "wordCount": lambda request, search_obj: Q(
+            word_count__range=IntRange.convertto(search_obj)
         ),
     },
     "category": {
@@ -142,7 +157,7 @@ if connection.vendor == "postgresql":  # pragma: no cover
     def _story_storyText(request: HttpRequest, search_obj: str) -> Q:
         return Q(
             uuid__in=Chapter.annotate_search_vectors(Chapter.objects.all())
-            .filter(published_at__isnull=False, markdown_search_vector=search_obj)
+            .filter(published_at__lte=timezone.now(), markdown_search_vector=search_obj)
             .values("story_id")
         )
 
@@ -158,7 +173,7 @@ else:
     def _story_storyText(request: HttpRequest, search_obj: str) -> Q:
         return Q(
             uuid__in=Chapter.objects.filter(
-                published_at__isnull=False, markdown__icontains=search_obj
+                published_at__lte=timezone.now(), markdown__icontains=search_obj
             ).values("story_id")
         )
 
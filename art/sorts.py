@@ -1,18 +1,40 @@
-from query_utils.sort import DefaultDescriptor, SortConfig, standard_sort
+from django.db.models.functions import Left
+
+from art.models import STORY_TITLE_SORT_LENGTH
+from query_utils.sort import (
+    DefaultDescriptor,
+    SortConfig,
+    expression_sort,
+    standard_sort,
+)
 
 sort_configs: dict[str, dict[str, SortConfig]] = {
     "story": {
-        "uuid": SortConfig([standard_sort("uuid")], DefaultDescriptor(0, "ASC")),
-        "title": SortConfig([standard_sort("title")], None),
+        "uuid": SortConfig(
+            [standard_sort("uuid")], DefaultDescriptor(0, "ASC", follows_sort=True)
+        ),
+        "title": SortConfig(
+            [expression_sort(Left("title", STORY_TITLE_SORT_LENGTH))], None
+        ),
         "synopsis": SortConfig([standard_sort("synopsis")], None),
         "author": SortConfig([standard_sort("author__username")], None),
+        "createdAt": SortConfig([standard_sort("created_at")], None),
+        "publishedAt": SortConfig([standard_sort("first_published_at")], None),
+        "lastUpdated": SortConfig([standard_sort("last_published_at")], None),
+        "chapterCount": SortConfig([standard_sort("chapter_count")], None),
+        "favorites": SortConfig([standard_sort("favorite_count")], None),
+        "trending": SortConfig([standard_sort("trending_score")], None),
+        "wordCount": SortConfig([standard_sort("word_count")], None),
     },
     "chapter": {
-        "uuid": SortConfig([standard_sort("uuid")], DefaultDescriptor(0, "ASC")),
+        "uuid": SortConfig(
+            [standard_sort("uuid")], DefaultDescriptor(0, "ASC", follows_sort=True)
+        ),
         "name": SortConfig([standard_sort("name")], None),
         "synopsis": SortConfig([standard_sort("synopsis")], None),
         "createdAt": SortConfig([standard_sort("created_at")], None),
         "publishedAt": SortConfig([standard_sort("published_at")], None),
+        "wordCount": SortConfig([standard_sort("word_count")], None),
     },
     "category": {
         "sortKey": SortConfig([standard_sort("sort_key")], DefaultDescriptor(0, "ASC")),
@@ -0,0 +1,155 @@
+import uuid
+
+from django.conf import settings
+from django.contrib import admin
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from app_admin.models import User
+from art.admin import StoryReportAdmin
+from art.models import (
+    CHAPTER_SORT_KEY_GAP,
+    Category,
+    Chapter,
+    ReportKind,
+    Story,
+    StoryReport,
+)
+
+
+# not profiled, the profiles directory only exists in deployments
+@override_settings(
+    MIDDLEWARE=[m for m in settings.MIDDLEWARE if not m.startswith("silk.")]
+)
+class StoryAdminTestCase(TestCase):
+    def test_chapters_inline(self):
+        user = User.objects.create_superuser("admin", "admin@test.com", "P4ssw0rd!")
+        self.client.force_login(user)
+
+        category = Category.objects.create(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+        story = Story.objects.create(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+            next_chapter_sort_key=CHAPTER_SORT_KEY_GAP,
+            all_chapter_count=1,
+        )
+        chapter = Chapter.objects.create(
+            story=story,
+            name="Chapter 1",
+            sort_key=0,
+            markdown="Chapter Text",
+            published_at=timezone.now(),
+        )
+        Story.update_from_chapters(Story.objects.filter(uuid=story.uuid))
+
+        now = timezone.localtime()
+        response = self.client.post(
+            f"/admin/art/story/{story.uuid}/change/",
+            {
+                "uuid": story.uuid,
+                "title": story.title,
+                "synopsis": story.synopsis,
+                "author": user.pk,
+                "created_at_0": now.date().isoformat(),
+                "created_at_1": now.time().strftime("%H:%M:%S"),
+                "category": category.pk,
+                "favorite_count": 0,
+                "trending_score": 0.0,
+                "read_count": 0,
+                "chapters-TOTAL_FORMS": 2,
+                "chapters-INITIAL_FORMS": 1,
+                "chapters-0-uuid": chapter.uuid,
+                "chapters-0-story": story.uuid,
+                "chapters-0-name": "Chapter 1",
+                "chapters-0-markdown": "Edited Chapter Text",
+                "chapters-0-created_at_0": now.date().isoformat(),
+                "chapters-0-created_at_1": now.time().strftime("%H:%M:%S"),
+                "chapters-0-published_at_0": now.date().isoformat(),
+                "chapters-0-published_at_1": "00:00:00",
+                "chapters-0-read_count": 0,
+                "chapters-1-uuid": uuid.uuid4(),
+                "chapters-1-story": story.uuid,
+                "chapters-1-name": "Chapter 2",
+                "chapters-1-markdown": "More Chapter Text",
+                "chapters-1-created_at_0": now.date().isoformat(),
+                "chapters-1-created_at_1": now.time().strftime("%H:%M:%S"),
+                "chapters-1-published_at_0": now.date().isoformat(),
+                "chapters-1-published_at_1": "00:00:00",
+                "chapters-1-read_count": 0,
+            },
+        )
+        self.assertEqual(response.status_code, 302, response.content)
+
+        # appended after the existing chapter, with every aggregate following
+        self.assertEqual(
+            list(
+                Chapter.objects.filter(story=story)
+                .order_by("sort_key")
+                .values_list("name", "sort_key", "word_count")
+            ),
+            [("Chapter 1", 0, 3), ("Chapter 2", CHAPTER_SORT_KEY_GAP, 3)],
+        )
+        story.refresh_from_db()
+        self.assertEqual(story.word_count, 6)
+        self.assertEqual(story.chapter_count, 2)
+        self.assertEqual(story.all_chapter_count, 2)
+        self.assertEqual(story.next_chapter_sort_key, 2 * CHAPTER_SORT_KEY_GAP)
+
+    def test_reported_stories(self):
+        user = User.objects.create_superuser("admin", "admin@test.com", "P4ssw0rd!")
+        self.client.force_login(user)
+
+        category = Category.objects.create(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+        stories = [
+            Story.objects.create(
+                title=f"Test Story {i}",
+                synopsis="Test Story Synopsis",
+                author=user,
+                category=category,
+            )
+            for i in range(3)
+        ]
+        submitters = [
+            User.objects.create_user(f"user{i}", f"test{i}@test.com", None)
+            for i in range(2)
+        ]
+        for story, kinds in zip(stories, ((ReportKind.OTHER,), (ReportKind.DMCA,), ())):
+            for submitter, kind in zip(submitters, kinds):
+                StoryReport.objects.create(
+                    story=story, kind=kind, details="reported", submitter=submitter
+                )
+        StoryReport.objects.create(
+            story=stories[0],
+            kind=ReportKind.ABUSE,
+            details="reported",
+            submitter=submitters[1],
+        )
+        Story.update_report_counts(Story.objects.all())
+
+        response = self.client.get("/admin/art/reportedstory/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [s.uuid for s in response.context["cl"].result_list],
+            [stories[0].uuid, stories[1].uuid],
+        )
+
+        response = self.client.get(
+            "/admin/art/reportedstory/", {"kind": ReportKind.DMCA}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [s.uuid for s in response.context["cl"].result_list], [stories[1].uuid]
+        )
+
+        # deleting reports through the admin keeps the counts
+        StoryReportAdmin(StoryReport, admin.site).delete_queryset(
+            None, StoryReport.objects.filter(story=stories[0])
+        )
+        stories[0].refresh_from_db()
+        self.assertEqual(stories[0].report_count, 0)
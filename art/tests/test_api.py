@@ -1,9 +1,13 @@
+import asyncio
 import datetime
+import io
 from typing import Any, Dict
 import uuid
 from unittest.mock import Mock
 
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase, modify_settings
 from django.utils import timezone
 from ninja.testing import TestAsyncClient as TestAsyncClient_
 from ninja.testing.client import NinjaResponse
@@ -11,7 +15,20 @@ from django.contrib.sessions.backends.cache import SessionStore
 
 from app_admin.models import User
 from art.api import router
-from art.models import Category, Chapter, Story, Tag
+from art.caching import surrogate_keys_purged
+from art.read_counts import aflush_read_counts, flush_read_counts
+from art.models import (
+    CHAPTER_SORT_KEY_GAP,
+    Category,
+    Chapter,
+    ChapterReport,
+    Favorite,
+    FavoriteCountDelta,
+    ReportKind,
+    Story,
+    StoryReport,
+    Tag,
+)
 
 
 class TestAsyncClient(TestAsyncClient_):
@@ -34,6 +51,12 @@ class TestAsyncClient(TestAsyncClient_):
 
 
 class ApiTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        # pending reads must not outlive the test database
+        self.addCleanup(flush_read_counts)
+
     async def test_list_stories(self):
         test_client = TestAsyncClient(router)
 
@@ -128,6 +151,10 @@ class ApiTestCase(TestCase):
                 "tags": [],
                 "author": str(user.uuid),
                 "category": category.name,
+                "favoriteCount": 0,
+                "readCount": 0,
+                "wordCount": 0,
+                "readingTime": 0,
             },
         )
 
@@ -135,7 +162,7 @@ class ApiTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=timezone.now(),
         )
@@ -155,6 +182,10 @@ class ApiTestCase(TestCase):
                 "tags": [],
                 "author": str(user.uuid),
                 "category": category.name,
+                "favoriteCount": 0,
+                "readCount": 0,
+                "wordCount": 0,
+                "readingTime": 0,
             },
         )
 
@@ -502,6 +533,125 @@ class ApiTestCase(TestCase):
         response = await test_client.patch(f"/story/{story.uuid}", json={})
         self.assertEqual(response.status_code, 401, response.content)
 
+    async def test_publish_story(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+        alt_user = await User.objects.acreate_user("user2", "test2@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        chapters = [
+            await Chapter.objects.acreate(
+                story=story,
+                name=f"Chapter {i + 1}",
+                synopsis="",
+                sort_key=i,
+                markdown="Chapter Text",
+                published_at=None,
+            )
+            for i in range(4)
+        ]
+
+        async def visible_chapter_uuids() -> list[str]:
+            response = await test_client.get(f"/story/{story.uuid}/chapter")
+            if response.status_code == 404:
+                return []
+            self.assertEqual(response.status_code, 200, response.content)
+            return [c["uuid"] for c in response.json()["items"]]
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/publish",
+            json={"startIndex": 1, "endIndex": 3},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+        self.assertEqual(
+            await visible_chapter_uuids(), [str(c.uuid) for c in chapters[1:3]]
+        )
+
+        # already live chapters keep their publication time
+        published_at = (await Chapter.objects.aget(uuid=chapters[1].uuid)).published_at
+        response = await test_client.post(
+            f"/story/{story.uuid}/publish",
+            json={"startIndex": 1},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+        self.assertEqual(
+            (await Chapter.objects.aget(uuid=chapters[1].uuid)).published_at,
+            published_at,
+        )
+        self.assertEqual(
+            await visible_chapter_uuids(), [str(c.uuid) for c in chapters[1:]]
+        )
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/unpublish", json={"endIndex": 3}, user=user
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+        self.assertEqual(await visible_chapter_uuids(), [str(chapters[3].uuid)])
+
+        # scheduled chapters stay hidden until their publication time
+        response = await test_client.post(
+            f"/story/{story.uuid}/publish",
+            json={
+                "publishedAt": (
+                    timezone.now() + datetime.timedelta(days=1)
+                ).isoformat(),
+                "endIndex": 1,
+            },
+            user=user,
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+        self.assertEqual(await visible_chapter_uuids(), [str(chapters[3].uuid)])
+
+        await Chapter.objects.filter(uuid=chapters[0].uuid).aupdate(
+            published_at=(timezone.now() - datetime.timedelta(seconds=1))
+        )
+        self.assertEqual(
+            await visible_chapter_uuids(),
+            [str(chapters[0].uuid), str(chapters[3].uuid)],
+        )
+
+        response = await test_client.patch(
+            f"/story/{story.uuid}", json={"published": False}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIsNone(response.json()["publishedAt"])
+        self.assertEqual(await visible_chapter_uuids(), [])
+
+        response = await test_client.patch(
+            f"/story/{story.uuid}", json={"published": True}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIsNotNone(response.json()["publishedAt"])
+        self.assertEqual(await visible_chapter_uuids(), [str(c.uuid) for c in chapters])
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/unpublish", json={}, user=alt_user
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.post(
+            f"/story/{uuid.UUID(int=0)}/publish", json={}, user=user
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/publish", json={"startIndex": -1}, user=user
+        )
+        self.assertEqual(response.status_code, 422, response.content)
+
     async def test_delete_story(self):
         test_client = TestAsyncClient(router)
 
@@ -548,6 +698,268 @@ class ApiTestCase(TestCase):
         response = await test_client.delete(f"/story/{story.uuid}")
         self.assertEqual(response.status_code, 401, response.content)
 
+    async def test_favorites(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+        alt_user = await User.objects.acreate_user("user2", "test2@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story1 = await Story.objects.acreate(
+            title="Test Story 1",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+        story2 = await Story.objects.acreate(
+            title="Test Story 2",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        response = await test_client.post(
+            f"/story/{story1.uuid}/favorite", user=alt_user
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+        for story in (story1, story2):
+            await Chapter.objects.acreate(
+                story=story,
+                name="Chapter 1",
+                synopsis="",
+                sort_key=0,
+                markdown="Chapter Text",
+                published_at=timezone.now(),
+            )
+
+        for _ in range(2):
+            response = await test_client.post(
+                f"/story/{story2.uuid}/favorite", user=alt_user
+            )
+            self.assertEqual(response.status_code, 204, response.content)
+        response = await test_client.post(f"/story/{story2.uuid}/favorite", user=user)
+        self.assertEqual(response.status_code, 204, response.content)
+        response = await test_client.post(f"/story/{story1.uuid}/favorite", user=user)
+        self.assertEqual(response.status_code, 204, response.content)
+
+        response = await test_client.get("/favorite", user=alt_user)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [s["uuid"] for s in response.json()["items"]], [str(story2.uuid)]
+        )
+
+        self.assertEqual(await FavoriteCountDelta.objects.acount(), 3)
+
+        await sync_to_async(call_command)("rollupfavorites", stderr=io.StringIO())
+
+        self.assertEqual(await FavoriteCountDelta.objects.acount(), 0)
+
+        response = await test_client.get(f"/story/{story2.uuid}")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["favoriteCount"], 2)
+
+        response = await test_client.get("/story?sort=favorites:DESC,title:ASC")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [s["uuid"] for s in response.json()["items"]],
+            [str(story2.uuid), str(story1.uuid)],
+        )
+
+        for _ in range(2):
+            response = await test_client.delete(
+                f"/story/{story2.uuid}/favorite", user=user
+            )
+            self.assertEqual(response.status_code, 204, response.content)
+
+        await sync_to_async(call_command)("rollupfavorites", stderr=io.StringIO())
+
+        await story2.arefresh_from_db(fields=("favorite_count",))
+        self.assertEqual(story2.favorite_count, 1)
+
+        response = await test_client.get("/favorite", user=user)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [s["uuid"] for s in response.json()["items"]], [str(story1.uuid)]
+        )
+
+    async def test_reports(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+        alt_user = await User.objects.acreate_user("user2", "test2@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        chapter = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="Chapter Text",
+            published_at=None,
+        )
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/report",
+            json={"kind": ReportKind.ABUSE, "details": "abusive"},
+            user=alt_user,
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.post(
+            f"/chapter/{chapter.uuid}/report",
+            json={"kind": ReportKind.ABUSE, "details": "abusive"},
+            user=alt_user,
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+        chapter.published_at = timezone.now()
+        await chapter.asave(update_fields=("published_at",))
+
+        for kind in (ReportKind.ABUSE, ReportKind.DMCA):
+            response = await test_client.post(
+                f"/story/{story.uuid}/report",
+                json={"kind": kind, "details": "reported"},
+                user=alt_user,
+            )
+            self.assertEqual(response.status_code, 204, response.content)
+
+            response = await test_client.post(
+                f"/chapter/{chapter.uuid}/report",
+                json={"kind": kind, "details": "reported"},
+                user=alt_user,
+            )
+            self.assertEqual(response.status_code, 204, response.content)
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/report",
+            json={"kind": ReportKind.OTHER, "details": "other"},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+
+        self.assertEqual(
+            [
+                (r.submitter_id, r.kind)
+                async for r in StoryReport.objects.filter(story=story).order_by("kind")
+            ],
+            [(user.uuid, ReportKind.OTHER), (alt_user.uuid, ReportKind.DMCA)],
+        )
+        self.assertEqual(
+            [
+                (r.submitter_id, r.kind)
+                async for r in ChapterReport.objects.filter(chapter=chapter)
+            ],
+            [(alt_user.uuid, ReportKind.DMCA)],
+        )
+
+        # the replaced report no longer counts
+        await story.arefresh_from_db(fields=("report_count", "report_kind"))
+        self.assertEqual((story.report_count, story.report_kind), (2, ReportKind.DMCA))
+        await chapter.arefresh_from_db(fields=("report_count", "report_kind"))
+        self.assertEqual(
+            (chapter.report_count, chapter.report_kind), (1, ReportKind.DMCA)
+        )
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/report",
+            json={"kind": 100, "details": "invalid"},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 422, response.content)
+
+        while True:
+            response = await test_client.post(
+                f"/chapter/{chapter.uuid}/report",
+                json={"kind": ReportKind.OTHER, "details": "spam"},
+                user=alt_user,
+            )
+            if response.status_code != 204:
+                break
+
+        self.assertEqual(response.status_code, 429, response.content)
+
+    async def test_trending(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+        alt_user = await User.objects.acreate_user("user2", "test2@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        now = timezone.now()
+
+        stories: list[Story] = []
+        for i, published_at in enumerate(
+            (
+                now - datetime.timedelta(days=30),
+                now - datetime.timedelta(hours=1),
+                now - datetime.timedelta(days=30),
+            )
+        ):
+            story = await Story.objects.acreate(
+                title=f"Test Story {i + 1}",
+                synopsis="Test Story Synopsis",
+                author=user,
+                category=category,
+            )
+            await Chapter.objects.acreate(
+                story=story,
+                name="Chapter 1",
+                synopsis="",
+                sort_key=0,
+                markdown="Chapter Text",
+                published_at=published_at,
+            )
+            stories.append(story)
+
+        await Favorite.objects.acreate(story=stories[0], user=user)
+        await Favorite.objects.acreate(story=stories[0], user=alt_user)
+        await Favorite.objects.acreate(
+            story=stories[2], user=user, created_at=(now - datetime.timedelta(days=30))
+        )
+        # predates `created_at`
+        await Favorite.objects.acreate(story=stories[2], user=alt_user, created_at=None)
+
+        await sync_to_async(call_command)("computetrending", stderr=io.StringIO())
+
+        for story in stories:
+            await story.arefresh_from_db(fields=("trending_score",))
+        self.assertGreater(stories[1].trending_score, stories[0].trending_score)
+        self.assertGreater(stories[0].trending_score, 0.0)
+        self.assertEqual(stories[2].trending_score, 0.0)
+
+        response = await test_client.get("/story?sort=trending:DESC")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [s["uuid"] for s in response.json()["items"]],
+            [str(stories[1].uuid), str(stories[0].uuid), str(stories[2].uuid)],
+        )
+
+        await Favorite.objects.all().adelete()
+        await Chapter.objects.all().aupdate(
+            published_at=(now - datetime.timedelta(days=30))
+        )
+
+        await sync_to_async(call_command)("computetrending", stderr=io.StringIO())
+
+        self.assertFalse(await Story.objects.exclude(trending_score=0.0).aexists())
+
     async def test_list_chapters(self):
         test_client = TestAsyncClient(router)
 
@@ -591,7 +1003,7 @@ class ApiTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=None,
         )
@@ -606,7 +1018,7 @@ class ApiTestCase(TestCase):
                     "items": [
                         {
                             "uuid": str(chapter1.uuid),
-                            "index": chapter1.index,
+                            "index": 0,
                             "name": chapter1.name,
                             "synopsis": chapter1.synopsis,
                         }
@@ -656,7 +1068,7 @@ class ApiTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 404, response.content)
 
-    async def test_chapter_details(self):
+    async def test_story_chapter_details(self):
         test_client = TestAsyncClient(router)
 
         user = await User.objects.acreate_user("user1", "test@test.com", None)
@@ -677,67 +1089,807 @@ class ApiTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
-            markdown="Chapter Text",
+            sort_key=0,
+            markdown="Chapter 1 Text",
+            published_at=timezone.now(),
+        )
+        chapter2 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 2",
+            synopsis="",
+            sort_key=1,
+            markdown="Chapter 2 Text",
             published_at=None,
         )
+        chapter3 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 3",
+            synopsis="",
+            sort_key=2,
+            markdown="Chapter 3 Text",
+            published_at=timezone.now(),
+        )
 
-        def assert_valid_response(response: NinjaResponse):
-            json_ = response.json()
-            self.assertIsInstance(json_, dict)
-            assert isinstance(json_, dict)
-            self.assertIn("createdAt", json_)
-            self.assertIsInstance(json_["createdAt"], str)
-            datetime.datetime.fromisoformat(json_["createdAt"])
-            json_.pop("createdAt")
-            self.assertIn("publishedAt", json_)
-            if (pa := json_["publishedAt"]) is None:
-                pass
-            elif isinstance(pa, str):
-                datetime.datetime.fromisoformat(pa)
-            else:
-                raise AssertionError("publishedAt is not null nor string")
-            json_.pop("publishedAt")
-            self.assertEqual(
-                json_,
-                {
-                    "uuid": str(chapter1.uuid),
-                    "index": chapter1.index,
-                    "name": chapter1.name,
-                    "markdown": chapter1.markdown,
-                    "synopsis": chapter1.synopsis,
-                    "story": str(story.uuid),
-                },
-            )
+        response = await test_client.get(f"/story/{story.uuid}/chapter/1", user=user)
+        self.assertEqual(response.status_code, 200, response.content)
+        json_ = response.json()
+        self.assertEqual(json_["uuid"], str(chapter2.uuid))
+        self.assertEqual(json_["previousChapter"], str(chapter1.uuid))
+        self.assertEqual(json_["nextChapter"], str(chapter3.uuid))
+        self.assertEqual(json_["chapterCount"], 3)
 
-        response = await test_client.get(f"/chapter/{chapter1.uuid}")
+        response = await test_client.get(f"/story/{story.uuid}/chapter/0")
+        self.assertEqual(response.status_code, 200, response.content)
+        json_ = response.json()
+        self.assertEqual(json_["uuid"], str(chapter1.uuid))
+        self.assertIsNone(json_["previousChapter"])
+        self.assertEqual(json_["nextChapter"], str(chapter3.uuid))
+        self.assertEqual(json_["chapterCount"], 2)
+
+        response = await test_client.get(
+            f"/story/{story.uuid}/chapter/1", user=alt_user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        json_ = response.json()
+        self.assertEqual(json_["uuid"], str(chapter3.uuid))
+        self.assertEqual(json_["previousChapter"], str(chapter1.uuid))
+        self.assertIsNone(json_["nextChapter"])
+        self.assertEqual(json_["chapterCount"], 2)
+
+        response = await test_client.get(f"/story/{story.uuid}/chapter/2")
         self.assertEqual(response.status_code, 404, response.content)
 
-        response = await test_client.get(f"/chapter/{chapter1.uuid}", user=alt_user)
+        response = await test_client.get(f"/story/{story.uuid}/chapter/-1")
         self.assertEqual(response.status_code, 404, response.content)
 
-        response = await test_client.get(f"/chapter/{chapter1.uuid}", user=user)
-        self.assertEqual(response.status_code, 200, response.content)
+    async def test_story_bundle(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+        alt_user = await User.objects.acreate_user("user2", "test2@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        response = await test_client.get(f"/story/{story.uuid}/bundle")
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.get(f"/story/{story.uuid}/bundle", user=user)
+        self.assertEqual(response.status_code, 200, response.content)
+        json_ = response.json()
+        self.assertEqual(json_["story"]["uuid"], str(story.uuid))
+        self.assertEqual(json_["chapters"], [])
+        self.assertIsNone(json_["chapter"])
+
+        for chapter_num in (0, 1):
+            response = await test_client.get(
+                f"/story/{story.uuid}/bundle?chapterNum={chapter_num}", user=user
+            )
+            self.assertEqual(response.status_code, 404, response.content)
+
+        chapter1 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="Chapter 1 Text",
+            published_at=timezone.now(),
+        )
+        chapter2 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 2",
+            synopsis="",
+            sort_key=1,
+            markdown="Chapter 2 Text",
+            published_at=None,
+        )
+
+        response = await test_client.get(
+            f"/story/{story.uuid}/bundle?chapterNum=1", user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        json_ = response.json()
+        self.assertEqual(json_["story"]["uuid"], str(story.uuid))
+        self.assertEqual(
+            json_["chapters"],
+            [
+                {
+                    "uuid": str(chapter1.uuid),
+                    "index": 0,
+                    "name": "Chapter 1",
+                    "synopsis": "",
+                },
+                {
+                    "uuid": str(chapter2.uuid),
+                    "index": 1,
+                    "name": "Chapter 2",
+                    "synopsis": "",
+                },
+            ],
+        )
+        self.assertEqual(json_["chapter"]["uuid"], str(chapter2.uuid))
+        self.assertEqual(json_["chapter"]["markdown"], "Chapter 2 Text")
+        self.assertEqual(json_["chapter"]["previousChapter"], str(chapter1.uuid))
+        self.assertIsNone(json_["chapter"]["nextChapter"])
+        self.assertEqual(json_["chapter"]["chapterCount"], 2)
+
+        response = await test_client.get(f"/story/{story.uuid}/bundle", user=alt_user)
+        self.assertEqual(response.status_code, 200, response.content)
+        json_ = response.json()
+        self.assertEqual(len(json_["chapters"]), 1)
+        self.assertEqual(json_["chapter"]["uuid"], str(chapter1.uuid))
+        self.assertIsNone(json_["chapter"]["nextChapter"])
+        self.assertEqual(json_["chapter"]["chapterCount"], 1)
+
+        response = await test_client.get(
+            f"/story/{story.uuid}/bundle?chapterNum=1", user=alt_user
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+    async def test_chapter_details(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+        alt_user = await User.objects.acreate_user("user2", "test2@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        chapter1 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="Chapter Text",
+            published_at=None,
+        )
+
+        def assert_valid_response(response: NinjaResponse):
+            json_ = response.json()
+            self.assertIsInstance(json_, dict)
+            assert isinstance(json_, dict)
+            self.assertIn("createdAt", json_)
+            self.assertIsInstance(json_["createdAt"], str)
+            datetime.datetime.fromisoformat(json_["createdAt"])
+            json_.pop("createdAt")
+            self.assertIn("publishedAt", json_)
+            if (pa := json_["publishedAt"]) is None:
+                pass
+            elif isinstance(pa, str):
+                datetime.datetime.fromisoformat(pa)
+            else:
+                raise AssertionError("publishedAt is not null nor string")
+            json_.pop("publishedAt")
+            self.assertIsInstance(json_.pop("readCount"), int)
+            self.assertEqual(
+                json_,
+                {
+                    "uuid": str(chapter1.uuid),
+                    "index": 0,
+                    "name": chapter1.name,
+                    "markdown": chapter1.markdown,
+                    "synopsis": chapter1.synopsis,
+                    "story": str(story.uuid),
+                    "wordCount": 0,
+                    "readingTime": 0,
+                    "html": None,
+                },
+            )
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}")
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}", user=alt_user)
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}", user=user)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        assert_valid_response(response)
+
+        chapter1.published_at = timezone.now()
+        await chapter1.asave(update_fields=("published_at",))
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}")
+        self.assertEqual(response.status_code, 200, response.content)
+
+        assert_valid_response(response)
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}", user=alt_user)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        assert_valid_response(response)
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}", user=user)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        assert_valid_response(response)
+
+    async def test_read_counts(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        chapter1 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="Chapter Text",
+            published_at=timezone.now(),
+        )
+        chapter2 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 2",
+            synopsis="",
+            sort_key=1,
+            markdown="Chapter Text",
+            published_at=timezone.now(),
+        )
+
+        await aflush_read_counts()
+
+        # cached reads aren't counted
+        response = await test_client.get(f"/chapter/{chapter1.uuid}")
+        self.assertEqual(response.status_code, 200, response.content)
+
+        for chapter in (chapter1, chapter1, chapter1, chapter2, chapter1):
+            response = await test_client.post(f"/chapter/{chapter.uuid}/read")
+            self.assertEqual(response.status_code, 204, response.content)
+            self.assertIn("no-store", response["Cache-Control"])
+
+        response = await test_client.post(f"/chapter/{uuid.uuid4()}/read")
+        self.assertEqual(response.status_code, 404, response.content)
+
+        await aflush_read_counts()
+
+        await story.arefresh_from_db(fields=("read_count",))
+        self.assertEqual(story.read_count, 5)
+
+        await chapter1.arefresh_from_db(fields=("read_count",))
+        self.assertEqual(chapter1.read_count, 4)
+
+        await chapter2.arefresh_from_db(fields=("read_count",))
+        self.assertEqual(chapter2.read_count, 1)
+
+        response = await test_client.get(f"/story/{story.uuid}")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["readCount"], 5)
+
+        response = await test_client.get(f"/chapter/{chapter2.uuid}")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["readCount"], 1)
+
+    async def test_word_counts(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story1 = await Story.objects.acreate(
+            title="Test Story 1",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+        story2 = await Story.objects.acreate(
+            title="Test Story 2",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        response = await test_client.post(
+            f"/story/{story1.uuid}/chapter",
+            json={"name": "Chapter 1", "synopsis": "", "markdown": "one two three"},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        chapter1_uuid = response.json()["uuid"]
+
+        response = await test_client.post(
+            f"/story/{story1.uuid}/chapter/bulk",
+            json=[
+                {"name": "Chapter 2", "synopsis": "", "markdown": "four five"},
+                {"name": "Chapter 3", "synopsis": "", "markdown": "six"},
+            ],
+            user=user,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        chapter3_uuid = response.json()[1]["uuid"]
+
+        # only live chapters are counted
+        await story1.arefresh_from_db(fields=("word_count",))
+        self.assertEqual(story1.word_count, 0)
+
+        response = await test_client.post(
+            f"/story/{story1.uuid}/publish", json={}, user=user
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+
+        await story1.arefresh_from_db(fields=("word_count",))
+        self.assertEqual(story1.word_count, 6)
+
+        response = await test_client.patch(
+            f"/chapter/{chapter1_uuid}", json={"markdown": "one"}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = await test_client.delete(f"/chapter/{chapter3_uuid}", user=user)
+        self.assertEqual(response.status_code, 204, response.content)
+
+        response = await test_client.get(f"/chapter/{chapter1_uuid}", user=user)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["wordCount"], 1)
+        self.assertEqual(response.json()["readingTime"], 1)
+
+        response = await test_client.get(f"/story/{story1.uuid}", user=user)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["wordCount"], 3)
+
+        response = await test_client.get(
+            '/story?search=wordCount:"1|10"&sort=wordCount:DESC', user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [s["uuid"] for s in response.json()["items"]], [str(story1.uuid)]
+        )
+
+        await Chapter.objects.acreate(
+            story=story2,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="one two three four",
+            published_at=timezone.now(),
+        )
+        await Story.objects.filter(uuid=story1.uuid).aupdate(word_count=0)
+
+        await sync_to_async(call_command)(
+            "computewordcounts", "--batch-size=1", stderr=io.StringIO()
+        )
+
+        self.assertEqual(
+            [
+                s.word_count
+                async for s in Story.objects.filter(
+                    uuid__in=(story1.uuid, story2.uuid)
+                ).order_by("title")
+            ],
+            [3, 4],
+        )
+
+        # the chapter counters are repaired as well
+        await story2.arefresh_from_db(
+            fields=("all_chapter_count", "next_chapter_sort_key")
+        )
+        self.assertEqual(story2.all_chapter_count, 1)
+        self.assertEqual(story2.next_chapter_sort_key, CHAPTER_SORT_KEY_GAP)
+
+    async def test_chapter_aggregates(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter/bulk",
+            json=[
+                {"name": "Chapter 1", "synopsis": "", "markdown": "one"},
+                {"name": "Chapter 2", "synopsis": "", "markdown": "two three"},
+                {"name": "Chapter 3", "synopsis": "", "markdown": "four five six"},
+            ],
+            user=user,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        chapter_uuids = [c["uuid"] for c in response.json()]
+
+        published_ats: list[datetime.datetime] = []
+        for i in range(2):
+            published_ats.append(timezone.now())
+            response = await test_client.post(
+                f"/story/{story.uuid}/publish",
+                json={
+                    "startIndex": i,
+                    "endIndex": i + 1,
+                    "publishedAt": published_ats[-1].isoformat(),
+                },
+                user=user,
+            )
+            self.assertEqual(response.status_code, 204, response.content)
+
+        await story.arefresh_from_db()
+        self.assertEqual(story.word_count, 3)
+        self.assertEqual(story.chapter_count, 2)
+        self.assertEqual(story.first_published_at, published_ats[0])
+        self.assertEqual(story.last_published_at, published_ats[1])
+
+        # unpublished chapters don't count
+        response = await test_client.patch(
+            f"/chapter/{chapter_uuids[2]}", json={"markdown": "four"}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = await test_client.patch(
+            f"/chapter/{chapter_uuids[1]}", json={"markdown": "two"}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        await story.arefresh_from_db()
+        self.assertEqual(story.word_count, 2)
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/unpublish",
+            json={"startIndex": 1, "endIndex": 2},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+
+        await story.arefresh_from_db()
+        self.assertEqual(story.word_count, 1)
+        self.assertEqual(story.chapter_count, 1)
+        self.assertEqual(story.first_published_at, published_ats[0])
+        self.assertEqual(story.last_published_at, published_ats[0])
+
+        response = await test_client.delete(f"/chapter/{chapter_uuids[0]}", user=user)
+        self.assertEqual(response.status_code, 204, response.content)
+
+        await story.arefresh_from_db()
+        self.assertEqual(story.word_count, 0)
+        self.assertEqual(story.chapter_count, 0)
+        self.assertIsNone(story.first_published_at)
+        self.assertIsNone(story.last_published_at)
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter",
+            json={"name": "Chapter 4", "synopsis": "", "markdown": "seven"},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["index"], 2)
+
+    async def test_release_chapters(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter",
+            json={"name": "Chapter 1", "synopsis": "", "markdown": "one two"},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        chapter_uuid = response.json()["uuid"]
+
+        published_at = timezone.now() + datetime.timedelta(days=1)
+        response = await test_client.post(
+            f"/story/{story.uuid}/publish",
+            json={"publishedAt": published_at.isoformat()},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+
+        # scheduled chapters are left out until they go live
+        await story.arefresh_from_db()
+        self.assertEqual(story.word_count, 0)
+        self.assertEqual(story.chapter_count, 0)
+        self.assertIsNone(story.first_published_at)
+        self.assertIsNone(story.last_published_at)
+
+        published_at = timezone.now() - datetime.timedelta(minutes=1)
+        await Chapter.objects.filter(uuid=chapter_uuid).aupdate(
+            published_at=published_at
+        )
+
+        # merged into the aggregates of chapters that were already counted
+        story2 = await Story.objects.acreate(
+            title="Test Story 2",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+        story2_published_ats = [
+            timezone.now() - datetime.timedelta(days=d) for d in (3, 2, 1)
+        ]
+        for i, published_at_ in enumerate(story2_published_ats):
+            await Chapter.objects.acreate(
+                story=story2,
+                name=f"Chapter {i + 1}",
+                synopsis="",
+                sort_key=i,
+                markdown="one two three",
+                word_count=3,
+                published_at=published_at_,
+                is_counted=(i == 1),
+            )
+        await Story.objects.filter(uuid=story2.uuid).aupdate(
+            word_count=3,
+            chapter_count=1,
+            first_published_at=story2_published_ats[1],
+            last_published_at=story2_published_ats[1],
+        )
+
+        stderr = io.StringIO()
+        await sync_to_async(call_command)(
+            "releasechapters", "--batch-size", "1", stderr=stderr
+        )
+        self.assertIn("released 3 chapters across 2 stories", stderr.getvalue())
+
+        await story.arefresh_from_db()
+        self.assertEqual(story.word_count, 2)
+        self.assertEqual(story.chapter_count, 1)
+        self.assertEqual(story.first_published_at, published_at)
+        self.assertEqual(story.last_published_at, published_at)
+
+        await story2.arefresh_from_db()
+        self.assertEqual(story2.word_count, 9)
+        self.assertEqual(story2.chapter_count, 3)
+        self.assertEqual(story2.first_published_at, story2_published_ats[0])
+        self.assertEqual(story2.last_published_at, story2_published_ats[2])
+
+        stderr = io.StringIO()
+        await sync_to_async(call_command)("releasechapters", stderr=stderr)
+        self.assertIn("released 0 chapters across 0 stories", stderr.getvalue())
+
+    async def test_story_sorts(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story1 = await Story.objects.acreate(
+            title="Test Story 1",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+        story2 = await Story.objects.acreate(
+            title="Test Story 2",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        for story, chapter_count in ((story1, 2), (story2, 1)):
+            for i in range(chapter_count):
+                response = await test_client.post(
+                    f"/story/{story.uuid}/chapter",
+                    json={"name": f"Chapter {i}", "synopsis": "", "markdown": "Text"},
+                    user=user,
+                )
+                self.assertEqual(response.status_code, 200, response.content)
+
+            response = await test_client.post(
+                f"/story/{story.uuid}/publish", json={}, user=user
+            )
+            self.assertEqual(response.status_code, 204, response.content)
+
+        for sort, expected_stories in (
+            ("chapterCount:DESC", [story1, story2]),
+            ("chapterCount:ASC", [story2, story1]),
+            ("publishedAt:DESC", [story2, story1]),
+            ("lastUpdated:DESC", [story2, story1]),
+            ("createdAt:ASC", [story1, story2]),
+        ):
+            with self.subTest(sort=sort):
+                response = await test_client.get(f"/story?sort={sort}")
+                self.assertEqual(response.status_code, 200, response.content)
+                self.assertEqual(
+                    [s["uuid"] for s in response.json()["items"]],
+                    [str(s.uuid) for s in expected_stories],
+                )
+
+        response = await test_client.post(
+            f"/story/{story1.uuid}/chapter",
+            json={"name": "Chapter 2", "synopsis": "", "markdown": "Text"},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = await test_client.post(
+            f"/story/{story1.uuid}/publish", json={}, user=user
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+
+        response = await test_client.get("/story?sort=lastUpdated:DESC")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [s["uuid"] for s in response.json()["items"]],
+            [str(story1.uuid), str(story2.uuid)],
+        )
+
+    async def test_chapter_details_html(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        chapter1 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="# Heading\n\n<script>alert(1)</script>*Text*",
+            published_at=timezone.now(),
+        )
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}?format=html")
+        self.assertEqual(response.status_code, 200, response.content)
+        json_ = response.json()
+        self.assertEqual(json_["markdown"], chapter1.markdown)
+        self.assertIn("<h1>Heading</h1>", json_["html"])
+        self.assertIn("<em>Text</em>", json_["html"])
+        self.assertNotIn("<script>", json_["html"])
+
+        response = await test_client.get(f"/story/{story.uuid}/chapter/0?format=html")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIn("<h1>Heading</h1>", response.json()["html"])
+
+        response = await test_client.patch(
+            f"/chapter/{chapter1.uuid}",
+            json={"markdown": "## Subheading"},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}?format=html")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["html"], "<h2>Subheading</h2>")
+
+        response = await test_client.get(f"/chapter/{chapter1.uuid}?format=pdf")
+        self.assertEqual(response.status_code, 422, response.content)
+
+    @modify_settings(MIDDLEWARE={"remove": ["silk.middleware.SilkyMiddleware"]})
+    async def test_chapter_markdown(self):
+        client = AsyncClient()
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
 
-        assert_valid_response(response)
+        markdown = "# Chapter 1\n\nCafé — naïve text"
+        markdown_bytes = markdown.encode()
+        chapter1 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown=markdown,
+            published_at=None,
+        )
 
-        chapter1.published_at = timezone.now()
-        await chapter1.asave(update_fields=("published_at",))
+        async def get(**headers: str):
+            response = await client.get(
+                f"/api/art/chapter/{chapter1.uuid}/markdown", headers=headers
+            )
+            content = (
+                b"".join([c async for c in response.streaming_content])
+                if response.streaming
+                else response.content
+            )
+            return response, content
 
-        response = await test_client.get(f"/chapter/{chapter1.uuid}")
-        self.assertEqual(response.status_code, 200, response.content)
+        response, _ = await get()
+        self.assertEqual(response.status_code, 404)
 
-        assert_valid_response(response)
+        await client.aforce_login(user)
 
-        response = await test_client.get(f"/chapter/{chapter1.uuid}", user=alt_user)
-        self.assertEqual(response.status_code, 200, response.content)
+        with self.settings(CHAPTER_MARKDOWN_CHUNK_SIZE=4):
+            response, content = await get()
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(content, markdown_bytes)
+            self.assertEqual(response["Content-Length"], str(len(markdown_bytes)))
+            self.assertEqual(response["Accept-Ranges"], "bytes")
 
-        assert_valid_response(response)
+            response, content = await get(Range="bytes=2-10")
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(content, markdown_bytes[2:11])
+            self.assertEqual(
+                response["Content-Range"], f"bytes 2-10/{len(markdown_bytes)}"
+            )
 
-        response = await test_client.get(f"/chapter/{chapter1.uuid}", user=user)
-        self.assertEqual(response.status_code, 200, response.content)
+            response, content = await get(Range="bytes=15-")
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(content, markdown_bytes[15:])
 
-        assert_valid_response(response)
+            response, content = await get(Range="bytes=-5")
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(content, markdown_bytes[-5:])
+
+            response, content = await get(Range="bytes=0-1,4-5")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(content, markdown_bytes)
+
+            # invalid ranges are ignored, unlike unsatisfiable ones
+            response, content = await get(Range="bytes=5-2")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(content, markdown_bytes)
+
+            response, _ = await get(Range=f"bytes={len(markdown_bytes)}-")
+            self.assertEqual(response.status_code, 416)
+            self.assertEqual(
+                response["Content-Range"], f"bytes */{len(markdown_bytes)}"
+            )
+
+            # an edit mid-stream doesn't mix versions
+            response = await client.get(f"/api/art/chapter/{chapter1.uuid}/markdown")
+            self.assertEqual(response.status_code, 200)
+            await Chapter.objects.filter(uuid=chapter1.uuid).aupdate(markdown="edited")
+            content = b"".join([c async for c in response.streaming_content])
+            self.assertEqual(content, markdown_bytes)
 
     async def test_create_chapter(self):
         test_client = TestAsyncClient(router)
@@ -777,6 +1929,37 @@ class ApiTestCase(TestCase):
             },
         )
 
+        responses = await asyncio.gather(
+            *(
+                test_client.post(
+                    f"/story/{story.uuid}/chapter",
+                    json={
+                        "name": f"Chapter {i}",
+                        "synopsis": "Synopsis",
+                        "markdown": "Chapter Text",
+                    },
+                    user=user,
+                )
+                for i in range(2, 5)
+            )
+        )
+        for response in responses:
+            self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            sorted(response.json()["index"] for response in responses), [1, 2, 3]
+        )
+
+        sort_keys = [
+            sort_key
+            async for sort_key in Chapter.objects.filter(story=story).values_list(
+                "sort_key", flat=True
+            )
+        ]
+        self.assertEqual(len(frozenset(sort_keys)), 4)
+
+        await story.arefresh_from_db(fields=("next_chapter_sort_key",))
+        self.assertGreater(story.next_chapter_sort_key, max(sort_keys))
+
     async def test_create_chapter_invalid(self):
         test_client = TestAsyncClient(router)
 
@@ -839,6 +2022,98 @@ class ApiTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 404, response.content)
 
+    async def test_bulk_create_chapters(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+        alt_user = await User.objects.acreate_user("user2", "test2@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        input_json = [
+            {
+                "name": f"Chapter {i}",
+                "synopsis": "Synopsis",
+                "markdown": "Chapter Text",
+            }
+            for i in range(1, 4)
+        ]
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter/bulk", json=input_json, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        json_ = response.json()
+        for chapter_json in json_:
+            uuid.UUID(chapter_json.pop("uuid"))
+        self.assertEqual(
+            json_,
+            [
+                {
+                    "name": f"Chapter {i + 1}",
+                    "synopsis": "Synopsis",
+                    "index": i,
+                }
+                for i in range(3)
+            ],
+        )
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter/bulk", json=input_json[:1], user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()[0]["index"], 3)
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter/bulk",
+            json=[*input_json, {"name": "", "markdown": "Chapter Text"}],
+            user=user,
+        )
+        self.assertEqual(response.status_code, 422, response.content)
+
+        with self.settings(CHAPTER_BULK_CREATE_MAX_SIZE=2):
+            response = await test_client.post(
+                f"/story/{story.uuid}/chapter/bulk", json=input_json, user=user
+            )
+            self.assertEqual(response.status_code, 413, response.content)
+
+        with self.settings(CHAPTER_BULK_CREATE_MAX_BYTES=16):
+            response = await test_client.post(
+                f"/story/{story.uuid}/chapter/bulk", json=input_json, user=user
+            )
+            self.assertEqual(response.status_code, 413, response.content)
+
+        # rejected on the announced length alone
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter/bulk",
+            json=input_json,
+            headers={"Content-Length": str(10 * 1024 * 1024)},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 413, response.content)
+
+        self.assertEqual(await Chapter.objects.filter(story=story).acount(), 4)
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter/bulk", json=input_json, user=alt_user
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.post(
+            f"/story/{uuid.UUID(int=0)}/chapter/bulk", json=input_json, user=user
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
     async def test_patch_chapter(self):
         test_client = TestAsyncClient(router)
 
@@ -859,7 +2134,7 @@ class ApiTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=None,
         )
@@ -981,7 +2256,7 @@ class ApiTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=None,
         )
@@ -996,6 +2271,124 @@ class ApiTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 404, response.content)
 
+    async def test_move_chapter(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+            next_chapter_sort_key=3,
+        )
+
+        # adjacent sort keys leave no gap, so moving between them must rebalance
+        chapters = [
+            await Chapter.objects.acreate(
+                story=story,
+                name=f"Chapter {i + 1}",
+                synopsis="",
+                sort_key=i,
+                markdown="Chapter Text",
+                published_at=None,
+            )
+            for i in range(3)
+        ]
+
+        async def assert_order(expected_chapters: list[Chapter]):
+            response = await test_client.get(f"/story/{story.uuid}/chapter", user=user)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(
+                [(c["uuid"], c["index"]) for c in response.json()["items"]],
+                [(str(c.uuid), i) for i, c in enumerate(expected_chapters)],
+            )
+
+        response = await test_client.post(
+            f"/chapter/{chapters[2].uuid}/move", json={"index": 1}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["index"], 1)
+        await assert_order([chapters[0], chapters[2], chapters[1]])
+
+        response = await test_client.post(
+            f"/chapter/{chapters[1].uuid}/move", json={"index": 0}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["index"], 0)
+        await assert_order([chapters[1], chapters[0], chapters[2]])
+
+        response = await test_client.post(
+            f"/chapter/{chapters[1].uuid}/move", json={"index": 100}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["index"], 2)
+        await assert_order([chapters[0], chapters[2], chapters[1]])
+
+        # moving only ever writes the moved chapter
+        chapter0_sort_key = (await Chapter.objects.aget(uuid=chapters[0].uuid)).sort_key
+        response = await test_client.post(
+            f"/chapter/{chapters[2].uuid}/move", json={"index": 0}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            (await Chapter.objects.aget(uuid=chapters[0].uuid)).sort_key,
+            chapter0_sort_key,
+        )
+        await assert_order([chapters[2], chapters[0], chapters[1]])
+
+        response = await test_client.post(
+            f"/chapter/{chapters[0].uuid}/move", json={"index": -1}, user=user
+        )
+        self.assertEqual(response.status_code, 422, response.content)
+
+    async def test_move_chapter_notfound(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+        alt_user = await User.objects.acreate_user("user2", "test2@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        chapter = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="Chapter Text",
+            published_at=None,
+        )
+
+        response = await test_client.post(
+            f"/chapter/{chapter.uuid}/move", json={"index": 0}, user=alt_user
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.post(
+            f"/chapter/{uuid.UUID(int=0)}/move", json={"index": 0}, user=user
+        )
+        self.assertEqual(response.status_code, 404, response.content)
+
+        response = await test_client.post(
+            f"/chapter/{chapter.uuid}/move", json={"index": 0}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["index"], 0)
+
     async def test_delete_chapter(self):
         test_client = TestAsyncClient(router)
 
@@ -1010,13 +2403,14 @@ class ApiTestCase(TestCase):
             synopsis="Test Story Synopsis",
             author=user,
             category=category,
+            all_chapter_count=1,
         )
 
         chapter = await Chapter.objects.acreate(
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=None,
         )
@@ -1024,6 +2418,9 @@ class ApiTestCase(TestCase):
         response = await test_client.delete(f"/chapter/{chapter.uuid}", user=user)
         self.assertEqual(response.status_code, 204, response.content)
 
+        await story.arefresh_from_db(fields=("all_chapter_count",))
+        self.assertEqual(story.all_chapter_count, 0)
+
     async def test_delete_chapter_notfound(self):
         test_client = TestAsyncClient(router)
 
@@ -1045,7 +2442,7 @@ class ApiTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=None,
         )
@@ -1058,6 +2455,123 @@ class ApiTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 404, response.content)
 
+    async def test_cache_headers(self):
+        test_client = TestAsyncClient(router)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+        tag = await Tag.objects.acreate(name="tag", pretty_name="Tag")
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+        await story.tags.aset([tag])
+
+        chapter1 = await Chapter.objects.acreate(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="Chapter Text",
+            published_at=timezone.now(),
+        )
+
+        with self.settings(
+            PUBLIC_CACHE_MAX_AGE=60, PUBLIC_CACHE_STALE_WHILE_REVALIDATE=300
+        ):
+            response = await test_client.get("/story")
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(
+                response["Cache-Control"],
+                "public, max-age=60, stale-while-revalidate=300",
+            )
+            self.assertEqual(response["Vary"], "Authorization, Cookie")
+            self.assertEqual(response["Surrogate-Key"], "story-list")
+
+            response = await test_client.get(f"/story/{story.uuid}")
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(
+                response["Surrogate-Key"],
+                f"category:test story:{story.uuid} tag:tag",
+            )
+
+            response = await test_client.get(f"/chapter/{chapter1.uuid}")
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(
+                response["Surrogate-Key"],
+                f"chapter:{chapter1.uuid} story:{story.uuid}",
+            )
+
+            response = await test_client.get(f"/story/{story.uuid}", user=user)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(response["Cache-Control"], "private, no-cache")
+            self.assertFalse(response.has_header("Surrogate-Key"))
+
+    async def test_surrogate_key_purge(self):
+        test_client = TestAsyncClient(router)
+
+        purged_keys: list[frozenset[str]] = []
+
+        async def purge_receiver(sender: Any, keys: frozenset[str], **kwargs: Any):
+            purged_keys.append(keys)
+
+        surrogate_keys_purged.connect(purge_receiver)
+        self.addCleanup(surrogate_keys_purged.disconnect, purge_receiver)
+
+        user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+        category = await Category.objects.acreate(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = await Story.objects.acreate(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        response = await test_client.patch(
+            f"/story/{story.uuid}", json={"title": "New Title"}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            purged_keys.pop(), frozenset({"story-list", f"story:{story.uuid}"})
+        )
+
+        response = await test_client.post(
+            f"/story/{story.uuid}/chapter",
+            json={"name": "Chapter 1", "synopsis": "", "markdown": "Text"},
+            user=user,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        chapter_uuid = response.json()["uuid"]
+        self.assertEqual(
+            purged_keys.pop(), frozenset({"story-list", f"story:{story.uuid}"})
+        )
+
+        response = await test_client.patch(
+            f"/chapter/{chapter_uuid}", json={"markdown": "New Text"}, user=user
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            purged_keys.pop(),
+            frozenset({"story-list", f"story:{story.uuid}", f"chapter:{chapter_uuid}"}),
+        )
+
+        response = await test_client.delete(f"/chapter/{chapter_uuid}", user=user)
+        self.assertEqual(response.status_code, 204, response.content)
+        self.assertEqual(
+            purged_keys.pop(),
+            frozenset({"story-list", f"story:{story.uuid}", f"chapter:{chapter_uuid}"}),
+        )
+
     async def test_list_categories(self):
         test_client = TestAsyncClient(router)
 
@@ -0,0 +1,44 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase
+
+from art.caching import apurge_surrogate_keys
+
+
+class SurrogateKeyPurgeTestCase(SimpleTestCase):
+    async def test_posted_in_background(self):
+        purged_keys: list[list[str]] = []
+        posted = threading.Event()
+        release = threading.Event()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", "0"))
+                purged_keys.append(json.loads(self.rfile.read(length))["keys"])
+                # held until the purge has been asserted not to wait on it
+                release.wait(5.0)
+                self.send_response(204)
+                self.end_headers()
+                posted.set()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(release.set)
+
+        with self.settings(
+            SURROGATE_KEY_PURGE_URL=f"http://127.0.0.1:{server.server_port}/"
+        ):
+            await apurge_surrogate_keys(("story-list", "story:1"))
+            self.assertFalse(posted.is_set())
+
+            release.set()
+            self.assertTrue(posted.wait(5.0))
+
+        self.assertEqual(purged_keys, [["story-list", "story:1"]])
@@ -0,0 +1,180 @@
+import datetime
+import gzip
+import io
+import os
+import tempfile
+import unittest
+from typing import Any
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from app_admin.models import User
+from art.models import Category, Chapter, Favorite, Story, Tag, count_words
+
+try:
+    from compression import zstd  # type: ignore[import-not-found]
+except ImportError:
+    try:
+        import zstandard as zstd  # type: ignore[import-not-found,no-redef]
+    except ImportError:
+        zstd = None
+
+
+_STORY_FIELDS = (
+    "uuid",
+    "title",
+    "synopsis",
+    "author_id",
+    "category_id",
+    "created_at",
+    "is_nsfw",
+    "favorite_count",
+    "read_count",
+    "word_count",
+    "chapter_count",
+    "first_published_at",
+    "last_published_at",
+    "all_chapter_count",
+)
+_CHAPTER_FIELDS = (
+    "uuid",
+    "story_id",
+    "name",
+    "synopsis",
+    "markdown",
+    "created_at",
+    "published_at",
+    "read_count",
+    "word_count",
+    "is_counted",
+)
+
+
+class DumpStoriesTestCase(TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        user = User.objects.create_user("user1", "test@test.com", None)
+
+        category = Category.objects.create(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+        tag = Tag.objects.create(name="tag_1", pretty_name="Tag 1")
+
+        now = timezone.now()
+
+        story = Story.objects.create(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+            created_at=(now - datetime.timedelta(days=2)),
+            is_nsfw=True,
+            favorite_count=3,
+            trending_score=1.5,
+            read_count=7,
+        )
+        story.tags.set((tag,))
+
+        for i, created_at in enumerate((now - datetime.timedelta(hours=1), None, now)):
+            Favorite.objects.create(
+                story=story,
+                user=(
+                    User.objects.create_user(f"fan{i}", f"fan{i}@test.com", None)
+                    if i > 0
+                    else user
+                ),
+                created_at=created_at,
+            )
+
+        for i, published_at in enumerate(
+            (now - datetime.timedelta(days=1), now + datetime.timedelta(days=1), None)
+        ):
+            Chapter.objects.create(
+                story=story,
+                name=f"Chapter {i + 1}",
+                synopsis="",
+                sort_key=i,
+                markdown="Café — naïve text",
+                word_count=count_words("Café — naïve text"),
+                created_at=(now - datetime.timedelta(days=2)),
+                published_at=published_at,
+                read_count=i,
+            )
+        Story.update_from_chapters(Story.objects.all())
+        Story.objects.update(all_chapter_count=3)
+
+    def _dump_and_load(self, compression: str, read: Any) -> None:
+        stories = list(Story.objects.order_by("uuid").values(*_STORY_FIELDS))
+        chapters = list(Chapter.objects.order_by("sort_key").values(*_CHAPTER_FIELDS))
+        tags = list(Story.tags.through.objects.values_list("story_id", "tag_id"))
+        favorites = list(
+            Favorite.objects.order_by("user_id").values_list(
+                "story_id", "user_id", "created_at"
+            )
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "stories.ndjson")
+            call_command("dumpstories", "--output", path, "--compression", compression)
+            with read(path) as f:
+                ndjson = f.read().decode()
+
+        Story.objects.all().delete()
+
+        with patch("sys.stdin", io.StringIO(ndjson)):
+            call_command("loadstories", "--ndjson", "user1", "test")
+
+        self.assertEqual(
+            list(Story.objects.order_by("uuid").values(*_STORY_FIELDS)), stories
+        )
+        self.assertEqual(
+            list(Chapter.objects.order_by("sort_key").values(*_CHAPTER_FIELDS)),
+            chapters,
+        )
+        self.assertEqual(
+            list(Story.tags.through.objects.values_list("story_id", "tag_id")), tags
+        )
+        self.assertEqual(
+            list(
+                Favorite.objects.order_by("user_id").values_list(
+                    "story_id", "user_id", "created_at"
+                )
+            ),
+            favorites,
+        )
+        # left for `computetrending`
+        self.assertEqual(
+            list(Story.objects.values_list("trending_score", flat=True)), [0.0]
+        )
+
+    def test_round_trip(self):
+        self._dump_and_load("none", lambda path: open(path, "rb"))
+
+    def test_round_trip_gzip(self):
+        self._dump_and_load("gzip", lambda path: gzip.open(path, "rb"))
+
+    @unittest.skipIf(zstd is None, "requires Python 3.14+ or the `zstandard` package")
+    def test_round_trip_zstd(self):
+        self._dump_and_load("zstd", lambda path: zstd.open(path, "rb"))
+
+    def test_missing_favorite_users(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "stories.ndjson")
+            call_command("dumpstories", "--output", path)
+            with open(path, "rb") as f:
+                ndjson = f.read().decode()
+
+        Story.objects.all().delete()
+        User.objects.filter(username="fan1").delete()
+
+        with patch("sys.stdin", io.StringIO(ndjson)):
+            call_command("loadstories", "--ndjson", "user1", "test")
+
+        # the count follows the favorites that could be restored
+        story = Story.objects.get()
+        self.assertEqual(story.favorite_count, 2)
+        self.assertEqual(Favorite.objects.filter(story=story).count(), 2)
@@ -1,6 +1,6 @@
 from django.test import SimpleTestCase
 
-from art.models import Tag, Category
+from art.models import Chapter, Tag, Category, count_words
 
 
 class CategoryTestCase(SimpleTestCase):
@@ -13,3 +13,15 @@ class TagTestCase(SimpleTestCase):
     def test_str(self):
         tag = Tag(pretty_name="Test", name="test")
         self.assertEqual(str(tag), "Tag: Test (test)")
+
+
+class WordCountTestCase(SimpleTestCase):
+    def test_count_words(self):
+        self.assertEqual(count_words(""), 0)
+        self.assertEqual(count_words("# Title\n\nIt's a *short* chapter."), 5)
+        self.assertEqual(count_words("- one\n- two\n\n---\n\nthree"), 3)
+
+    def test_reading_time(self):
+        self.assertEqual(Chapter(word_count=0).reading_time, 0)
+        self.assertEqual(Chapter(word_count=1).reading_time, 1)
+        self.assertEqual(Chapter(word_count=1000).reading_time, 5)
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from app_admin.models import User
+from art.models import Category, Chapter, Story
+from art.read_counts import (
+    aflush_read_counts,
+    arecord_chapter_read,
+    flush_read_counts,
+)
+
+
+async def _acreate_chapter() -> Chapter:
+    user = await User.objects.acreate_user("user1", "test@test.com", None)
+
+    category = await Category.objects.acreate(
+        name="test", pretty_name="Test", description="Description", sort_key=0
+    )
+
+    story = await Story.objects.acreate(
+        title="Test Story",
+        synopsis="Test Story Synopsis",
+        author=user,
+        category=category,
+    )
+
+    return await Chapter.objects.acreate(
+        story=story,
+        name="Chapter 1",
+        synopsis="",
+        sort_key=0,
+        markdown="Chapter Text",
+        published_at=timezone.now(),
+    )
+
+
+class ReadCountsTestCase(TestCase):
+    def setUp(self):
+        self.addCleanup(flush_read_counts)
+
+    async def test_failed_flush(self):
+        chapter = await _acreate_chapter()
+
+        await arecord_chapter_read(chapter.story_id, chapter.uuid)
+
+        # a zero batch size makes the flush itself fail
+        with override_settings(READ_COUNT_FLUSH_BATCH_SIZE=0):
+            with self.assertRaises(ValueError):
+                await aflush_read_counts()
+
+        await arecord_chapter_read(chapter.story_id, chapter.uuid)
+        await aflush_read_counts()
+
+        await chapter.arefresh_from_db(fields=("read_count",))
+        self.assertEqual(chapter.read_count, 2)
+        await chapter.story.arefresh_from_db(fields=("read_count",))
+        self.assertEqual(chapter.story.read_count, 2)
+
+
+class ReadCountsFlusherTestCase(TransactionTestCase):
+    def setUp(self):
+        self.addCleanup(flush_read_counts)
+
+    @override_settings(READ_COUNT_MAX_PENDING=1)
+    async def test_flushed_in_background(self):
+        chapter = await _acreate_chapter()
+
+        await arecord_chapter_read(chapter.story_id, chapter.uuid)
+
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            await chapter.arefresh_from_db(fields=("read_count",))
+            if chapter.read_count:
+                break
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(chapter.read_count, 1)
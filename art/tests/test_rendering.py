@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from art import rendering
+from art.rendering import (
+    ainvalidate_rendered_markdown,
+    arender_markdown,
+    render_markdown,
+)
+
+
+class RenderingTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        caches["rendered_markdown"].clear()
+
+    def test_render_markdown(self):
+        self.assertEqual(render_markdown("*Text*"), "<p><em>Text</em></p>")
+        self.assertNotIn("javascript:", render_markdown("[link](javascript:alert(1))"))
+        self.assertNotIn("<script>", render_markdown("<script>alert(1)</script>"))
+
+    async def test_arender_markdown(self):
+        with self.settings(MARKDOWN_RENDER_MAX_WORKERS=0):
+            self.assertEqual(await arender_markdown("*Text*"), "<p><em>Text</em></p>")
+
+        self.assertEqual(await arender_markdown("*Text*"), "<p><em>Text</em></p>")
+
+        await ainvalidate_rendered_markdown("*Text*")
+        self.assertEqual(await arender_markdown("*Text*"), "<p><em>Text</em></p>")
+
+    async def test_broken_pool(self):
+        self.assertEqual(await arender_markdown("*Text*"), "<p><em>Text</em></p>")
+
+        executor = rendering._executor
+        assert isinstance(executor, ProcessPoolExecutor)
+        for process in list(executor._processes.values()):
+            process.kill()
+            process.join()
+
+        # replaced by a new pool rather than failing every later render
+        self.assertEqual(await arender_markdown("*More*"), "<p><em>More</em></p>")
+        self.assertIsNot(rendering._executor, executor)
+
+    async def test_resized_pool(self):
+        self.assertEqual(await arender_markdown("*Text*"), "<p><em>Text</em></p>")
+        executor = rendering._executor
+
+        with self.settings(MARKDOWN_RENDER_MAX_WORKERS=1):
+            self.assertEqual(await arender_markdown("*More*"), "<p><em>More</em></p>")
+            self.assertIsNot(rendering._executor, executor)
@@ -5,6 +5,7 @@ from django.http import HttpRequest
 from django.test import SimpleTestCase, TestCase
 from pydantic import ValidationError
 from django.db.models import Q, F
+from django.db.models.functions import Left
 
 from art.schemas import (
     ChapterInSchema,
@@ -15,7 +16,7 @@ from art.schemas import (
     StoryOutSchema,
     StoryPatchInSchema,
 )
-from art.models import Category, Chapter, Story
+from art.models import STORY_TITLE_SORT_LENGTH, Category, Chapter, Story
 from app_admin.models import User
 
 
@@ -33,7 +34,7 @@ class SchemasTestCase(SimpleTestCase):
         self.assertEqual(ListInSchema().get_order_by_args("story"), [F("uuid").asc()])
         self.assertEqual(
             ListInSchema(sort="title:DESC").get_order_by_args("story"),
-            [F("title").desc(), F("uuid").asc()],
+            [Left("title", STORY_TITLE_SORT_LENGTH).desc(), F("uuid").desc()],
         )
 
     def test_ListInSchema_default_sort_enabled(self):
@@ -134,7 +135,7 @@ class SchemasDBTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=None,
         )
@@ -180,7 +181,7 @@ class SchemasDBTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=None,
         )
@@ -1,3 +1,4 @@
+import datetime
 import uuid
 from typing import Any, Callable, ClassVar, TypedDict
 from unittest.mock import Mock
@@ -45,6 +46,7 @@ class AllSearchesTestCase(TestCase):
                 "publishedAt_exact": ["2018-11-26 00:00:00+0000"],
                 "publishedAt_delta": ["older_than:10h"],
                 "isPublished": ["true", "false"],
+                "wordCount": ["0|1000"],
                 "tag": ["disney"],
                 "authorName": ["test"],
             },
@@ -67,6 +69,7 @@ class AllSearchesTestCase(TestCase):
                 "publishedAt_exact": ["2018-11-26 00:00:00+0000"],
                 "publishedAt_delta": ["older_than:10h"],
                 "isPublished": ["true", "false"],
+                "wordCount": ["0|1000"],
             },
         },
         "category": {
@@ -156,7 +159,7 @@ class SearchesTestCase(TestCase):
             story=story,
             name="Chapter 1",
             synopsis="",
-            index=0,
+            sort_key=0,
             markdown="Chapter Text",
             published_at=None,
         )
@@ -189,3 +192,52 @@ class SearchesTestCase(TestCase):
             ).count(),
             0,
         )
+
+    def test_chapter_isPublished(self):
+        user = User.objects.create_user("user1", "test@test.com", None)
+
+        category = Category.objects.create(
+            name="test", pretty_name="Test", description="Description", sort_key=0
+        )
+
+        story = Story.objects.create(
+            title="Test Story",
+            synopsis="Test Story Synopsis",
+            author=user,
+            category=category,
+        )
+
+        chapter = Chapter.objects.create(
+            story=story,
+            name="Chapter 1",
+            synopsis="",
+            sort_key=0,
+            markdown="Chapter Text",
+            published_at=None,
+        )
+
+        def assert_published(is_published: bool):
+            self.assertEqual(
+                Chapter.objects.filter(
+                    searches._chapter_isPublished(Mock(HttpRequest), "true")
+                ).count(),
+                1 if is_published else 0,
+            )
+            self.assertEqual(
+                Chapter.objects.filter(
+                    searches._chapter_isPublished(Mock(HttpRequest), "false")
+                ).count(),
+                0 if is_published else 1,
+            )
+
+        assert_published(False)
+
+        chapter.published_at = timezone.now() + datetime.timedelta(days=1)
+        chapter.save(update_fields=("published_at",))
+
+        assert_published(False)
+
+        chapter.published_at = timezone.now()
+        chapter.save(update_fields=("published_at",))
+
+        assert_published(True)
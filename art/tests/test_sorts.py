@@ -0,0 +1,71 @@
+from django.db import models
+from django.db.models import F
+from django.test import SimpleTestCase
+
+from art.models import Story
+from art.sorts import sort_configs
+from query_utils import sort as sortutils
+
+# joined, so no index on the story can cover them
+_UNINDEXED_STORY_SORTS = frozenset(("author",))
+
+
+def _index_keys(model: type[models.Model]) -> list[list[tuple[object, bool]]]:
+    index_keys: list[list[tuple[object, bool]]] = [[(F(model._meta.pk.name), False)]]
+    for index in model._meta.indexes:
+        if index.fields:
+            index_keys.append(
+                [(F(f.removeprefix("-")), f.startswith("-")) for f in index.fields]
+            )
+        else:
+            index_keys.append(
+                [
+                    (
+                        (e.expression, e.descending)
+                        if isinstance(e, models.OrderBy)
+                        else (e, False)
+                    )
+                    for e in index.expressions
+                ]
+            )
+
+    return index_keys
+
+
+def _is_index_ordered(
+    model: type[models.Model], order_by_args: list[models.OrderBy]
+) -> bool:
+    order_by_keys = [(o.expression, o.descending) for o in order_by_args]
+    for index_key in _index_keys(model):
+        if len(index_key) < len(order_by_keys):
+            continue
+
+        if any(o[0] != i[0] for o, i in zip(order_by_keys, index_key)):
+            continue
+
+        # a btree can be scanned backwards, but not in mixed directions
+        if len({o[1] == i[1] for o, i in zip(order_by_keys, index_key)}) == 1:
+            return True
+
+    return False
+
+
+class StorySortsTestCase(SimpleTestCase):
+    def test_indexed(self):
+        for sort_name in sort_configs["story"]:
+            if sort_name in _UNINDEXED_STORY_SORTS:
+                continue
+
+            for direction in ("ASC", "DESC"):
+                with self.subTest(sort_name=sort_name, direction=direction):
+                    sort_list = sortutils.to_sort_list(
+                        "story", f"{sort_name}:{direction}", True, sort_configs
+                    )
+                    order_by_args = sortutils.sort_list_to_order_by_args(
+                        "story", sort_list, sort_configs
+                    )
+
+                    self.assertTrue(
+                        _is_index_ordered(Story, order_by_args),
+                        f"{order_by_args} is not covered by an index",
+                    )
@@ -1,6 +1,7 @@
 from django.http import HttpRequest
 from ninja import NinjaAPI
 
+from app_admin.password_hashing import PasswordHashingSaturated
 from app_admin.security import TokenExpired, TokenInvalid
 from art.api import router as art_router
 from app_admin.api import router as app_admin_router
@@ -18,5 +19,14 @@ def on_token_expired(request: HttpRequest, exc: Exception):
     return api.create_response(request, {"detail": "Token expired"}, status=401)
 
 
+@api.exception_handler(PasswordHashingSaturated)
+def on_password_hashing_saturated(request: HttpRequest, exc: Exception):
+    response = api.create_response(
+        request, {"detail": "Service temporarily unavailable"}, status=503
+    )
+    response["Retry-After"] = "1"
+    return response
+
+
 api.add_router("/art/", art_router)
 api.add_router("/appadmin/", app_admin_router)
@@ -41,7 +41,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "app_admin.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -104,7 +104,9 @@ else:
 SESSION_COOKIE_SECURE = os.getenv("APP_SESSION_COOKIE_SECURE", "true") == "true"
 SESSION_COOKIE_SAMESITE = "None"
 SESSION_COOKIE_DOMAIN = os.getenv("APP_SESSION_COOKIE_DOMAIN", "localhost")
-SESSION_SAVE_EVERY_REQUEST = True
+# sessions are refreshed by `app_admin.middleware.SessionMiddleware` instead, see
+# `SESSION_REFRESH_INTERVAL`
+SESSION_SAVE_EVERY_REQUEST = False
 
 
 # Password validation
@@ -196,6 +198,14 @@ LOGGING = {
             "handlers": ["app_console"],
             "level": os.getenv("APP_LOG_LEVEL", "INFO"),
         },
+        "app_admin": {
+            "handlers": ["app_console"],
+            "level": os.getenv("APP_LOG_LEVEL", "INFO"),
+        },
+        "art": {
+            "handlers": ["app_console"],
+            "level": os.getenv("APP_LOG_LEVEL", "INFO"),
+        },
     },
 }
 
@@ -224,6 +234,17 @@ if os.getenv("APP_IN_DOCKER", "false").lower() == "true":
             "LOCATION": f"{REDIS_URL}/4",
             "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
         },
+        "rendered_markdown": {
+            "BACKEND": "redis_lock.django_cache.RedisCache",
+            "LOCATION": f"{REDIS_URL}/5",
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+            "TIMEOUT": 60 * 60 * 24,  # 1 day
+        },
+        "principal": {
+            "BACKEND": "redis_lock.django_cache.RedisCache",
+            "LOCATION": f"{REDIS_URL}/6",
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        },
     }
 else:
     CACHES = {
@@ -246,11 +267,21 @@ else:
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
             "LOCATION": "throttle-cache",
         },
+        "rendered_markdown": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "rendered-markdown-cache",
+            "TIMEOUT": 60 * 60 * 24,  # 1 day
+        },
+        "principal": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "principal-cache",
+        },
     }
 
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
-    "app_admin.auth_backends.EmailBackend",
+    # username or email, sessions logged in through the backends it replaced
+    # are moved over by `app_admin` migration 0005
+    "app_admin.auth_backends.ModelBackend",
 ]
 
 CSRF_TRUSTED_ORIGINS = (
@@ -316,7 +347,38 @@ else:
     raise RuntimeError("unknown 'TEST_RUNNER_TYPE'")
 
 TOKEN_EXPIRY_INTERVAL = datetime.timedelta(days=14)
+# keep well below `SESSION_COOKIE_AGE`, which is how long an idle session lasts
+SESSION_REFRESH_INTERVAL = datetime.timedelta(hours=1)
+TOKEN_ISSUE_THROTTLE_RATE = "10/m"
+# how stale `Token.expires_at` and `User.last_login` may get before being rewritten
+AUTH_TIMESTAMP_GRANULARITY = datetime.timedelta(minutes=5)
+PRINCIPAL_CACHE_TIMEOUT = datetime.timedelta(minutes=5)
+# also bounds how long other workers keep using an invalidated principal
+PRINCIPAL_CACHE_LOCAL_TIMEOUT = datetime.timedelta(seconds=5)
+PRINCIPAL_CACHE_LOCAL_MAX_SIZE = 1024
+# verified Basic auth credentials, kept in memory only
+CREDENTIAL_CACHE_TIMEOUT = datetime.timedelta(minutes=5)
+CREDENTIAL_CACHE_MAX_SIZE = 1024
 VALIDATE_EMAIL_DELIVERABILITY = True
+PASSWORD_HASHING_MAX_WORKERS = int(os.getenv("APP_PASSWORD_HASHING_MAX_WORKERS", "2"))
+# queued and running, requests needing a hash beyond this get a 503
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv("APP_PASSWORD_HASHING_MAX_PENDING", "64"))
+MARKDOWN_RENDER_MAX_WORKERS = int(os.getenv("APP_MARKDOWN_RENDER_MAX_WORKERS", "2"))
+CHAPTER_MARKDOWN_CHUNK_SIZE = 64 * 1024  # 64kb
+CHAPTER_BULK_CREATE_MAX_SIZE = 100
+# below `DATA_UPLOAD_MAX_MEMORY_SIZE`, past which the body isn't read at all
+CHAPTER_BULK_CREATE_MAX_BYTES = 2 * 1024 * 1024  # 2mb
+TRENDING_WINDOW = datetime.timedelta(days=7)
+TRENDING_HALF_LIFE = datetime.timedelta(days=1)
+READ_COUNT_FLUSH_INTERVAL = 30.0  # seconds
+READ_COUNT_MAX_PENDING = 10000
+READ_COUNT_FLUSH_BATCH_SIZE = 512
+REPORT_THROTTLE_RATE = "10/m"
+PUBLIC_CACHE_MAX_AGE = int(os.getenv("APP_PUBLIC_CACHE_MAX_AGE", "60"))
+PUBLIC_CACHE_STALE_WHILE_REVALIDATE = int(
+    os.getenv("APP_PUBLIC_CACHE_STALE_WHILE_REVALIDATE", "300")
+)
+SURROGATE_KEY_PURGE_URL = os.getenv("APP_SURROGATE_KEY_PURGE_URL")
 
 try:
     from .local_settings import *  # noqa: F403
@@ -2,13 +2,16 @@ import re
 from dataclasses import dataclass
 from typing import Callable, Literal, TypedDict, cast
 
-from django.db.models import F, OrderBy
+from django.db.models import Expression, F, OrderBy
 
 
 @dataclass(slots=True)
 class DefaultDescriptor:
     sort_key: int
     direction: Literal["ASC", "DESC"]
+    # take the direction of the last requested sort instead, so that a tiebreaker
+    # can share an index with it
+    follows_sort: bool = False
 
 
 @dataclass(slots=True)
@@ -18,8 +21,13 @@ class SortConfig:
 
 
 def standard_sort(field_name: str):
-    f = F(field_name)
-    return lambda dir_: f.desc() if dir_.upper() == "DESC" else f.asc()
+    return expression_sort(F(field_name))
+
+
+def expression_sort(expression: Expression | F):
+    return lambda dir_: (
+        expression.desc() if dir_.upper() == "DESC" else expression.asc()
+    )
 
 
 _sort_regex = re.compile(r"^([A-Z0-9_]+):(ASC|DESC)$", re.IGNORECASE)
@@ -56,7 +64,15 @@ def to_sort_list(
                 raise ValueError("sort malformed")
 
     if default_sort_enabled:
-        default_sort_list = _to_default_sort_list(object_name, sort_configs)
+        default_sort_list = _to_default_sort_list(
+            object_name,
+            sort_configs,
+            (
+                cast(Literal["ASC", "DESC"], sort_list[-1]["direction"].upper())
+                if sort_list
+                else None
+            ),
+        )
 
         sort_field_names = frozenset(sort["field_name"].lower() for sort in sort_list)
 
@@ -68,7 +84,9 @@ def to_sort_list(
 
 
 def _to_default_sort_list(
-    object_name: str, sort_configs: dict[str, dict[str, SortConfig]]
+    object_name: str,
+    sort_configs: dict[str, dict[str, SortConfig]],
+    sort_direction: Literal["ASC", "DESC"] | None,
 ) -> list[_SortConfigDict]:
     object_sort_configs = sort_configs[object_name]
 
@@ -78,10 +96,17 @@ def _to_default_sort_list(
             if object_sort_config.default_descriptor.sort_key not in field_name_dict:
                 field_name_dict[object_sort_config.default_descriptor.sort_key] = []
 
+            direction = object_sort_config.default_descriptor.direction
+            if (
+                object_sort_config.default_descriptor.follows_sort
+                and sort_direction is not None
+            ):
+                direction = sort_direction
+
             field_name_dict[object_sort_config.default_descriptor.sort_key].append(
                 {
                     "field_name": field_name,
-                    "direction": object_sort_config.default_descriptor.direction,
+                    "direction": direction,
                 }
             )
 
@@ -11,6 +11,14 @@ sort_configs: dict[str, dict[str, sortutils.SortConfig]] = {
         "text": sortutils.SortConfig([sortutils.standard_sort("text")], None),
         "imageSrc": sortutils.SortConfig([sortutils.standard_sort("image_src")], None),
     },
+    "followingObject": {
+        "uuid": sortutils.SortConfig(
+            [sortutils.standard_sort("uuid")],
+            sortutils.DefaultDescriptor(0, "ASC", follows_sort=True),
+        ),
+        "text": sortutils.SortConfig([sortutils.standard_sort("text")], None),
+        "imageSrc": sortutils.SortConfig([sortutils.standard_sort("image_src")], None),
+    },
 }
 
 
@@ -101,6 +109,23 @@ class SortsTestCase(SimpleTestCase):
 
         self.assertEqual(order_by_args, [F("uuid").asc(), F("text").desc()])
 
+    def test_following_default(self):
+        for sort, expected_order_by_args in (
+            (None, [F("uuid").asc()]),
+            ("text:ASC", [F("text").asc(), F("uuid").asc()]),
+            ("text:desc", [F("text").desc(), F("uuid").desc()]),
+            (
+                "text:ASC,imageSrc:DESC",
+                [F("text").asc(), F("image_src").desc(), F("uuid").desc()],
+            ),
+        ):
+            with self.subTest(sort=sort):
+                order_by_args = SortsTestCase._to_order_by_args(
+                    "followingObject", sort, True
+                )
+
+                self.assertEqual(order_by_args, expected_order_by_args)
+
     def test_sort_malformed(self):
         with self.assertRaises(ValueError):
             sortutils.to_sort_list("object", "bad sort string", True, sort_configs)